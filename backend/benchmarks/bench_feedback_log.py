@@ -0,0 +1,86 @@
+"""
+Benchmark for Feedback.update_feedback_log.
+
+Simulates a long shift: goals arrive one by one and the feedback log is
+updated after each batch with the full, growing path history. The previous
+implementation rescanned the whole feedback log for every path entry on
+every call (and, since it compared labels to ids, re-logged every rated
+entry each time); it is only timed at a small size.
+
+Run from the backend directory:
+    python -m benchmarks.bench_feedback_log
+"""
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from turtlebot4_backend.turtlebot4_model.Feedback import Feedback
+from turtlebot4_backend.turtlebot4_model.FeedbackLogEntry import FeedbackLogEntry
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+
+SIZES = (10_000, 100_000)
+BATCH = 100  # Path entries added between two log updates.
+LEGACY_SIZE = 500
+
+
+def make_entries(n: int) -> List[PathLogEntry]:
+    start = datetime(2024, 1, 1)
+    return [
+        PathLogEntry(
+            label="Goal Entry",
+            id=f"goal_{i + 1}",
+            goal_type="intermediate" if i % 4 else "global",
+            timestamp=start + timedelta(seconds=i),
+            fuzzy_output="rule",
+            user_feedback="good" if i % 3 else "bad",
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_update(feedback_history: List[FeedbackLogEntry], path_history: List[PathLogEntry]) -> None:
+    # Previous algorithm, kept here for comparison.
+    for entry in path_history:
+        if entry.get_user_feedback() is None:
+            continue
+        if not any(log.get_start_point() == entry.get_id() for log in feedback_history):
+            feedback_history.append(FeedbackLogEntry(
+                duration=str(entry.get_timestamp()),
+                start_point=entry.get_label(),
+                end_point=entry.get_goal_type(),
+                feedback=entry.get_user_feedback(),
+            ))
+
+
+def run_incremental(entries: List[PathLogEntry]) -> float:
+    feedback = Feedback()
+    history: List[PathLogEntry] = []
+    start = time.perf_counter()
+    for i in range(0, len(entries), BATCH):
+        history.extend(entries[i:i + BATCH])
+        feedback.update_feedback_log(history)
+    elapsed = time.perf_counter() - start
+    assert len(feedback.get_feedback_history()) == len(entries)
+    return elapsed
+
+
+def run_legacy(entries: List[PathLogEntry]) -> float:
+    log: List[FeedbackLogEntry] = []
+    history: List[PathLogEntry] = []
+    start = time.perf_counter()
+    for i in range(0, len(entries), BATCH):
+        history.extend(entries[i:i + BATCH])
+        legacy_update(log, history)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    for n in (LEGACY_SIZE,) + SIZES:
+        line = f"{n:>7} entries  incremental: {run_incremental(make_entries(n)):8.3f} s"
+        if n == LEGACY_SIZE:
+            line += f"  previous: {run_legacy(make_entries(n)):8.3f} s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Memory benchmark for PathLogEntry.
+
+Builds a path history the way a long run or a loaded history file does
+(every string is a fresh object, as produced by json.loads) and reports
+the bytes allocated per entry, compared with an equivalent plain class
+that keeps a per-instance __dict__ and does not intern its strings.
+
+Run from the backend directory:
+    python -m benchmarks.bench_path_entry_memory [entries]
+"""
+import json
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+
+DEFAULT_ENTRIES = 1_000_000
+RULES = [f"zone: {z}; direction: {d}; output: {o}"
+         for z in ("near", "medium", "far")
+         for d in ("left", "front", "right")
+         for o in ("turn", "straight")]
+
+
+class DictPathLogEntry:
+    # Previous layout: regular attributes, no interning.
+    def __init__(self, label, id, goal_type, timestamp, fuzzy_output, user_feedback):
+        self._label = label
+        self._id = id
+        self._goal_type = goal_type
+        self._timestamp = timestamp
+        self._fuzzy_output = fuzzy_output
+        self._user_feedback = user_feedback
+
+
+def raw_entries(n: int):
+    # Decoding each record separately gives every entry its own string objects.
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        record = json.loads(json.dumps({
+            "label": "Goal Entry",
+            "goalType": "intermediate" if i % 4 else "global",
+            "fuzzyOutput": RULES[i % len(RULES)],
+            "userFeedback": ("good", "bad", "")[i % 3],
+        }))
+        yield (record["label"], f"goal_{i + 1}", record["goalType"],
+               start + timedelta(seconds=i), record["fuzzyOutput"], record["userFeedback"])
+
+
+def measure(cls, n: int) -> float:
+    tracemalloc.start()
+    history = [cls(*fields) for fields in raw_entries(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(history) == n
+    del history
+    return current / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    slotted = measure(PathLogEntry, n)
+    plain = measure(DictPathLogEntry, n)
+    print(f"{n} entries")
+    print(f"  PathLogEntry (slots, interned): {slotted:7.1f} bytes/entry")
+    print(f"  plain object with __dict__:     {plain:7.1f} bytes/entry")
+    print(f"  saved: {100.0 * (plain - slotted) / plain:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Snapshot format benchmark.
+
+Saves the same path history as a pretty-printed JSON snapshot and as a
+compressed columnar snapshot, then reports the file size and the time
+load_latest_path_history takes to read each one back.
+
+Run from the backend directory:
+    python -m benchmarks.bench_snapshot_format [entries]
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import (
+    RetentionPolicy, load_latest_path_history, save_path_history)
+
+DEFAULT_ENTRIES = 100_000
+RULES = [f"zone: {z}; direction: {d}; output: {o}"
+         for z in ("near", "medium", "far")
+         for d in ("left", "front", "right")
+         for o in ("turn", "straight")]
+
+
+def build_model(n: int):
+    start = datetime(2024, 1, 1).astimezone()
+    history = [
+        PathLogEntry(
+            label="Goal Entry",
+            id=f"goal_{i + 1}",
+            goal_type="intermediate" if i % 4 else "global",
+            timestamp=start + timedelta(seconds=i, microseconds=i % 1000),
+            fuzzy_output=RULES[i % len(RULES)],
+            user_feedback=("good", "bad", "")[i % 3],
+        )
+        for i in range(n)
+    ]
+    model = MagicMock()
+    model.get_path_history.return_value = history
+    return model
+
+
+def measure(model, format: str):
+    with tempfile.TemporaryDirectory() as d:
+        snapshot_dir = Path(d)
+        t0 = time.perf_counter()
+        file_path = save_path_history(model, retention=RetentionPolicy(None, None, None),
+                                      snapshot_dir=snapshot_dir, format=format)
+        save_s = time.perf_counter() - t0
+        size = file_path.stat().st_size
+
+        t0 = time.perf_counter()
+        latest = load_latest_path_history(snapshot_dir)
+        load_s = time.perf_counter() - t0
+        assert len(latest["pathHistory"]) == len(model.get_path_history())
+    return size, save_s, load_s
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    model = build_model(n)
+    print(f"{n} entries")
+    results = {}
+    for format in ("json", "columnar"):
+        size, save_s, load_s = measure(model, format)
+        results[format] = size
+        print(f"  {format:9s} size={size / 1e6:7.2f} MB  save={save_s:6.2f} s  load={load_s:6.2f} s")
+    print(f"  columnar is {results['json'] / results['columnar']:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Teleop command latency benchmark.
+
+Feeds drive commands through the websocket handling of main.py and
+reports the time from receipt to the rosbridge publish call (p50/p99),
+for the previous path (log line, Teleoperate queue, event-loop hop,
+deep copy, more log lines) and for TeleopController.publish_command.
+
+A background task keeps the event loop busy the way pose and status
+broadcasts do, since the previous path has to wait for its turn on the
+loop. Rosbridge is replaced by an in-process stand-in that serializes the
+publish frame, so only the backend's own overhead is measured.
+
+Run from the backend directory:
+    python -m benchmarks.bench_teleop_latency [commands]
+"""
+import asyncio
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from turtlebot4_backend.turtlebot4_controller import TeleopController as teleop_module
+from turtlebot4_backend.turtlebot4_controller.TeleopController import TeleopController
+from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
+from turtlebot4_backend.turtlebot4_model.Teleoperate import Teleoperate
+from turtlebot4_backend.turtlebot4_utils.LatencyStats import LatencyStats
+
+DEFAULT_COMMANDS = 5_000
+COMMANDS = ("FORWARD", "LEFT", "FORWARD", "RIGHT", "STOP")
+BACKGROUND_WORK_S = 0.0005  # One broadcast's worth of blocking work.
+BACKGROUND_PERIOD_S = 0.002
+
+
+class FakeRosbridge:
+    """Stands in for RosbridgeConnection; records when each publish happens."""
+
+    def __init__(self, *args, **kwargs):
+        self.isConnected = True
+        self.received_at = None
+        self.latency = LatencyStats(window=1_000_000)
+
+    def connect(self):
+        pass
+
+    def publish(self, topic_name, message, msg_type=None):
+        # Roughly what roslibpy does: copy into a Message and encode the frame.
+        json.dumps({"op": "publish", "topic": topic_name, "msg": dict(message)})
+        # Only the first publish after a command counts; fixed-rate stream ticks do not
+        if self.received_at is not None:
+            self.latency.record(time.perf_counter() - self.received_at)
+            self.received_at = None
+
+
+async def background_load(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        end = time.perf_counter() + BACKGROUND_WORK_S
+        while time.perf_counter() < end:
+            pass
+        await asyncio.sleep(BACKGROUND_PERIOD_S)
+
+
+def legacy_handler(ros: FakeRosbridge, loop: asyncio.AbstractEventLoop):
+    teleoperate = Teleoperate()
+
+    async def publish_drive_command():
+        # Previous TeleopController._publish_drive_command, kept here for comparison.
+        cmd = teleoperate.get_command()
+        if not cmd:
+            return
+        msg = DirectionCommand[cmd].get_message()
+        print(f"[TeleopController] Command detected: {cmd}")
+        print("[TeleopController] Publishing:", msg)
+        ros.publish("/cmd_vel", msg, msg_type="geometry_msgs/msg/Twist")
+        print("[TeleopController] Published to /cmd_vel")
+
+    teleoperate.attach(lambda source, data: loop.call_soon_threadsafe(
+        lambda: asyncio.create_task(publish_drive_command())))
+
+    async def handle(raw: str) -> None:
+        msg = json.loads(raw)
+        print(f"[WS] Parsed JSON: {msg}")
+        if "command" in msg:
+            teleoperate.fromJSON(msg)
+
+    return handle
+
+
+def fast_handler(controller: TeleopController):
+    async def handle(raw: str) -> None:
+        received_at = time.perf_counter()
+        msg = json.loads(raw)
+        if "command" in msg:
+            controller.publish_command(msg["command"], received_at)
+
+    return handle
+
+
+async def run(name: str, n: int) -> None:
+    loop = asyncio.get_running_loop()
+    with patch.object(teleop_module, "RosbridgeConnection", FakeRosbridge), redirect_stdout(io.StringIO()):
+        controller = TeleopController(Teleoperate(), loop=loop)
+    ros = controller._ros
+    ros.latency = LatencyStats(window=1_000_000)  # Drop the advertise publish from __init__
+    handle = fast_handler(controller) if name == "fast path" else legacy_handler(ros, loop)
+
+    stop = asyncio.Event()
+    load = asyncio.create_task(background_load(stop))
+    frames = [json.dumps({"command": COMMANDS[i % len(COMMANDS)]}) for i in range(n)]
+    with redirect_stdout(io.StringIO()):
+        for raw in frames:
+            ros.received_at = time.perf_counter()
+            await handle(raw)
+            # Back to receive_text; commands arrive at keyboard/joystick rate
+            await asyncio.sleep(0.001)
+    stop.set()
+    await load
+
+    stats = ros.latency.toJSON()
+    print(f"{name:>10}: {stats['count']} commands  p50 {stats['p50Ms']:.3f} ms  "
+          f"p99 {stats['p99Ms']:.3f} ms  max {stats['maxMs']:.3f} ms")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COMMANDS
+    for name in ("previous", "fast path"):
+        asyncio.run(run(name, n))
+
+
+if __name__ == "__main__":
+    main()
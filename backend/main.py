@@ -1,6 +1,8 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import json
+import time
 from datetime import datetime, timezone
 
 
@@ -16,15 +18,23 @@ try:
     from turtlebot4_backend.turtlebot4_model.RobotState import RobotState
     from turtlebot4_backend.turtlebot4_controller.StatusController import StatusController
     from turtlebot4_backend.turtlebot4_model.ConcreteObserver import ConcreteObserver
+    from turtlebot4_backend.turtlebot4_model.Channel import Channel
     from turtlebot4_backend.turtlebot4_model.Teleoperate import Teleoperate
     from turtlebot4_backend.turtlebot4_controller.TeleopController import TeleopController
+    from turtlebot4_backend.turtlebot4_model.MotionLatency import MotionLatency
     from turtlebot4_backend.turtlebot4_model.Map import Map
+    from turtlebot4_backend.turtlebot4_model.Telemetry import Telemetry
     from turtlebot4_backend.turtlebot4_controller.MapController import MapController
+    from turtlebot4_backend.turtlebot4_model.PlannedPath import PlannedPath
+    from turtlebot4_backend.turtlebot4_controller.PlannedPathController import PlannedPathController
     from turtlebot4_backend.turtlebot4_model.Path import Path
     from turtlebot4_backend.turtlebot4_controller.PathController import PathController
     from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import save_path_history
-    from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import load_latest_path_history
+    from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import (
+        SNAPSHOT_DIR, iter_path_history, latest_snapshot)
+    from turtlebot4_backend.turtlebot4_storage.PathJournal import PathJournal
     from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+    from turtlebot4_backend.turtlebot4_utils.ThreadedIterator import iterate_in_thread
 
 except Exception as e:
     print("TurtleBot not available:", e)
@@ -78,41 +88,171 @@ def get_session(child_id: str, session_id: str):
 
 # TurtleBot setup. Only initialize if Turtlebot imports were succesfully loaded.
 if TURTLEBOT_AVAILABLE:
-    # Store all connected WebSocket clients
+    # Observers of all connected WebSocket clients, used for send statistics
     connected_clients = set()
 
     # Initialize models and controllers
     teleoperate = Teleoperate()
-    teleop_controller = TeleopController(teleoperate)
-    map_model = Map()
+    # Time from a /cmd_vel publish to the robot's response in /odom
+    motion_latency = MotionLatency()
+    teleop_controller = TeleopController(teleoperate, motion_latency=motion_latency)
+    # Downsampled history of battery, connectivity and pose for trend charts
+    telemetry = Telemetry()
+    map_model = Map(telemetry=telemetry)
     map_controller = MapController(map_model)
-    path_model = Path()
+    # Planner path, simplified and sent to each client as rate-limited deltas
+    planned_path = PlannedPath()
+    planned_path_controller = PlannedPathController(planned_path)
+    # Restore the history written before the last shutdown or crash
+    path_journal = PathJournal()
+    path_model = Path(
+        path_history=[PathLogEntry.fromJSON(e) for e in path_journal.replay()],
+        journal=path_journal,
+    )
     path_controller = PathController(path_model, map_model)
-    robot_state = RobotState(path_model)
+    robot_state = RobotState(path_model, telemetry=telemetry, motion_latency=motion_latency)
     status_controller = StatusController(robot_state)
 
-    # WebSocket endpoint for real-time communication with the turtlebot4 dashboard
+    # Write out journal records that are still queued
+    @app.on_event("shutdown")
+    def close_path_journal():
+        path_journal.close()
+
+    # Models changed by the websocket handlers live on the event loop and are not locked,
+    # so endpoints reading them are async and run on that loop instead of the thread pool.
+    # State that locks itself (Telemetry, MotionLatency) may still be queried from the pool.
+
+    # Per-client send statistics, slowest client (by p99 send latency) first
+    @app.get("/turtlebot/admin/clients")
+    async def get_client_stats():
+        stats = [observer.get_stats() for observer in list(connected_clients)]
+        stats.sort(key=lambda s: s["sendLatency"]["p99Ms"] or 0.0, reverse=True)
+        return {"clients": stats}
+
+    # Teleop command latency from websocket receipt to rosbridge send,
+    # and from rosbridge send to the robot's response in /odom
+    @app.get("/turtlebot/admin/teleop")
+    async def get_teleop_latency():
+        return {
+            "commandLatency": teleop_controller.get_latency_stats(),
+            "motionLatency": teleop_controller.get_motion_latency_stats(),
+        }
+
+    # One page of the path history, filtered by goal type, feedback, time range and rule text.
+    # Pass the returned nextCursor as cursor to get the following page.
+    @app.get("/turtlebot/path-history")
+    async def get_path_history(
+        cursor: int | None = None,
+        limit: int = 50,
+        goalType: str | None = None,
+        feedback: str | None = None,
+        from_: str | None = Query(None, alias="from"),
+        to: str | None = None,
+        rule: str | None = None,
+        order: str = "asc",
+    ):
+        try:
+            start = datetime.fromisoformat(from_) if from_ else None
+            end = datetime.fromisoformat(to) if to else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="from/to must be ISO 8601 timestamps")
+        if order not in ("asc", "desc"):
+            raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+
+        return path_controller.get_records_page(
+            cursor=cursor, limit=limit, goal_type=goalType, feedback=feedback,
+            start=start, end=end, rule=rule, descending=order == "desc",
+        )
+
+    # Fuzzy rules ranked by their share of bad ratings, from the running aggregates
+    @app.get("/turtlebot/rules/ranking")
+    async def get_rule_ranking(order: str = "worst", limit: int = 10):
+        if order not in ("worst", "best"):
+            raise HTTPException(status_code=400, detail="order must be 'worst' or 'best'")
+
+        return path_controller.get_rule_ranking(order=order, limit=limit)
+
+    # Travel times between consecutive goals, per goal-type transition
+    @app.get("/turtlebot/segments/stats")
+    async def get_segment_stats():
+        return path_controller.get_segment_stats()
+
+    # Telemetry history of one metric, downsampled to at most `points` points
+    @app.get("/turtlebot/telemetry")
+    def get_telemetry(
+        metric: str,
+        from_: str | None = Query(None, alias="from"),
+        to: str | None = None,
+        points: int = Telemetry.DEFAULT_POINTS,
+    ):
+        if metric not in telemetry.get_metrics():
+            raise HTTPException(status_code=400, detail=f"metric must be one of {telemetry.get_metrics()}")
+        try:
+            start = datetime.fromisoformat(from_).timestamp() if from_ else None
+            end = datetime.fromisoformat(to).timestamp() if to else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="from/to must be ISO 8601 timestamps")
+
+        return telemetry.query(metric, start=start, end=end, points=points)
+
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
         await websocket.accept()
 
         # Create and attach observer for this client
         observer = ConcreteObserver(websocket)
+        connected_clients.add(observer)
         robot_state.attach(observer)
         map_model.attach(observer)
-        map_controller._send_initial_map_png()
+        planned_path.attach(observer)
         path_model.attach(observer)
         path_model.set_path_controller(path_controller)
 
+        # Send the current state to this client only, instead of broadcasting
+        # the map to every connected client on each new connection.
+        for model in (map_model, planned_path, robot_state, path_model):
+            await model.send_snapshot(observer)
+
         # Listen for incoming messages from the client and handle commands
         try:
             while True:
                 raw = await websocket.receive_text() 
+                received_at = time.perf_counter()
                 msg = json.loads(raw) 
+
+                # Teleop fast path: publish straight to /cmd_vel, before any other handling
+                if "command" in msg:
+                    teleop_controller.publish_command(msg["command"], received_at)
+                    continue
+
                 print(f"[WS] Parsed JSON: {msg}")
 
-                if "command" in msg: 
-                    teleoperate.fromJSON(msg) 
+                # Clients may narrow what they receive, e.g. a status-only widget:
+                # {"type": "SUBSCRIBE", "channels": ["status"]}
+                if msg.get("type") == "SUBSCRIBE":
+                    added = observer.set_channels(Channel.parse(msg.get("channels", [])))
+                    # Newly subscribed channels start from a snapshot of the current state
+                    for model in (map_model, planned_path, robot_state, path_model):
+                        await model.send_snapshot(observer, added)
+
+                # Client saw a gap in the path stream versions and needs a new snapshot
+                if msg.get("type") == "PATH_RESYNC":
+                    await path_model.send_snapshot(observer, {Channel.PATH})
+
+                # Client zoomed the map and wants the trail at a matching tolerance (meters):
+                # {"type": "TRAIL_RESYNC", "tolerance": 0.5}
+                if msg.get("type") == "TRAIL_RESYNC":
+                    tolerance = msg.get("tolerance")
+                    if not isinstance(tolerance, (int, float)) or tolerance < 0:
+                        tolerance = None
+                    await map_model.send_trail_snapshot(observer, tolerance)
+
+                # Client missed a plan delta (version gap) and needs the whole plan
+                if msg.get("type") == "PLAN_RESYNC":
+                    await planned_path.send_snapshot(observer, {Channel.PLAN})
+
+                if msg.get("type") == "CLEAR_TRAIL":
+                    await map_model.clear_trail()
 
                 if "isPathModuleActive" in msg:
                     await path_model.fromJSON(msg)
@@ -131,27 +271,34 @@ if TURTLEBOT_AVAILABLE:
                     print(f"Path history saved to: {file_path}")
 
                 if msg.get("type") == "LOAD_LATEST_PATH_HISTORY":
-                    latest = load_latest_path_history()
-
-                    # Convert JSON dicts -> PathLogEntry objects (so backend state matches UI)
-                    entries = []
-                    for e in latest["pathHistory"]:
-                        ts = e.get("timestamp")
-                        entries.append(PathLogEntry(
-                            label=e.get("label", ""),
-                            id=e.get("id", ""),
-                            goal_type=e.get("goalType", ""),
-                            timestamp=datetime.fromisoformat(ts) if ts else None,
-                            fuzzy_output=e.get("fuzzyOutput", ""),
-                            user_feedback=e.get("userFeedback", ""),
-                        ))
-
-                    await path_model.set_path_history(entries)
+                    latest = await asyncio.to_thread(latest_snapshot)
+                    if latest is None:
+                        await path_model.set_path_history([])
+                    else:
+                        # Parse and convert JSON dicts -> PathLogEntry objects in a worker thread,
+                        # so large snapshots do not stall other clients
+                        chunks = (
+                            [PathLogEntry.fromJSON(e) for e in chunk]
+                            for chunk in iter_path_history(SNAPSHOT_DIR / latest["filename"])
+                        )
+                        try:
+                            await path_model.load_path_history(
+                                iterate_in_thread(chunks), total=latest["entries"], source=latest["filename"])
+                        except Exception as e:
+                            # The model kept the live history and sent it to every client
+                            print(f"[WS] Loading path history failed: {e}")
+                            await path_model.notify_observer(observer, {
+                                "type": "PATH_LOAD_ERROR",
+                                "source": latest["filename"],
+                                "error": str(e),
+                            }, channel=Channel.PATH)
                 if msg.get("type") == "CLEAR_PATH_HISTORY":
                     await path_model.set_path_history([]) 
         except WebSocketDisconnect:
+            connected_clients.discard(observer)
             robot_state.detach(observer)
             map_model.detach(observer)
+            planned_path.detach(observer)
             path_model.detach(observer)
 
 else:
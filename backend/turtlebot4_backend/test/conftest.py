@@ -0,0 +1,16 @@
+"""
+Shared setup for the backend unit tests.
+
+test_controllers.py and test_map.py replace numpy with a MagicMock in
+sys.modules while they are collected, which happens before
+test_telemetry.py. The numpy-backed telemetry modules are imported here
+first, so they keep the real numpy when it is installed.
+"""
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    pass
+else:
+    import turtlebot4_backend.turtlebot4_utils.TimeSeries  # noqa: F401
+    import turtlebot4_backend.turtlebot4_model.Telemetry  # noqa: F401
@@ -2,11 +2,10 @@
 test_controllers.py — all controller and coverage-gap tests in one file.
 
 Covers:
-  - MapController    (_map_callback, _humans_callback, _robot_pose_callback,
-                      _send_initial_map_png, shutdown)
+  - MapController    (_map_callback, _humans_callback, _robot_pose_callback, shutdown)
   - PathController   (_pose_callback, _rule_callback, _global_goal_callback,
                       dock, undock, cancelNavigation, get_records, stop)
-  - TeleopController (_publish_drive_command, _on_teleop_update, stop)
+  - TeleopController (publish_command, _on_teleop_update, stop)
   - Path             (add_log_entry, update_log_entry, apply_feedback,
                       _send_feedback_summary, toJSON, fromJSON)
   - Feedback         (all methods)
@@ -23,6 +22,7 @@ Run with:
 import asyncio
 import json
 import sys
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -39,17 +39,23 @@ sys.modules['matplotlib.pyplot'] = MagicMock()
 
 from turtlebot4_backend.turtlebot4_controller.MapController import MapController
 from turtlebot4_backend.turtlebot4_controller.PathController import PathController
-from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import RosbridgeConnection
+from turtlebot4_backend.turtlebot4_controller.PlannedPathController import PlannedPathController
+from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import EncodedMessage, RosbridgeConnection
 from turtlebot4_backend.turtlebot4_controller.StatusController import StatusController
 from turtlebot4_backend.turtlebot4_controller.TeleopController import TeleopController
 from turtlebot4_backend.turtlebot4_model.ConcreteObserver import ConcreteObserver
+from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
 from turtlebot4_backend.turtlebot4_model.Feedback import Feedback
 from turtlebot4_backend.turtlebot4_model.FeedbackLogEntry import FeedbackLogEntry
 from turtlebot4_backend.turtlebot4_model.Human import Human
 from turtlebot4_backend.turtlebot4_model.Map import Map
+from turtlebot4_backend.turtlebot4_model.MotionLatency import MotionLatency
 from turtlebot4_backend.turtlebot4_model.Observer import Observer
 from turtlebot4_backend.turtlebot4_model.Path import Path
 from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+from turtlebot4_backend.turtlebot4_model.PlannedPath import PlannedPath
+from turtlebot4_backend.turtlebot4_model.PoseFilter import PoseFilter
 from turtlebot4_backend.turtlebot4_model.RobotState import RobotState
 from turtlebot4_backend.turtlebot4_model.Teleoperate import Teleoperate
 
@@ -83,15 +89,17 @@ def make_entry(id="goal_1", feedback="", timestamp=None, label="Test", goal_type
                         timestamp=timestamp, fuzzy_output="rule", user_feedback=feedback)
 
 
-def make_map_model():
+def make_map_model(poseFilter=None):
     
-    m = Map()
+    m = Map(poseFilter=poseFilter)
     m._convert_mapdata_to_png = MagicMock()
     m._mapDataPNG = "fakepng"
     m.set_mapData = AsyncMock()
     m.set_robotPose = AsyncMock()
     m.set_globalGoal = AsyncMock()
     m.set_intermediateWaypoints = AsyncMock()
+    m.add_intermediateWaypoint = AsyncMock()
+    m.add_intermediateWaypoints = AsyncMock()
     m.set_detectedHumans = AsyncMock()
     return m
 
@@ -113,6 +121,13 @@ def make_path_controller(path_model, map_model):
         ctrl = PathController(path_model=path_model, map_model=map_model)
     return ctrl, mock_ros
 
+def make_planned_path_controller(planned_path):
+    with patch("turtlebot4_backend.turtlebot4_controller.PlannedPathController.RosbridgeConnection") as MockRos:
+        mock_ros = MagicMock()
+        MockRos.return_value = mock_ros
+        ctrl = PlannedPathController(planned_path=planned_path)
+    return ctrl, mock_ros
+
 def make_teleop_controller():
     teleop = Teleoperate()
     loop = asyncio.get_event_loop()
@@ -207,8 +222,8 @@ class TestMapControllerHumansCallback:
 
 class TestMapControllerRobotPoseCallback:
 
-    def _make(self):
-        ctrl, _ = make_map_controller(make_map_model())
+    def _make(self, pose_filter=None):
+        ctrl, _ = make_map_controller(make_map_model(pose_filter))
         ctrl._loop = MagicMock()
         return ctrl
 
@@ -238,24 +253,51 @@ class TestMapControllerRobotPoseCallback:
         ctrl._robot_pose_callback({"pose": {"pose": {"position": {}, "orientation": {}}}})
         ctrl._loop.call_soon_threadsafe.assert_called_once()
 
-
-class TestMapControllerMisc:
-
-    def test_send_initial_png_schedules_when_png_exists(self):
-        m = make_map_model()
-        m._mapDataPNG = "fakepng"
-        ctrl, _ = make_map_controller(m)
-        ctrl._loop = MagicMock()
-        ctrl._send_initial_map_png()
+    def test_stationary_pose_is_dropped_by_dead_band(self):
+        ctrl = self._make()
+        ctrl._robot_pose_callback(self._valid_msg())
+        ctrl._robot_pose_callback(self._valid_msg())
         ctrl._loop.call_soon_threadsafe.assert_called_once()
 
-    def test_send_initial_png_skips_when_no_png(self):
-        m = make_map_model()
-        m._mapDataPNG = None
+    def test_movement_past_threshold_is_published(self):
+        ctrl = self._make(PoseFilter(min_interval=0.0))
+        ctrl._robot_pose_callback(self._valid_msg(x=1.0))
+        ctrl._robot_pose_callback(self._valid_msg(x=2.0))
+        assert ctrl._loop.call_soon_threadsafe.call_count == 2
+
+    def test_rate_capped_pose_arms_one_release_timer(self):
+        ctrl = self._make(PoseFilter(min_interval=10.0))
+        ctrl._robot_pose_callback(self._valid_msg(x=1.0))
+        ctrl._robot_pose_callback(self._valid_msg(x=2.0))
+        ctrl._robot_pose_callback(self._valid_msg(x=3.0))
+        assert ctrl._loop.call_soon_threadsafe.call_count == 2
+        args = ctrl._loop.call_soon_threadsafe.call_args.args
+        assert args[0] is ctrl._loop.call_later
+        assert args[2] == ctrl._map_model.release_held_robotPose
+
+    def test_held_pose_is_published_when_due(self):
+        now = [0.0]
+        m = make_map_model(PoseFilter(min_interval=0.5, clock=lambda: now[0]))
         ctrl, _ = make_map_controller(m)
         ctrl._loop = MagicMock()
-        ctrl._send_initial_map_png()
-        ctrl._loop.call_soon_threadsafe.assert_not_called()
+        ctrl._robot_pose_callback(self._valid_msg(x=1.0))
+        now[0] = 0.1
+        ctrl._robot_pose_callback(self._valid_msg(x=2.0))
+
+        async def release():
+            m.release_held_robotPose()  # not due yet: re-arms itself
+            await asyncio.sleep(0)
+            m.set_robotPose.assert_not_called()
+            now[0] = 0.6
+            m.release_held_robotPose()
+            await asyncio.sleep(0)
+
+        run(release())
+        m.set_robotPose.assert_awaited_once()
+        assert m.set_robotPose.call_args.args[0]["position"]["x"] == 2.0
+
+
+class TestMapControllerMisc:
 
     def test_shutdown_calls_terminate(self):
         ctrl, mock_ros = make_map_controller(make_map_model())
@@ -268,6 +310,37 @@ class TestMapControllerMisc:
         ctrl.shutdown()  # should not raise
 
 
+# ═════════════════════════════════════════════
+# PlannedPathController
+# ═════════════════════════════════════════════
+
+class TestPlannedPathController:
+
+    def _plan(self, *points):
+        return {"poses": [{"pose": {"position": {"x": x, "y": y}}} for x, y in points]}
+
+    def test_subscribes_to_plan(self):
+        _, mock_ros = make_planned_path_controller(PlannedPath())
+        assert mock_ros.subscribe.call_args.args[:2] == ("/plan", "nav_msgs/msg/Path")
+
+    def test_only_latest_plan_applied(self):
+        model = PlannedPath()
+        model.set_plan = AsyncMock()
+        ctrl, _ = make_planned_path_controller(model)
+        ctrl._loop = MagicMock()
+        ctrl._plan_callback(self._plan((0, 0), (1, 0)))
+        ctrl._plan_callback(self._plan((0, 0), (2, 0), (2, 2)))
+        # One apply task for the burst, which takes the newest plan
+        ctrl._loop.call_soon_threadsafe.assert_called_once()
+        run(ctrl._apply_latest_plan())
+        model.set_plan.assert_awaited_once_with([(0, 0), (2, 0), (2, 2)])
+
+    def test_shutdown_calls_terminate(self):
+        ctrl, mock_ros = make_planned_path_controller(PlannedPath())
+        ctrl.shutdown()
+        mock_ros.terminate.assert_called_once()
+
+
 # ═════════════════════════════════════════════
 # PathController
 # ═════════════════════════════════════════════
@@ -321,12 +394,13 @@ class TestPathControllerRuleCallback:
     def test_accepts_dict_data(self):
         ctrl = self._make()
         ctrl._rule_callback({"data": {"goal_type": "global", "position": {"x": 1.0}, "rule": "R1"}})
-        assert ctrl._loop.call_soon_threadsafe.call_count >= 1
+        assert len(ctrl._rule_queue) == 1
+        ctrl._loop.call_soon_threadsafe.assert_called_once()
 
     def test_accepts_json_string(self):
         ctrl = self._make()
         ctrl._rule_callback({"data": json.dumps({"goal_type": "intermediate", "position": {}, "rule": "R2"})})
-        assert ctrl._loop.call_soon_threadsafe.call_count >= 1
+        assert ctrl._rule_queue[0][2] == "R2"
 
     def test_invalid_json_does_not_raise(self):
         ctrl = self._make()
@@ -338,20 +412,54 @@ class TestPathControllerRuleCallback:
         ctrl._rule_callback({"data": 12345})
         ctrl._loop.call_soon_threadsafe.assert_not_called()
 
-    def test_intermediate_type_schedules_waypoint_and_log(self):
+    def test_burst_schedules_one_drain(self):
         ctrl = self._make()
-        ctrl._rule_callback({"data": {"goal_type": "intermediate", "position": {"x": 3.0}, "rule": "R3"}})
-        assert ctrl._loop.call_soon_threadsafe.call_count >= 2
-
-    def test_global_type_schedules_goal_and_log(self):
-        ctrl = self._make()
-        ctrl._rule_callback({"data": {"goal_type": "global", "position": {"x": 5.0}, "rule": "R4"}})
-        assert ctrl._loop.call_soon_threadsafe.call_count >= 2
-
-    def test_unknown_type_still_logs_entry(self):
-        ctrl = self._make()
-        ctrl._rule_callback({"data": {"goal_type": "unknown", "position": {}, "rule": "R5"}})
+        for i in range(5):
+            ctrl._rule_callback({"data": {"goal_type": "intermediate", "position": {}, "rule": f"R{i}"}})
         ctrl._loop.call_soon_threadsafe.assert_called_once()
+        assert len(ctrl._rule_queue) == 5
+
+    def test_drain_applies_batch_with_one_notification_per_model(self):
+        path_model = make_path(active=True)
+        map_model = make_map_model()
+        ctrl, _ = make_path_controller(path_model, map_model)
+        ctrl._loop = MagicMock()
+        obs = make_mock_observer()
+        path_model.attach(obs)
+
+        ctrl._rule_callback({"data": {"goal_type": "intermediate", "position": {"x": 3.0}, "rule": "R1"}})
+        ctrl._rule_callback({"data": {"goal_type": "global", "position": {"x": 1.0}, "rule": "R2"}})
+        ctrl._rule_callback({"data": {"goal_type": "global", "position": {"x": 5.0}, "rule": "R3"}})
+        ctrl._rule_callback({"data": {"goal_type": "unknown", "position": {}, "rule": "R4"}})
+        run(ctrl._drain_rule_queue())
+
+        assert [e.get_id() for e in path_model.get_path_history()] == ["goal_1", "goal_2", "goal_3", "goal_4"]
+        appends = [m for m in obs.received if m["type"] == "PATH_APPEND"]
+        assert len(appends) == 1 and len(appends[0]["entries"]) == 4
+        map_model.add_intermediateWaypoints.assert_awaited_once()
+        map_model.set_globalGoal.assert_awaited_once()
+        assert map_model.set_globalGoal.call_args[0][0]["position"]["x"] == 5.0
+        assert not ctrl._rule_drain_scheduled
+
+    def test_ids_unique_when_rules_arrive_before_entries_are_stored(self):
+        path_model = make_path(active=True)
+        path_model.get_path_store().reset([make_entry("goal_7")])
+        ctrl, _ = make_path_controller(path_model, make_map_model())
+        ctrl._loop = MagicMock()
+        for i in range(3):
+            ctrl._rule_callback({"data": {"goal_type": "global", "position": {}, "rule": f"R{i}"}})
+        run(ctrl._drain_rule_queue())
+        ids = [e.get_id() for e in path_model.get_path_history()]
+        assert ids == ["goal_7", "goal_8", "goal_9", "goal_10"]
+
+    def test_loaded_history_with_higher_ids_is_skipped(self):
+        path_model = make_path(active=True)
+        ctrl, _ = make_path_controller(path_model, make_map_model())
+        ctrl._loop = MagicMock()
+        path_model.get_path_store().reset([make_entry("goal_1"), make_entry("goal_40")])
+        ctrl._rule_callback({"data": {"goal_type": "global", "position": {}, "rule": "R"}})
+        run(ctrl._drain_rule_queue())
+        assert path_model.get_path_history()[-1].get_id() == "goal_41"
 
 
 class TestPathControllerGlobalGoalCallback:
@@ -425,11 +533,41 @@ class TestPathControllerCommands:
         ctrl.cancelNavigation()
         mock_ros.publish.assert_called_once()
         assert mock_ros.publish.call_args[0][0] == "/cmd_vel"
+        assert mock_ros.publish.call_args[0][1] is PathController.STOP_MESSAGE
 
     def test_get_records_returns_path_history(self):
         ctrl, path_model, _ = self._make()
         assert ctrl.get_records() == path_model.get_path_history()
 
+    def test_get_records_page_filters_and_paginates(self):
+        ctrl, path_model, _ = self._make()
+        for i in range(5):
+            run(path_model.add_log_entry(make_entry(id=f"g{i}", goal_type="global" if i % 2 else "intermediate")))
+        page = ctrl.get_records_page(limit=1, goal_type="global", descending=True)
+        assert [e["id"] for e in page["entries"]] == ["g3"]
+        assert page["entries"][0]["index"] == 3
+        nxt = ctrl.get_records_page(cursor=page["nextCursor"], limit=1, goal_type="global", descending=True)
+        assert [e["id"] for e in nxt["entries"]] == ["g1"]
+        assert nxt["nextCursor"] is None
+        assert nxt["version"] == path_model.get_version()
+
+    def test_get_rule_ranking(self):
+        ctrl, path_model, _ = self._make()
+        run(path_model.add_log_entry(PathLogEntry(id="g1", fuzzy_output="R1", user_feedback="bad")))
+        run(path_model.add_log_entry(PathLogEntry(id="g2", fuzzy_output="R2", user_feedback="good")))
+        worst = ctrl.get_rule_ranking(order="worst", limit=1)
+        assert [r["rule"] for r in worst["rules"]] == ["R1"]
+        assert worst["ratedRules"] == 2
+        assert ctrl.get_rule_ranking(order="best", limit=5)["rules"][0]["rule"] == "R2"
+
+    def test_get_segment_stats(self):
+        ctrl, path_model, _ = self._make()
+        run(path_model.add_log_entry(make_entry("g1", timestamp=datetime(2024, 1, 1, 10, 0), goal_type="intermediate")))
+        run(path_model.add_log_entry(make_entry("g2", timestamp=datetime(2024, 1, 1, 10, 2), goal_type="global")))
+        stats = ctrl.get_segment_stats()
+        assert stats["transitions"][0]["startType"] == "intermediate"
+        assert stats["transitions"][0]["p95Seconds"] == 120.0
+
     def test_stop_sets_connected_false(self):
         ctrl, _, _ = self._make()
         ctrl.stop()
@@ -445,53 +583,107 @@ class TestPathControllerCommands:
 # TeleopController
 # ═════════════════════════════════════════════
 
-class TestTeleopControllerPublishDriveCommand:
+class TestTeleopControllerFastPath:
 
-    def _make(self):
-        ctrl, teleop, mock_ros = make_teleop_controller()
+    def test_publishes_first_step_and_records_latency(self):
+        ctrl, _, mock_ros = make_teleop_controller()
+        ctrl._loop = MagicMock()
         mock_ros.publish.reset_mock()
-        return ctrl, teleop, mock_ros
+        assert ctrl.publish_command("FORWARD", time.perf_counter()) is True
+        topic, msg = mock_ros.publish.call_args.args
+        assert topic == "/cmd_vel"
+        # Ramped: one period of acceleration, not the full 0.5 m/s
+        step = TeleopController.MAX_LINEAR_ACCEL * TeleopController.PUBLISH_PERIOD
+        assert abs(msg["linear"]["x"] - step) < 1e-9
+        assert ctrl.get_latency_stats()["count"] == 1
+
+    def test_unknown_command_not_published(self):
+        ctrl, _, mock_ros = make_teleop_controller()
+        mock_ros.publish.reset_mock()
+        assert ctrl.publish_command("LINEAR_SPEED") is False
+        mock_ros.publish.assert_not_called()
 
-    def test_forward_publishes_to_cmd_vel(self):
-        ctrl, teleop, mock_ros = self._make()
-        teleop.add_command("FORWARD")
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_called_once()
-        assert mock_ros.publish.call_args[0][0] == "/cmd_vel"
+    def test_publish_error_not_recorded(self):
+        ctrl, _, mock_ros = make_teleop_controller()
+        ctrl._loop = MagicMock()
+        mock_ros.publish.side_effect = RuntimeError("Not connected")
+        assert ctrl.publish_command("STOP", time.perf_counter()) is False
+        assert ctrl.get_latency_stats()["count"] == 0
 
-    def test_backward_publishes(self):
-        ctrl, teleop, mock_ros = self._make()
-        teleop.add_command("BACKWARD")
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_called_once()
 
-    def test_left_publishes(self):
-        ctrl, teleop, mock_ros = self._make()
-        teleop.add_command("LEFT")
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_called_once()
+class TestTeleopControllerSetpointStream:
 
-    def test_right_publishes(self):
-        ctrl, teleop, mock_ros = self._make()
-        teleop.add_command("RIGHT")
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_called_once()
+    def _make(self):
+        now = [0.0]
+        teleop = Teleoperate(clock=lambda: now[0])
+        with patch("turtlebot4_backend.turtlebot4_controller.TeleopController.RosbridgeConnection") as MockRos:
+            mock_ros = MagicMock()
+            mock_ros.isConnected = True
+            MockRos.return_value = mock_ros
+            ctrl = TeleopController(teleop=teleop, loop=MagicMock())
+        mock_ros.publish.reset_mock()
+        return ctrl, teleop, mock_ros, now
+
+    def _published(self, mock_ros):
+        return [(c.args[1]["linear"]["x"], c.args[1]["angular"]["z"]) for c in mock_ros.publish.call_args_list]
 
-    def test_stop_publishes(self):
-        ctrl, teleop, mock_ros = self._make()
+    def test_ramps_up_with_limited_acceleration(self):
+        ctrl, teleop, mock_ros, now = self._make()
+        teleop.add_command("FORWARD")
+        for i in range(8):
+            ctrl._step(i * 0.05)
+        linear = [x for x, _ in self._published(mock_ros)]
+        assert all(abs(b - a) <= 0.1 + 1e-9 for a, b in zip([0.0] + linear, linear))
+        assert linear[-1] == 0.5
+        # At full speed the pre-encoded command is published
+        assert mock_ros.publish.call_args.args[1] is TeleopController.ENCODED_COMMANDS[(0.5, 0.0)]
+
+    def test_latest_command_wins_and_stop_is_immediate(self):
+        ctrl, teleop, mock_ros, now = self._make()
+        for _ in range(20):
+            teleop.add_command("FORWARD")  # key repeat: no backlog
+        for i in range(6):
+            ctrl._step(i * 0.05)
         teleop.add_command("STOP")
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_called_once()
+        ctrl._step(0.3)
+        ctrl._step(0.35)
+        published = self._published(mock_ros)
+        assert published[-1] == (0.0, 0.0)
+        assert len(published) == 7  # STOP is sent once, then the stream is quiet
+
+    def test_deadman_falls_back_to_stop(self):
+        ctrl, teleop, mock_ros, now = self._make()
+        teleop.add_command("ROTATE_LEFT")
+        ctrl._step(0.0)
+        now[0] = Teleoperate.DEADMAN_TIMEOUT + 0.01  # no refresh from the client
+        ctrl._step(now[0])
+        assert self._published(mock_ros)[-1] == (0.0, 0.0)
+
+    def test_stream_loop_ends_when_stopped(self):
+        ctrl, teleop, mock_ros, _ = self._make()
+        teleop.add_command("STOP")
+        run(ctrl._stream_setpoint())  # returns instead of ticking forever
+        assert self._published(mock_ros) == [(0.0, 0.0)]
 
-    def test_empty_queue_does_not_publish(self):
-        ctrl, _, mock_ros = self._make()
-        run(ctrl._publish_drive_command())
-        mock_ros.publish.assert_not_called()
 
-    def test_unknown_command_does_not_raise(self):
-        ctrl, teleop, _ = self._make()
-        teleop.add_command("NOT_REAL")
-        run(ctrl._publish_drive_command())  # should not raise
+class TestTeleopControllerMotionLatency:
+
+    def test_subscribes_to_odom(self):
+        _, _, mock_ros = make_teleop_controller()
+        topics = [c.args[0] for c in mock_ros.subscribe.call_args_list]
+        assert "/odom" in topics
+
+    def test_publish_and_odom_feed_the_tracker(self):
+        ctrl, _, mock_ros = make_teleop_controller()
+        ctrl._loop = MagicMock()
+        ctrl.publish_command("FORWARD")
+        ctrl._odom_callback({"twist": {"twist": {"linear": {"x": 0.05}, "angular": {"z": 0.0}}}})
+        assert ctrl.get_motion_latency_stats()["count"] == 1
+
+    def test_odom_without_twist_is_ignored(self):
+        ctrl, _, _ = make_teleop_controller()
+        ctrl._odom_callback({})
+        assert ctrl.get_motion_latency_stats()["count"] == 0
 
 
 class TestTeleopControllerMisc:
@@ -538,7 +730,7 @@ class TestPathNewMethods:
         p.attach(obs)
         run(p.add_log_entry(make_entry()))
         assert len(p.get_path_history()) == 1
-        assert any(d["type"] == "PATH_UPDATE" for d in obs.received)
+        assert any(d["type"] == "PATH_APPEND" for d in obs.received)
 
     def test_add_log_entry_multiple(self):
         p = make_path()
@@ -558,7 +750,41 @@ class TestPathNewMethods:
         obs = make_mock_observer()
         p.attach(obs)
         run(p.update_log_entry(0, make_entry(id="g1_new")))
-        assert any(d["type"] == "PATH_UPDATE" for d in obs.received)
+        assert any(d["type"] == "PATH_PATCH" for d in obs.received)
+
+    def test_append_carries_only_the_new_entry(self):
+        p = make_path()
+        run(p.add_log_entry(make_entry(id="g1")))
+        obs = make_mock_observer()
+        p.attach(obs)
+        run(p.add_log_entry(make_entry(id="g2")))
+        msg = obs.received[-1]
+        assert msg["type"] == "PATH_APPEND"
+        assert msg["entry"]["id"] == "g2"
+        assert "pathHistory" not in msg
+
+    def test_patch_carries_index_and_entry(self):
+        p = make_path()
+        run(p.add_log_entry(make_entry(id="g1")))
+        run(p.add_log_entry(make_entry(id="g2")))
+        obs = make_mock_observer()
+        p.attach(obs)
+        run(p.update_log_entry(1, make_entry(id="g2", feedback="good")))
+        msg = obs.received[-1]
+        assert msg["index"] == 1
+        assert msg["entry"]["userFeedback"] == "good"
+
+    def test_path_stream_versions_are_consecutive(self):
+        p = make_path()
+        obs = make_mock_observer()
+        p.attach(obs)
+        run(p.send_snapshot(obs))
+        run(p.add_log_entry(make_entry(id="g1")))
+        run(p.update_log_entry(0, make_entry(id="g1")))
+        run(p.set_is_docked(True))
+        versions = [d["version"] for d in obs.received if d["type"].startswith("PATH_")]
+        assert versions == [0, 1, 2, 3]
+        assert p.get_version() == 3
 
     def test_update_log_entry_out_of_bounds_ignored(self):
         p = make_path()
@@ -656,6 +882,19 @@ class TestPathNewMethods:
         s = [d for d in obs.received if d.get("type") == "FEEDBACK_SUMMARY"][0]
         assert s["goodRatio"] == 1.0 and s["badRatio"] == 0.0
 
+    def test_feedback_summary_counts_after_overwrite(self):
+        p = make_path()
+        run(p.add_log_entry(make_entry(id="g1", goal_type="global")))
+        run(p.add_log_entry(make_entry(id="g2", goal_type="intermediate")))
+        obs = make_mock_observer()
+        p.attach(obs)
+        run(p.apply_feedback({"goalId": "g1", "feedback": "good"}))
+        run(p.apply_feedback({"goalId": "g1", "feedback": "bad"}))
+        s = [d for d in obs.received if d.get("type") == "FEEDBACK_SUMMARY"][-1]
+        assert (s["goodCount"], s["badCount"], s["unratedCount"], s["total"]) == (0, 1, 1, 2)
+        assert s["badRatio"] == 0.5
+        assert s["byGoalType"]["global"] == {"good": 0, "bad": 1, "unrated": 0}
+
     def test_toJSON_contains_expected_keys(self):
         j = make_path().toJSON()
         assert "isPathModuleActive" in j
@@ -678,7 +917,7 @@ class TestPathNewMethods:
         p.attach(obs)
         run(p.fromJSON({"isPathModuleActive": True}))
         assert p.get_is_path_module_active() is True
-        assert any(d["type"] == "PATH_UPDATE" for d in obs.received)
+        assert any(d["type"] == "PATH_FLAGS" for d in obs.received)
 
     def test_fromJSON_no_change_no_notify(self):
         p = make_path()
@@ -774,6 +1013,14 @@ class TestFeedback:
         assert f.get_total_good_ratings() == 1
         assert f.get_total_bad_ratings() == 2
 
+    def test_calculate_ratio_uses_stored_history(self):
+        f = self._make()
+        f.set_path_history([self._entry(id="g1", feedback="good"),
+                            self._entry(id="g2", feedback="")])
+        assert f.calculate_feedback_ratio() == 1.0
+        f.fromJSON({"id": "g2", "feedback": "bad"})
+        assert f.calculate_feedback_ratio() == 0.5
+
     def test_calculate_ratio_none_feedback_skipped(self):
         assert self._make().calculate_feedback_ratio(
             [PathLogEntry(id="g1", user_feedback=None)]) == 0.0
@@ -788,6 +1035,30 @@ class TestFeedback:
         assert log.get_start_point() == "Goal1"
         assert log.get_end_point() == "global"
 
+    def test_update_log_logs_each_goal_once(self):
+        f = self._make()
+        history = [self._entry(id="g1", feedback="good")]
+        f.update_feedback_log(history)
+        history.append(self._entry(id="g2", feedback="bad"))
+        f.update_feedback_log(history)
+        f.update_feedback_log(history)
+        assert [l.get_feedback() for l in f.get_feedback_history()] == ["good", "bad"]
+
+    def test_update_log_picks_up_later_feedback(self):
+        f = self._make()
+        f.update_feedback_log([PathLogEntry(id="g1", user_feedback=None)])
+        f.fromJSON({"id": "g1", "feedback": "good"})
+        f.update_feedback_log()
+        assert [l.get_feedback() for l in f.get_feedback_history()] == ["good"]
+
+    def test_update_log_skips_default_empty_feedback(self):
+        f = self._make()
+        f.update_feedback_log([PathLogEntry(id="g1")])
+        assert f.get_feedback_history() == []
+        f.fromJSON({"id": "g1", "feedback": "bad"})
+        f.update_feedback_log()
+        assert [l.get_feedback() for l in f.get_feedback_history()] == ["bad"]
+
     def test_update_log_skips_none_feedback(self):
         f = self._make()
         f.update_feedback_log([PathLogEntry(id="g1", user_feedback=None)])
@@ -818,6 +1089,12 @@ class TestFeedback:
         f.fromJSON({"feedback": "good"})
         assert f.get_path_history()[0].get_user_feedback() == ""
 
+    def test_fromJSON_finds_entry_among_many(self):
+        f = self._make()
+        f.set_path_history([self._entry(id=f"g{i}") for i in range(1000)])
+        f.fromJSON({"id": "g999", "feedback": "bad"})
+        assert f.get_path_history()[999].get_user_feedback() == "bad"
+
     def test_fromJSON_no_matching_id_does_nothing(self):
         f = self._make()
         f.set_path_history([self._entry(id="g5", feedback="")])
@@ -833,9 +1110,12 @@ class TestConcreteObserver:
 
     def _make(self):
         mock_ws = MagicMock()
-        mock_ws.send_json = AsyncMock()
+        mock_ws.send_text = AsyncMock()
         return ConcreteObserver(mock_ws), mock_ws
 
+    def _sent(self, mock_ws):
+        return [json.loads(c[0][0]) for c in mock_ws.send_text.call_args_list]
+
     def test_stores_client(self):
         obs, mock_ws = self._make()
         assert obs._client is mock_ws
@@ -843,18 +1123,81 @@ class TestConcreteObserver:
     def test_update_sends_payload(self):
         obs, mock_ws = self._make()
         run(obs.update(None, {"type": "TEST"}))
-        mock_ws.send_json.assert_called_once_with({"type": "TEST"})
+        assert self._sent(mock_ws) == [{"type": "TEST"}]
 
     def test_update_multiple_times(self):
         obs, mock_ws = self._make()
         run(obs.update(None, {"n": 1}))
         run(obs.update(None, {"n": 2}))
-        assert mock_ws.send_json.call_count == 2
+        assert mock_ws.send_text.call_count == 2
 
     def test_source_argument_ignored(self):
         obs, mock_ws = self._make()
         run(obs.update(source="anything", data={"k": "v"}))
-        mock_ws.send_json.assert_called_once_with({"k": "v"})
+        assert self._sent(mock_ws) == [{"k": "v"}]
+
+    def test_subscribed_to_all_channels_by_default(self):
+        obs, _ = self._make()
+        assert all(obs.is_subscribed(c) for c in Channel)
+
+    def test_set_channels_returns_added_channels(self):
+        obs, _ = self._make()
+        obs.set_channels({Channel.STATUS})
+        added = obs.set_channels({Channel.STATUS, Channel.PATH})
+        assert added == {Channel.PATH}
+        assert obs.is_subscribed(Channel.PATH)
+        assert not obs.is_subscribed(Channel.POSE)
+
+    def test_path_and_status_snapshots_are_per_client(self):
+        obs, mock_ws = self._make()
+        other, other_ws = self._make()
+        path = make_path()
+        state = RobotState(path_model=path)
+        for model in (path, state):
+            model.attach(obs)
+            model.attach(other)
+            run(model.send_snapshot(obs))
+        sent = [m["type"] for m in self._sent(mock_ws)]
+        assert sent == ["PATH_UPDATE", "FEEDBACK_SUMMARY", "STATUS_UPDATE"]
+        other_ws.send_text.assert_not_called()
+
+    def test_snapshot_for_added_channels_only(self):
+        obs, mock_ws = self._make()
+        path = make_path()
+        run(path.send_snapshot(obs, {Channel.FEEDBACK}))
+        run(RobotState(path_model=path).send_snapshot(obs, {Channel.FEEDBACK}))
+        sent = [m["type"] for m in self._sent(mock_ws)]
+        assert sent == ["FEEDBACK_SUMMARY"]
+
+    def test_unsubscribed_channel_is_not_sent(self):
+        obs, mock_ws = self._make()
+        obs.set_channels(Channel.parse(["status", "bogus"]))
+        state = RobotState(path_model=make_path())
+        state.attach(obs)
+        path = make_path()
+        path.attach(obs)
+        run(state.set_is_on(True))
+        run(path.set_is_docked(True))
+        assert [m["type"] for m in self._sent(mock_ws)] == ["STATUS_UPDATE"]
+
+    def test_stats_count_messages_and_bytes_per_type(self):
+        obs, _ = self._make()
+        run(obs.update(None, {"type": "POSE_DATA"}))
+        run(obs.update(None, {"type": "POSE_DATA"}))
+        run(obs.update(None, {"type": "MAP_DATA", "png": "abc"}))
+        stats = obs.get_stats()
+        assert stats["messages"] == {"POSE_DATA": 2, "MAP_DATA": 1}
+        assert stats["bytes"]["POSE_DATA"] == 2 * len('{"type":"POSE_DATA"}')
+        assert stats["sendLatency"]["count"] == 3
+        assert stats["queueDepth"] == 0
+
+    def test_backlogged_client_drops_latest_value_messages(self):
+        obs, mock_ws = self._make()
+        obs._pending = ConcreteObserver.MAX_PENDING_SENDS
+        run(obs.update(None, {"type": "POSE_DATA"}))
+        run(obs.update(None, {"type": "PATH_UPDATE"}))
+        assert [m["type"] for m in self._sent(mock_ws)] == ["PATH_UPDATE"]
+        assert obs.get_stats()["dropped"] == {"POSE_DATA": 1}
 
 
 # ═════════════════════════════════════════════
@@ -926,6 +1269,30 @@ class TestStatusController:
             sc = StatusController(robot_state=robot_state, loop=loop)
         return sc, robot_state
 
+    # ── motion latency ─────────────────────────────────────────────────────────
+
+    def test_motion_latency_sample_schedules_status_update(self):
+        motion = MotionLatency()
+        robot_state = RobotState(path_model=Path(), motion_latency=motion)
+        loop = MagicMock()
+        with patch("turtlebot4_backend.turtlebot4_controller.StatusController.RosbridgeConnection"), \
+             patch("threading.Thread"):
+            StatusController(robot_state=robot_state, loop=loop)
+        motion.record_command(0.2, 0.0)
+        motion.record_odom(0.1, 0.0)
+        loop.call_soon_threadsafe.assert_called_once()
+
+    def test_update_motion_latency_notifies_listeners(self):
+        sc, state = self._make()
+        received = []
+
+        async def listener(msg):
+            received.append(msg)
+
+        sc.attach_listener(listener)
+        run(sc.updateMotionLatency())
+        assert len(received) == 1 and "motionLatency" in received[0]
+
     # ── updateBattery ──────────────────────────────────────────────────────────
 
     def test_battery_normalizes_0_to_1_range(self):
@@ -1356,6 +1723,89 @@ class TestRosbridgeConnection:
             mock_roslibpy.Topic.assert_not_called()
         mock_topic.publish.assert_called_once()
 
+    def test_encoded_message_frame_matches_message(self):
+        msg = EncodedMessage(DirectionCommand.FORWARD.value)
+        assert msg == DirectionCommand.FORWARD.value
+        frame = json.loads(msg.get_frame('/cmd_vel'))
+        assert frame == {"op": "publish", "id": "publish:/cmd_vel:cached", "topic": "/cmd_vel",
+                         "msg": msg, "latch": False}
+        assert msg.get_frame('/cmd_vel') is msg.get_frame('/cmd_vel')
+
+    def test_publish_encoded_message_sends_cached_frame(self):
+        rc = self._make(connected=True)
+        mock_topic = self._make_topic()
+        rc._topics['/cmd_vel'] = mock_topic
+        msg = EncodedMessage(DirectionCommand.STOP.value)
+        with patch('turtlebot4_backend.turtlebot4_controller.RosbridgeConnection.roslibpy') as mock_roslibpy:
+            mock_roslibpy.__version__ = '1.7.0'
+            rc.publish('/cmd_vel', msg)
+        mock_topic.publish.assert_not_called()
+        send = rc.client.factory.on_ready.call_args.args[0]
+        proto = MagicMock()
+        send(proto)
+        proto.send_message.assert_called_once_with(msg.get_frame('/cmd_vel'))
+
+    def test_publish_encoded_message_through_roslibpy_client_shape(self):
+        # Mirrors roslibpy 1.x: RosBridgeClientFactory.on_ready(callback) runs
+        # callback(proto) once connected, and the protocol's send_message writes the payload.
+        class Protocol:
+            def __init__(self):
+                self.sent = []
+
+            def send_message(self, payload):
+                self.sent.append(payload)
+
+        class Factory:
+            def __init__(self):
+                self.proto = Protocol()
+
+            def on_ready(self, callback):
+                callback(self.proto)
+
+        class Ros:
+            def __init__(self):
+                self.factory = Factory()
+
+        rc = self._make()
+        rc.client = Ros()
+        rc.isConnected = True
+        topic = self._make_topic()
+        topic.is_advertised = False
+        topic.advertise.side_effect = lambda: setattr(topic, 'is_advertised', True)
+        rc._topics['/cmd_vel'] = topic
+        msg = EncodedMessage(DirectionCommand.FORWARD.value)
+        with patch('turtlebot4_backend.turtlebot4_controller.RosbridgeConnection.roslibpy') as mock_roslibpy:
+            mock_roslibpy.__version__ = '1.7.0'
+            rc.publish('/cmd_vel', msg)
+            rc.publish('/cmd_vel', msg)
+        topic.advertise.assert_called_once()
+        topic.publish.assert_not_called()
+        assert rc.client.factory.proto.sent == [msg.get_frame('/cmd_vel')] * 2
+
+    def test_publish_encoded_message_falls_back_without_raw_send(self, capsys):
+        rc = self._make(connected=True)
+        rc.client = MagicMock(spec=[])  # no factory to send frames through
+        mock_topic = self._make_topic()
+        rc._topics['/cmd_vel'] = mock_topic
+        with patch('turtlebot4_backend.turtlebot4_controller.RosbridgeConnection.roslibpy') as mock_roslibpy:
+            mock_roslibpy.__version__ = '1.7.0'
+            rc.publish('/cmd_vel', EncodedMessage(DirectionCommand.STOP.value))
+            rc.publish('/cmd_vel', EncodedMessage(DirectionCommand.STOP.value))
+        assert mock_topic.publish.call_count == 2
+        assert capsys.readouterr().out.count('factory.on_ready') == 1
+
+    def test_publish_encoded_message_falls_back_on_unsupported_roslibpy(self, capsys):
+        rc = self._make(connected=True)
+        mock_topic = self._make_topic()
+        rc._topics['/cmd_vel'] = mock_topic
+        with patch('turtlebot4_backend.turtlebot4_controller.RosbridgeConnection.roslibpy') as mock_roslibpy:
+            mock_roslibpy.__version__ = '2.0.0'
+            rc.publish('/cmd_vel', EncodedMessage(DirectionCommand.STOP.value))
+            rc.publish('/cmd_vel', EncodedMessage(DirectionCommand.STOP.value))
+        assert mock_topic.publish.call_count == 2
+        rc.client.factory.on_ready.assert_not_called()
+        assert capsys.readouterr().out.count('roslibpy 2.0.0 is not supported') == 1
+
     # ── call_service ──────────────────────────────────────────────────────────
 
     def test_call_service_raises_when_not_connected(self):
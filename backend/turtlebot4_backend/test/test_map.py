@@ -29,6 +29,7 @@ from turtlebot4_backend.turtlebot4_model.Map import Map
 from turtlebot4_backend.turtlebot4_model.MapData import MapData
 from turtlebot4_backend.turtlebot4_model.Human import Human
 from turtlebot4_backend.turtlebot4_model.Observer import Observer
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
 
 
 # ─────────────────────────────────────────────
@@ -66,7 +67,7 @@ class TestMapInit:
         m = make_map()
         assert m._robotPose is None
         assert m._globalGoal is None
-        assert m._intermediateWaypoints == []
+        assert m.get_intermediateWaypoints() == []
         assert m._mapDataPNG == "fakepng"
 
     def test_mapdata_defaults_to_empty_MapData(self):
@@ -81,7 +82,7 @@ class TestMapInit:
 
     def test_initial_waypoints_empty_list(self):
         m = make_map()
-        assert m._intermediateWaypoints == []
+        assert m.get_intermediateWaypoints() == []
 
     def test_custom_initial_values(self):
         pose = {"position": {"x": 1.0, "y": 0.0, "z": 0.0},
@@ -90,7 +91,7 @@ class TestMapInit:
         m._convert_mapdata_to_png = MagicMock()
         assert m._robotPose == pose
         assert m._globalGoal == pose
-        assert len(m._intermediateWaypoints) == 1
+        assert len(m.get_intermediateWaypoints()) == 1
 
 
 # ─────────────────────────────────────────────
@@ -106,6 +107,14 @@ class TestMapSetRobotPose:
         run(m.set_robotPose(pose))
         assert m._robotPose == pose
 
+    def test_records_position_in_telemetry(self):
+        telemetry = MagicMock()
+        m = Map(telemetry=telemetry)
+        run(m.set_robotPose({"position": {"x": 1.0, "y": 2.0, "z": 0.0},
+                              "orientation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0}}))
+        telemetry.record.assert_any_call("poseX", 1.0)
+        telemetry.record.assert_any_call("poseY", 2.0)
+
     def test_notifies_with_POSE_DATA(self):
         m = make_map()
         obs = make_observer()
@@ -153,19 +162,99 @@ class TestMapSetIntermediateWaypoints:
         wps = [{"position": {"x": 1, "y": 1, "z": 0},
                 "orientation": {"x": 0, "y": 0, "z": 0, "w": 1}}]
         run(m.set_intermediateWaypoints(wps))
-        assert m._intermediateWaypoints == wps
+        assert m.get_intermediateWaypoints() == wps
 
-    def test_notifies_with_POSE_DATA(self):
+    def test_notifies_with_WAYPOINT_UPDATE_reset(self):
         m = make_map()
         obs = make_observer()
         m.attach(obs)
         run(m.set_intermediateWaypoints([]))
-        assert any(d.get("type") == "POSE_DATA" for d in obs.received)
+        assert obs.received[-1] == {"type": "WAYPOINT_UPDATE", "op": "reset", "waypoints": []}
 
     def test_stores_empty_list(self):
         m = make_map()
         run(m.set_intermediateWaypoints([]))
-        assert m._intermediateWaypoints == []
+        assert m.get_intermediateWaypoints() == []
+
+
+# ─────────────────────────────────────────────
+# Map — waypoint deltas
+# ─────────────────────────────────────────────
+
+def _wp(x):
+    return {"position": {"x": x, "y": 0.0, "z": 0.0},
+            "orientation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0}}
+
+
+class TestMapWaypointDeltas:
+
+    def test_append_sends_only_new_waypoint(self):
+        m = make_map()
+        obs = make_observer()
+        m.attach(obs)
+        run(m.add_intermediateWaypoint(_wp(1.0)))
+        run(m.add_intermediateWaypoint(_wp(2.0)))
+        event = obs.received[-1]
+        assert event["op"] == "append"
+        assert len(event["waypoints"]) == 1
+        assert event["waypoints"][0]["id"] == 2
+        assert event["waypoints"][0]["position"]["x"] == 2.0
+        assert event["evicted"] == []
+
+    def test_append_evicts_oldest_when_full(self):
+        m = Map(waypointCapacity=2)
+        obs = make_observer()
+        m.attach(obs)
+        for x in (1.0, 2.0, 3.0):
+            run(m.add_intermediateWaypoint(_wp(x)))
+        assert [p["position"]["x"] for p in m.get_intermediateWaypoints()] == [2.0, 3.0]
+        assert obs.received[-1]["evicted"] == [1]
+
+    def test_evict_by_id(self):
+        m = make_map()
+        run(m.add_intermediateWaypoint(_wp(1.0)))
+        run(m.add_intermediateWaypoint(_wp(2.0)))
+        obs = make_observer()
+        m.attach(obs)
+        run(m.evict_intermediateWaypoint(2))
+        assert obs.received == [{"type": "WAYPOINT_UPDATE", "op": "evict", "evicted": [2]}]
+        assert len(m.get_intermediateWaypoints()) == 1
+
+    def test_evict_unknown_id_does_not_notify(self):
+        m = make_map()
+        obs = make_observer()
+        m.attach(obs)
+        run(m.evict_intermediateWaypoint(42))
+        assert obs.received == []
+
+    def test_clear_keeps_ids_increasing(self):
+        m = make_map()
+        run(m.add_intermediateWaypoint(_wp(1.0)))
+        run(m.clear_intermediateWaypoints())
+        obs = make_observer()
+        m.attach(obs)
+        run(m.add_intermediateWaypoint(_wp(2.0)))
+        assert m.get_intermediateWaypoints() == [_wp(2.0)]
+        assert obs.received[-1]["waypoints"][0]["id"] == 2
+
+    def test_batch_append_sends_one_delta(self):
+        m = Map(waypointCapacity=2)
+        run(m.add_intermediateWaypoint(_wp(0.0)))
+        obs = make_observer()
+        m.attach(obs)
+        run(m.add_intermediateWaypoints([_wp(1.0), _wp(2.0), _wp(3.0)]))
+        assert len(obs.received) == 1
+        event = obs.received[0]
+        # Waypoint 2 was added and evicted within the batch, so clients never see it
+        assert [w["id"] for w in event["waypoints"]] == [3, 4]
+        assert event["evicted"] == [1]
+
+    def test_empty_batch_does_not_notify(self):
+        m = make_map()
+        obs = make_observer()
+        m.attach(obs)
+        run(m.add_intermediateWaypoints([]))
+        assert obs.received == []
 
 
 # ─────────────────────────────────────────────
@@ -204,7 +293,7 @@ class TestMapSetDetectedHumans:
 
 class TestMapSendPoseUpdate:
 
-    def test_payload_contains_all_keys(self):
+    def test_payload_contains_pose_keys(self):
         m = make_map()
         obs = make_observer()
         m.attach(obs)
@@ -212,24 +301,164 @@ class TestMapSendPoseUpdate:
         event = [d for d in obs.received if d.get("type") == "POSE_DATA"][0]
         assert "robotPose" in event
         assert "globalGoal" in event
-        assert "intermediateWaypoints" in event
-        assert "humans" in event
+        assert "humans" not in event
 
-    def test_intermediateWaypoints_is_list(self):
+    def test_waypoints_not_resent_on_pose_tick(self):
         m = make_map()
+        run(m.add_intermediateWaypoint(_wp(1.0)))
         obs = make_observer()
         m.attach(obs)
         run(m.set_robotPose(None))
         event = [d for d in obs.received if d.get("type") == "POSE_DATA"][0]
-        assert isinstance(event["intermediateWaypoints"], list)
+        assert "intermediateWaypoints" not in event
 
     def test_humans_is_list(self):
         m = make_map()
         obs = make_observer()
         m.attach(obs)
-        run(m.set_robotPose(None))
+        run(m.set_detectedHumans([]))
         event = [d for d in obs.received if d.get("type") == "POSE_DATA"][0]
         assert isinstance(event["humans"], list)
+        assert "robotPose" not in event
+
+
+# ─────────────────────────────────────────────
+# Map — channel subscriptions
+# ─────────────────────────────────────────────
+
+class _ChannelObs(Observer):
+    def __init__(self, channels):
+        self.channels = set(channels)
+        self.received = []
+    def is_subscribed(self, channel):
+        return channel in self.channels
+    async def update(self, source, data):
+        self.received.append(data)
+
+
+class TestMapChannels:
+
+    def test_pose_only_observer_skips_humans(self):
+        m = make_map()
+        obs = _ChannelObs({Channel.POSE})
+        m.attach(obs)
+        run(m.set_detectedHumans([Human(human_id="h1")]))
+        run(m.set_robotPose(None))
+        assert len(obs.received) == 1
+        assert "robotPose" in obs.received[0]
+
+    def test_pose_payload_not_built_without_subscribers(self):
+        m = make_map()
+        m.attach(_ChannelObs({Channel.STATUS}))
+        m._pose_to_dict = MagicMock()
+        run(m.set_robotPose(None))
+        m._pose_to_dict.assert_not_called()
+
+    def test_map_data_routed_to_map_channel(self):
+        m = make_map()
+        map_obs = _ChannelObs({Channel.MAP})
+        pose_obs = _ChannelObs({Channel.POSE})
+        m.attach(map_obs)
+        m.attach(pose_obs)
+        run(m.set_mapData(MapData()))
+        assert [d["type"] for d in map_obs.received] == ["MAP_DATA"]
+        assert pose_obs.received == []
+
+
+# ─────────────────────────────────────────────
+# Map — per-client snapshot
+# ─────────────────────────────────────────────
+
+class TestMapSendSnapshot:
+
+    def test_snapshot_goes_only_to_target(self):
+        m = make_map()
+        target, other = make_observer(), make_observer()
+        m.attach(target)
+        m.attach(other)
+        run(m.send_snapshot(target))
+        assert other.received == []
+        assert [d["type"] for d in target.received] == ["MAP_DATA", "POSE_DATA", "WAYPOINT_UPDATE", "POSE_DATA", "TRAIL_RESET"]
+
+    def test_snapshot_skips_map_without_png(self):
+        m = make_map()
+        m._mapDataPNG = None
+        obs = make_observer()
+        run(m.send_snapshot(obs))
+        assert "MAP_DATA" not in [d["type"] for d in obs.received]
+
+    def test_snapshot_limited_to_requested_channels(self):
+        m = make_map()
+        obs = make_observer()
+        run(m.send_snapshot(obs, {Channel.HUMANS}))
+        assert obs.received == [{"type": "POSE_DATA", "humans": []}]
+
+    def test_snapshot_respects_observer_channels(self):
+        m = make_map()
+        obs = _ChannelObs({Channel.MAP})
+        run(m.send_snapshot(obs))
+        assert [d["type"] for d in obs.received] == ["MAP_DATA"]
+
+
+# ─────────────────────────────────────────────
+# Map — driven trail
+# ─────────────────────────────────────────────
+
+class TestMapTrail:
+
+    def _pose(self, x, y):
+        return {"position": {"x": x, "y": y}}
+
+    def test_only_new_vertices_are_sent(self):
+        m = make_map()
+        obs = _ChannelObs({Channel.TRAIL})
+        m.attach(obs)
+        for i in range(20):
+            run(m.set_robotPose(self._pose(i / 10, 0.0)))
+        for i in range(1, 5):
+            run(m.set_robotPose(self._pose(1.9, i / 10)))
+        assert [d["type"] for d in obs.received] == ["TRAIL_APPEND", "TRAIL_APPEND"]
+        assert [v["id"] for d in obs.received for v in d["vertices"]] == [1, 2]
+        assert obs.received[1]["vertices"][0]["x"] == 1.9
+        assert obs.received[1]["firstId"] == 1
+
+    def test_trail_recorded_without_subscribers(self):
+        m = make_map()
+        obs = _ChannelObs({Channel.POSE})
+        m.attach(obs)
+        run(m.set_robotPose(self._pose(0.0, 0.0)))
+        assert all(d["type"] == "POSE_DATA" for d in obs.received)
+        assert len(m.get_trail()) == 1
+
+    def test_resync_with_coarser_tolerance(self):
+        m = make_map()
+        obs = make_observer()
+        for i in range(10):
+            run(m.set_robotPose(self._pose(float(i), 0.2 * (i % 2))))
+        run(m.send_trail_snapshot(obs, 1.0))
+        reset = obs.received[0]
+        assert reset["type"] == "TRAIL_RESET" and reset["tolerance"] == 1.0
+        assert len(reset["vertices"]) < len(m.get_trail())
+
+    def test_resync_simplifies_off_the_event_loop(self):
+        m = make_map()
+        obs = make_observer()
+        for i in range(10):
+            run(m.set_robotPose(self._pose(float(i), 0.2 * (i % 2))))
+        with patch("turtlebot4_backend.turtlebot4_model.Map.asyncio.to_thread",
+                   wraps=asyncio.to_thread) as to_thread:
+            run(m.send_trail_snapshot(obs, 1.0))
+        to_thread.assert_called_once()
+        assert obs.received[0]["vertices"] == m._trail.get_vertices(1.0)
+
+    def test_clear_trail(self):
+        m = make_map()
+        obs = make_observer()
+        m.attach(obs)
+        run(m.set_robotPose(self._pose(0.0, 0.0)))
+        run(m.clear_trail())
+        assert obs.received[-1]["type"] == "TRAIL_RESET"
+        assert obs.received[-1]["vertices"] == []
 
 
 # ─────────────────────────────────────────────
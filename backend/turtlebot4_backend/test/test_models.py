@@ -9,7 +9,7 @@ no network connections required. Run with:
 
 import pytest
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 from turtlebot4_backend.turtlebot4_model.Teleoperate import Teleoperate
 from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
@@ -20,6 +20,20 @@ from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
 from turtlebot4_backend.turtlebot4_model.FeedbackLogEntry import FeedbackLogEntry
 from turtlebot4_backend.turtlebot4_model.RobotState import RobotState
 from turtlebot4_backend.turtlebot4_model.Observer import Observer
+from turtlebot4_backend.turtlebot4_model.WaypointStore import WaypointStore
+from turtlebot4_backend.turtlebot4_model.PoseFilter import PoseFilter
+from turtlebot4_backend.turtlebot4_model.PathHistoryStore import PathHistoryStore
+from turtlebot4_backend.turtlebot4_utils.GoalIdAllocator import GoalIdAllocator
+from turtlebot4_backend.turtlebot4_utils.LatencyStats import LatencyStats
+from turtlebot4_backend.turtlebot4_utils.QuantileSketch import QuantileSketch
+from turtlebot4_backend.turtlebot4_model.SegmentStats import SegmentStats
+from turtlebot4_backend.turtlebot4_model.MotionLatency import MotionLatency
+from turtlebot4_backend.turtlebot4_model.Trail import Trail
+from turtlebot4_backend.turtlebot4_model.PlannedPath import PlannedPath
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
+from turtlebot4_backend.turtlebot4_utils.Polyline import (
+    douglas_peucker, point_segment_distance, splice_diff, sleeve_simplify,
+)
 
 
 # ─────────────────────────────────────────────
@@ -235,6 +249,24 @@ class TestPathLogEntry:
         e.set_timestamp(None)
         assert e.get_timestamp() is None
 
+    def test_has_no_instance_dict(self):
+        e = PathLogEntry()
+        assert not hasattr(e, "__dict__")
+        with pytest.raises(AttributeError):
+            e.extra = 1
+
+    def test_repeated_strings_are_shared(self):
+        a = PathLogEntry(goal_type="".join(["inter", "mediate"]))
+        b = PathLogEntry(goal_type="".join(["interme", "diate"]))
+        assert a.get_goal_type() is b.get_goal_type()
+
+    def test_toJSON_uses_frontend_keys(self):
+        e = PathLogEntry(label="L", id="goal_1", goal_type="global",
+                         timestamp=datetime(2024, 1, 1), fuzzy_output="r", user_feedback="good")
+        assert e.toJSON() == {"label": "L", "id": "goal_1", "goalType": "global",
+                              "timestamp": "2024-01-01T00:00:00", "fuzzyOutput": "r",
+                              "userFeedback": "good"}
+
 
 # ─────────────────────────────────────────────
 # FeedbackLogEntry
@@ -269,6 +301,702 @@ class TestFeedbackLogEntry:
         assert f.get_feedback() == "bad"
 
 
+# ─────────────────────────────────────────────
+# WaypointStore
+# ─────────────────────────────────────────────
+
+class TestWaypointStore:
+    """Tests for the bounded WaypointStore."""
+
+    def test_ids_are_monotonic(self):
+        s = WaypointStore(capacity=3)
+        ids = [s.append({"n": i})[0] for i in range(5)]
+        assert ids == [1, 2, 3, 4, 5]
+
+    def test_capacity_is_enforced(self):
+        s = WaypointStore(capacity=2)
+        for i in range(5):
+            s.append({"n": i})
+        assert len(s) == 2
+        assert s.get_poses() == [{"n": 3}, {"n": 4}]
+
+    def test_append_reports_evicted_ids(self):
+        s = WaypointStore(capacity=1)
+        s.append({"n": 0})
+        assert s.append({"n": 1}) == (2, [1])
+
+    def test_replace_keeps_newest(self):
+        s = WaypointStore(capacity=2)
+        s.replace([{"n": 0}, {"n": 1}, {"n": 2}])
+        assert s.get_poses() == [{"n": 1}, {"n": 2}]
+
+    def test_invalid_capacity_raises(self):
+        with pytest.raises(ValueError):
+            WaypointStore(capacity=0)
+
+
+# ─────────────────────────────────────────────
+# PathHistoryStore
+# ─────────────────────────────────────────────
+
+class TestPathHistoryStore:
+    """Tests for the indexed path history store."""
+
+    def _store(self):
+        return PathHistoryStore([
+            PathLogEntry(id="g1", goal_type="intermediate", timestamp=datetime(2024, 1, 1, 10, 0)),
+            PathLogEntry(id="g2", goal_type="global", timestamp=datetime(2024, 1, 1, 10, 5)),
+            PathLogEntry(id="g3", goal_type="intermediate", timestamp=datetime(2024, 1, 1, 11, 0)),
+            PathLogEntry(id="g4", goal_type="intermediate", timestamp=None),
+        ])
+
+    def test_lookup_by_id(self):
+        s = self._store()
+        assert s.index_of("g3") == 2
+        assert s.get("g2").get_goal_type() == "global"
+        assert s.index_of("missing") is None
+
+    def test_append_returns_position(self):
+        s = self._store()
+        assert s.append(PathLogEntry(id="g5")) == 4
+        assert s.index_of("g5") == 4
+
+    def test_query_by_goal_type(self):
+        assert self._store().query(goal_type="intermediate") == [0, 2, 3]
+
+    def test_query_by_time_range(self):
+        s = self._store()
+        assert s.query(start=datetime(2024, 1, 1, 10, 1)) == [1, 2]
+        assert s.query(end=datetime(2024, 1, 1, 10, 5)) == [0, 1]
+
+    def test_query_accepts_z_timestamps(self):
+        # What the endpoint gets for from=...Z: an aware datetime, compared in local time
+        local = datetime(2024, 1, 1, 10, 1).astimezone()
+        z = local.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        start = datetime.fromisoformat(z)
+        s = self._store()
+        assert s.query(start=start) == [1, 2]
+        assert s.query(goal_type="intermediate", start=start) == [2]
+        assert s.query(feedback="unrated", end=datetime.fromisoformat(z)) == [0]
+
+    def test_query_combines_filters(self):
+        s = self._store()
+        assert s.query(goal_type="intermediate", start=datetime(2024, 1, 1, 10, 30)) == [2]
+
+    def test_replace_reindexes_changed_entry(self):
+        s = self._store()
+        s.replace(0, PathLogEntry(id="g1b", goal_type="global", timestamp=None))
+        assert s.index_of("g1") is None
+        assert s.index_of("g1b") == 0
+        assert s.query(goal_type="global") == [0, 1]
+        assert s.query(end=datetime(2024, 1, 1, 10, 0)) == []
+
+    def test_feedback_counters_follow_overwrites(self):
+        s = self._store()
+        assert s.get_feedback_counts() == {"good": 0, "bad": 0, "unrated": 4}
+        entry = s[0]
+        entry.set_user_feedback("good")
+        s.replace(0, entry)
+        entry.set_user_feedback("bad")
+        s.replace(0, entry)
+        assert s.get_feedback_counts() == {"good": 0, "bad": 1, "unrated": 3}
+        assert s.get_feedback_counts_by_goal_type()["intermediate"] == {"good": 0, "bad": 1, "unrated": 2}
+
+    def test_feedback_counters_follow_goal_type_change(self):
+        s = self._store()
+        s.replace(1, PathLogEntry(id="g2", goal_type="intermediate", user_feedback="good"))
+        assert "global" not in s.get_feedback_counts_by_goal_type()
+        assert s.get_feedback_counts_by_goal_type()["intermediate"]["good"] == 1
+
+    def test_query_by_feedback(self):
+        s = self._store()
+        entry = s[2]
+        entry.set_user_feedback("bad")
+        s.replace(2, entry)
+        assert s.query(feedback="bad") == [2]
+        assert s.query(feedback="unrated", goal_type="intermediate") == [0, 3]
+
+    def test_page_follows_cursor(self):
+        s = self._store()
+        positions = s.query()
+        first, cursor = s.page(positions, limit=2)
+        assert [i for i, _ in first] == [0, 1] and cursor == 1
+        second, cursor = s.page(positions, cursor=cursor, limit=2)
+        assert [i for i, _ in second] == [2, 3] and cursor is None
+
+    def test_page_descending_with_rule(self):
+        s = self._store()
+        s.replace(1, PathLogEntry(id="g2", goal_type="global", fuzzy_output="Zone: NEAR"))
+        items, cursor = s.page(s.query(), limit=5, descending=True, rule="near")
+        assert [i for i, _ in items] == [1] and cursor is None
+
+    def test_reset_rebuilds_indexes(self):
+        s = self._store()
+        s.reset([PathLogEntry(id="x")])
+        assert len(s) == 1
+        assert s.index_of("g1") is None
+        assert s.index_of("x") == 0
+
+
+# ─────────────────────────────────────────────
+# RuleAggregates (maintained by PathHistoryStore)
+# ─────────────────────────────────────────────
+
+def _rule_entry(rule, feedback="", minute=0):
+    return PathLogEntry(id=f"g{minute}", fuzzy_output=rule, user_feedback=feedback,
+                        timestamp=datetime(2024, 1, 1, 10, minute))
+
+
+class TestRuleAggregates:
+    """Tests for the per-rule aggregates and their ranking."""
+
+    def test_counts_and_mean_segment_duration(self):
+        s = PathHistoryStore([_rule_entry("A", "bad", 0), _rule_entry("B", "good", 2),
+                              _rule_entry("A", "", 3), _rule_entry("B", "bad", 7)])
+        a = s.get_rule_aggregates().get("A")
+        assert (a["count"], a["good"], a["bad"], a["unrated"]) == (2, 0, 1, 1)
+        # Segments A: 10:00 -> 10:02 and 10:03 -> 10:07
+        assert a["meanSegmentSeconds"] == 180.0
+        # The last entry's segment is still open
+        assert s.get_rule_aggregates().get("B")["meanSegmentSeconds"] == 60.0
+
+    def test_ranking_orders_by_bad_ratio(self):
+        s = PathHistoryStore([_rule_entry("A", "bad", 0), _rule_entry("B", "good", 1),
+                              _rule_entry("C", "bad", 2), _rule_entry("C", "good", 3),
+                              _rule_entry("D", "", 4)])
+        rules = s.get_rule_aggregates()
+        assert [r["rule"] for r in rules.worst(3)] == ["A", "C", "B"]
+        assert [r["rule"] for r in rules.best(2)] == ["B", "C"]
+        assert rules.get_rated_count() == 3
+
+    def test_ties_rank_more_ratings_further_out(self):
+        s = PathHistoryStore([_rule_entry("A", "bad", 0), _rule_entry("B", "bad", 1),
+                              _rule_entry("B", "bad", 2), _rule_entry("C", "good", 3)])
+        assert s.get_rule_aggregates().worst(1)[0]["rule"] == "B"
+
+    def test_feedback_change_reranks(self):
+        s = PathHistoryStore([_rule_entry("A", "bad", 0), _rule_entry("B", "good", 1)])
+        entry = s[0]
+        entry.set_user_feedback("good")
+        s.replace(0, entry)
+        rules = s.get_rule_aggregates()
+        assert rules.get("A")["bad"] == 0
+        assert rules.get("A")["meanSegmentSeconds"] == 60.0
+        assert rules.worst(1)[0]["badRatio"] == 0.0
+
+    def test_matches_full_recount_after_random_changes(self):
+        import random
+        rng = random.Random(4)
+        s = PathHistoryStore()
+        for i in range(200):
+            if len(s) and rng.random() < 0.4:
+                index = rng.randrange(len(s))
+                s.replace(index, _rule_entry(rng.choice("ABCD"), rng.choice(["good", "bad", ""]),
+                                             rng.randrange(60)))
+            else:
+                s.append(_rule_entry(rng.choice("ABCD"), rng.choice(["good", "bad", ""]), rng.randrange(60)))
+
+        fresh = PathHistoryStore(list(s)).get_rule_aggregates()
+        rules = s.get_rule_aggregates()
+        for rule in "ABCD":
+            expected, actual = fresh.get(rule), rules.get(rule)
+            if expected is None:
+                assert actual is None
+                continue
+            assert {k: v for k, v in actual.items() if k != "meanSegmentSeconds"} == \
+                   {k: v for k, v in expected.items() if k != "meanSegmentSeconds"}
+            if expected["meanSegmentSeconds"] is None:
+                assert actual["meanSegmentSeconds"] is None
+            else:
+                assert abs(actual["meanSegmentSeconds"] - expected["meanSegmentSeconds"]) < 1e-6
+        assert rules.worst(4) == fresh.worst(4)
+
+    def test_reset_clears_aggregates(self):
+        s = PathHistoryStore([_rule_entry("A", "bad", 0)])
+        s.reset([])
+        assert len(s.get_rule_aggregates()) == 0
+        assert s.get_rule_aggregates().worst(5) == []
+
+
+# ─────────────────────────────────────────────
+# GoalIdAllocator
+# ─────────────────────────────────────────────
+
+class TestGoalIdAllocator:
+    """Tests for the monotonic goal id allocator."""
+
+    def test_continues_after_highest_existing_id(self):
+        a = GoalIdAllocator.from_ids(["goal_3", "goal_10", "custom", None])
+        assert a.next_id() == "goal_11"
+        assert a.next_id() == "goal_12"
+
+    def test_advance_past_only_moves_forward(self):
+        a = GoalIdAllocator()
+        a.advance_past(["goal_5"])
+        assert a.next_id() == "goal_6"
+        a.advance_past(["goal_2"])
+        assert a.next_id() == "goal_7"
+
+    def test_ids_unique_across_threads(self):
+        import threading
+        a = GoalIdAllocator()
+        ids = []
+        def take():
+            for _ in range(1000):
+                ids.append(a.next_id())
+        threads = [threading.Thread(target=take) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(ids)) == 4000
+
+
+# ─────────────────────────────────────────────
+# PoseFilter
+# ─────────────────────────────────────────────
+
+def _pose(x=0.0, y=0.0, yaw=0.0):
+    import math
+    return {"position": {"x": x, "y": y, "z": 0.0},
+            "orientation": {"x": 0.0, "y": 0.0, "z": math.sin(yaw / 2), "w": math.cos(yaw / 2)}}
+
+
+class TestPoseFilter:
+    """Tests for the pose dead-band filter."""
+
+    def _make(self):
+        return PoseFilter(translation_threshold=0.1, yaw_threshold=0.1,
+                          heartbeat_interval=5.0, min_interval=0.5)
+
+    def test_first_pose_always_passes(self):
+        assert self._make().should_publish(_pose(), now=0.0) is True
+
+    def test_stationary_pose_dropped_until_heartbeat(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        assert f.should_publish(_pose(), now=1.0) is False
+        assert f.should_publish(_pose(), now=5.0) is True
+
+    def test_translation_past_threshold_passes(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        assert f.should_publish(_pose(x=0.05), now=1.0) is False
+        assert f.should_publish(_pose(x=0.2), now=1.0) is True
+
+    def test_yaw_past_threshold_passes(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        assert f.should_publish(_pose(yaw=0.5), now=1.0) is True
+
+    def test_yaw_wraps_around_pi(self):
+        import math
+        f = self._make()
+        f.should_publish(_pose(yaw=math.pi - 0.01), now=0.0)
+        assert f.should_publish(_pose(yaw=-math.pi + 0.01), now=1.0) is False
+
+    def test_rate_capped_while_moving(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        assert f.should_publish(_pose(x=1.0), now=0.1) is False
+        assert f.should_publish(_pose(x=1.0), now=0.6) is True
+
+    def test_rate_capped_moving_pose_is_held_until_due(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        assert f.should_publish(_pose(x=1.0), now=0.1) is False
+        assert f.take_hold_timer(now=0.1) == 0.4
+        assert f.take_hold_timer(now=0.1) is None
+        assert f.release_held(now=0.2) is None
+        assert abs(f.take_hold_timer(now=0.2) - 0.3) < 1e-9
+        assert f.release_held(now=0.5) == _pose(x=1.0)
+        assert f.should_publish(_pose(x=1.0), now=1.1) is False
+        assert f.toJSON()["accepted"] == 2
+
+    def test_held_pose_dropped_when_replaced(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        f.should_publish(_pose(x=1.0), now=0.1)
+        assert f.should_publish(_pose(x=1.2), now=0.6) is True
+        assert f.release_held(now=0.7) is None
+        f.should_publish(_pose(x=1.5), now=0.7)
+        f.should_publish(_pose(x=1.2), now=0.8)  # back inside the dead-band
+        assert f.take_hold_timer(now=0.8) is None
+
+    def test_reset_lets_next_pose_pass(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        f.reset()
+        assert f.should_publish(_pose(), now=0.1) is True
+
+    def test_toJSON_counts(self):
+        f = self._make()
+        f.should_publish(_pose(), now=0.0)
+        f.should_publish(_pose(), now=1.0)
+        j = f.toJSON()
+        assert j["accepted"] == 1
+        assert j["dropped"] == 1
+
+
+# ─────────────────────────────────────────────
+# LatencyStats
+# ─────────────────────────────────────────────
+
+class TestLatencyStats:
+    """Tests for the rolling latency recorder."""
+
+    def test_empty_has_no_percentiles(self):
+        stats = LatencyStats()
+        assert stats.percentile(50) is None
+        assert stats.toJSON()["p99Ms"] is None
+
+    def test_nearest_rank_percentiles(self):
+        stats = LatencyStats()
+        for i in range(1, 101):
+            stats.record(i / 1000.0)
+        assert stats.percentile(50) == 0.050
+        assert stats.percentile(99) == 0.099
+        j = stats.toJSON()
+        assert j["count"] == 100
+        assert j["maxMs"] == 100.0
+
+    def test_window_keeps_recent_samples_only(self):
+        stats = LatencyStats(window=2)
+        for v in (10.0, 0.001, 0.002):
+            stats.record(v)
+        assert stats.percentile(100) == 0.002
+        assert stats.get_count() == 3
+
+    def test_histogram_buckets(self):
+        stats = LatencyStats()
+        for v in (0.010, 0.050, 0.051, 0.2, 3.0):
+            stats.record(v)
+        assert stats.histogram([50, 100]) == [
+            {"leMs": 50, "count": 2},
+            {"leMs": 100, "count": 1},
+            {"leMs": None, "count": 2},
+        ]
+
+
+class TestMotionLatency:
+    """Tests for the command-to-motion latency tracker."""
+
+    def _make(self):
+        now = [0.0]
+        return MotionLatency(clock=lambda: now[0]), now
+
+    def test_times_first_odom_that_reflects_command(self):
+        m, now = self._make()
+        m.record_command(0.1, 0.0)
+        now[0] = 0.05
+        assert m.record_odom(0.01, 0.0) is None  # below the motion threshold
+        now[0] = 0.12
+        assert abs(m.record_odom(0.04, 0.0) - 0.12) < 1e-9
+        assert m.toJSON()["count"] == 1
+
+    def test_summary_is_safe_while_odometry_records(self):
+        import threading
+        m = MotionLatency()
+        done = threading.Event()
+
+        def odometry():
+            i = 0
+            while not done.is_set():
+                m.record_command(0.1 if i % 2 else -0.1, 0.0)
+                m.record_odom(0.1 if i % 2 else -0.1, 0.0)
+                i += 1
+
+        t = threading.Thread(target=odometry)
+        t.start()
+        try:
+            for _ in range(200):
+                j = m.toJSON()
+                assert sum(b["count"] for b in j["histogram"]) <= j["count"]
+        finally:
+            done.set()
+            t.join()
+
+    def test_ramp_steps_keep_the_first_publish(self):
+        m, now = self._make()
+        for i in range(1, 5):
+            now[0] = i * 0.05
+            m.record_command(0.1 * i, 0.0)
+        now[0] = 0.3
+        assert abs(m.record_odom(0.05, 0.0) - 0.25) < 1e-9
+
+    def test_new_direction_replaces_pending_command(self):
+        m, now = self._make()
+        m.record_command(0.1, 0.0)
+        now[0] = 0.1
+        m.record_command(0.0, 0.3)  # rotate instead
+        now[0] = 0.15
+        assert m.record_odom(0.0, 0.1) is not None
+        assert abs(m.toJSON()["maxMs"] - 50.0) < 1e-6
+
+    def test_stop_is_timed_from_motion(self):
+        m, now = self._make()
+        m.record_odom(0.5, 0.0)
+        m.record_command(0.0, 0.0)
+        now[0] = 0.08
+        assert abs(m.record_odom(0.4, 0.0) - 0.08) < 1e-9
+
+    def test_command_the_robot_already_follows_is_not_timed(self):
+        m, now = self._make()
+        m.record_odom(0.5, 0.0)
+        m.record_command(0.5, 0.0)
+        assert m.record_odom(0.5, 0.0) is None
+        assert m.toJSON()["count"] == 0
+
+    def test_unreflected_command_times_out(self):
+        m, now = self._make()
+        m.record_command(0.2, 0.0)
+        now[0] = MotionLatency.MATCH_TIMEOUT + 0.1
+        assert m.record_odom(0.2, 0.0) is None
+        j = m.toJSON()
+        assert j["timedOut"] == 1 and j["count"] == 0
+
+    def test_observers_get_each_sample(self):
+        m, now = self._make()
+        seen = []
+        m.attach(lambda source, latency: seen.append(latency))
+        m.record_command(0.0, 1.0)
+        now[0] = 0.2
+        m.record_odom(0.0, 0.5)
+        assert len(seen) == 1
+        assert sum(b["count"] for b in m.toJSON()["histogram"]) == 1
+
+
+# ─────────────────────────────────────────────
+# QuantileSketch / SegmentStats
+# ─────────────────────────────────────────────
+
+class TestQuantileSketch:
+    """Tests for the streaming quantile sketch."""
+
+    def test_empty(self):
+        assert QuantileSketch().quantile(0.5) is None
+
+    def test_single_value(self):
+        s = QuantileSketch()
+        s.add(4.0)
+        assert s.quantile(0.99) == 4.0
+
+    def test_quantiles_close_to_exact_with_bounded_memory(self):
+        import random
+        rng = random.Random(1)
+        values = [rng.expovariate(1 / 30) for _ in range(20000)]
+        s = QuantileSketch()
+        for v in values:
+            s.add(v)
+        values.sort()
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values))]
+            assert abs(s.quantile(q) - exact) / exact < 0.02
+        assert s.get_min() == values[0] and s.get_max() == values[-1]
+        assert len(s._means) <= 2 * QuantileSketch.DEFAULT_COMPRESSION
+
+
+class TestSegmentStats:
+    """Tests for per-transition travel-time statistics."""
+
+    def test_mean_and_std_dev(self):
+        stats = SegmentStats()
+        for seconds in (10.0, 20.0, 30.0):
+            stats.record("intermediate", "global", seconds)
+        row = stats.get("intermediate", "global")
+        assert row["count"] == 3
+        assert row["meanSeconds"] == 20.0
+        assert row["stdDevSeconds"] == 10.0
+        assert row["p50Seconds"] == 20.0
+        assert stats.get("global", "global") is None
+
+    def test_store_records_consecutive_goals(self):
+        s = PathHistoryStore([
+            PathLogEntry(id="g1", goal_type="intermediate", timestamp=datetime(2024, 1, 1, 10, 0)),
+            PathLogEntry(id="g2", goal_type="global", timestamp=datetime(2024, 1, 1, 10, 1)),
+            PathLogEntry(id="g3", goal_type="intermediate", timestamp=None),
+            PathLogEntry(id="g4", goal_type="global", timestamp=datetime(2024, 1, 1, 10, 5)),
+        ])
+        rows = s.get_segment_stats().toJSON()
+        assert [(r["startType"], r["endType"], r["count"]) for r in rows] == [("intermediate", "global", 1)]
+        assert rows[0]["meanSeconds"] == 60.0
+        s.reset([])
+        assert len(s.get_segment_stats()) == 0
+
+
+# ─────────────────────────────────────────────
+# Polyline / Trail
+# ─────────────────────────────────────────────
+
+class TestPolyline:
+    """Tests for the polyline simplification helpers."""
+
+    def test_point_segment_distance(self):
+        assert point_segment_distance((1, 1), (0, 0), (2, 0)) == 1.0
+        # Beyond the segment end the distance is to the end point
+        assert point_segment_distance((5, 0), (0, 0), (2, 0)) == 3.0
+        assert point_segment_distance((3, 4), (0, 0), (0, 0)) == 5.0
+
+    def test_douglas_peucker_keeps_corners(self):
+        points = [(0, 0), (1, 0.01), (2, 0), (2.01, 1), (2, 2)]
+        assert douglas_peucker(points, 0.1) == [0, 2, 4]
+        assert douglas_peucker(points, 0.001) == [0, 1, 2, 3, 4]
+        assert douglas_peucker(points[:2], 1.0) == [0, 1]
+
+    def test_sleeve_simplify_depends_only_on_prefix(self):
+        points = [(i * 0.1, 0.0) for i in range(20)] + [(1.9, i * 0.1) for i in range(1, 10)]
+        assert sleeve_simplify(points, 0.05) == [0, 19, 28]
+        # Changing the end does not move the earlier vertices
+        assert sleeve_simplify(points[:25] + [(5.0, 5.0)], 0.05)[:2] == [0, 19]
+
+    def test_sleeve_simplify_within_tolerance(self):
+        import math
+        import random
+        rng = random.Random(3)
+        x = y = heading = 0.0
+        points = []
+        for _ in range(2000):
+            heading += rng.gauss(0, 0.08)
+            x += 0.025 * math.cos(heading)
+            y += 0.025 * math.sin(heading)
+            points.append((x, y))
+        kept = sleeve_simplify(points, 0.05)
+        assert len(kept) < len(points) / 10
+        for a, b in zip(kept, kept[1:]):
+            assert all(point_segment_distance(points[j], points[a], points[b]) <= 0.05 for j in range(a + 1, b))
+
+    def test_splice_diff(self):
+        old = [(0, 0), (1, 0), (2, 0), (3, 0)]
+        new = [(0.5, 0), (2, 0), (3, 0)]
+        assert splice_diff(old, new) == (0, 2, [(0.5, 0)])
+        assert splice_diff(old, old) == (4, 0, [])
+        assert splice_diff([], new) == (0, 0, new)
+        start, delete_count, inserted = splice_diff(old, new)
+        assert old[:start] + inserted + old[start + delete_count:] == new
+
+
+class TestTrail:
+    """Tests for the online-simplified driven trail."""
+
+    def test_straight_drive_keeps_only_corners(self):
+        trail = Trail(tolerance=0.05, clock=lambda: 0.0)
+        added = []
+        for i in range(101):
+            added += trail.add(i * 0.1, 0.0)
+        for i in range(1, 51):
+            added += trail.add(10.0, i * 0.1)
+        # Start and corner are vertices; the last leg stays open until the next turn
+        assert [(v["x"], v["y"]) for v in added] == [(0.0, 0.0), (10.0, 0.0)]
+        assert [v["id"] for v in added] == [1, 2]
+
+    def test_dropped_poses_within_tolerance(self):
+        import math
+        trail = Trail(tolerance=0.05, clock=lambda: 0.0)
+        poses = [(math.cos(a / 50), math.sin(a / 50)) for a in range(300)]
+        for x, y in poses:
+            trail.add(x, y)
+        vertices = [(v["x"], v["y"]) for v in trail.get_vertices()]
+        assert 2 < len(vertices) < 60
+        last = vertices[-1]
+        for p in poses[:poses.index(last) + 1]:
+            assert min(point_segment_distance(p, a, b) for a, b in zip(vertices, vertices[1:])) <= 0.05 + 1e-9
+
+    def test_capacity_and_coarser_view(self):
+        trail = Trail(tolerance=0.01, capacity=5, clock=lambda: 0.0)
+        for i in range(20):
+            trail.add(float(i), float(i % 2))  # zig-zag: every pose is a corner
+        assert len(trail) == 5
+        assert trail.get_first_id() == 15
+        assert len(trail.get_vertices(tolerance=2.0)) == 2
+
+    def test_parked_robot_adds_nothing(self):
+        trail = Trail(clock=lambda: 0.0)
+        trail.add(1.0, 1.0)
+        assert all(trail.add(1.0, 1.0) == [] for _ in range(Trail.MAX_PENDING * 2))
+        assert trail._pending == []
+
+
+class TestPlannedPath:
+    """Tests for plan deltas and per-client rate limiting."""
+
+    class _Obs(Observer):
+        def __init__(self, channels=None):
+            self.channels = set(channels or Channel)
+            self.received = []
+        def is_subscribed(self, channel):
+            return channel in self.channels
+        async def update(self, source, data):
+            self.received.append(data)
+
+    def _apply(self, points, msg):
+        if msg["op"] == "reset":
+            return msg["points"]
+        return points[:msg["start"]] + msg["points"] + points[msg["start"] + msg["deleteCount"]:]
+
+    def test_simplify_rounds_and_keeps_goal_side(self):
+        plan = PlannedPath()
+        poses = [(i * 0.01 + 0.001, 0.0) for i in range(500)] + [(4.991, i * 0.01) for i in range(1, 300)]
+        points = plan.simplify(poses)
+        assert points[0] == (0.0, 0.0) and points[-1] == (4.99, 2.99)
+        assert len(points) == 3
+        # The robot moved: only the first point changes
+        assert plan.simplify(poses[100:])[1:] == points[1:]
+
+    def test_deltas_rebuild_the_plan(self):
+        now = [0.0]
+        plan = PlannedPath(min_interval=0.0, clock=lambda: now[0])
+        obs = self._Obs()
+        plan.attach(obs)
+
+        async def go():
+            await plan.send_snapshot(obs)
+            for points in ([(0, 0), (1, 0), (2, 2)], [(0.5, 0), (1, 0), (2, 2)], [(0.5, 0), (3, 3)]):
+                await plan.set_plan(points)
+        run(go())
+
+        points = []
+        for msg in obs.received:
+            points = self._apply(points, msg)
+        assert [tuple(p) for p in points] == [(0.5, 0), (3, 3)]
+        assert obs.received[2]["deleteCount"] == 1 and obs.received[2]["points"] == [[0.5, 0]]
+        assert obs.received[-1]["version"] == plan.get_version() == 3
+
+    def test_rate_limited_client_gets_only_latest_plan(self):
+        plan = PlannedPath(min_interval=0.05)
+        fast, slow = self._Obs(), self._Obs()
+        plan.attach(slow)
+
+        async def go():
+            await plan.set_plan([(0, 0), (1, 1)])
+            await plan.set_plan([(0, 0), (2, 2)])
+            await plan.set_plan([(0, 0), (3, 3)])
+            await asyncio.sleep(0.1)
+        run(go())
+
+        # The first plan goes out at once, the next two are merged into one delayed delta
+        assert len(slow.received) == 2
+        assert slow.received[1]["baseVersion"] == 1 and slow.received[1]["version"] == 3
+        assert slow.received[1]["points"] == [[3, 3]]
+        assert fast.received == []
+
+    def test_unsubscribed_and_detached_clients(self):
+        plan = PlannedPath(min_interval=10.0)
+        status_only = self._Obs({Channel.STATUS})
+        obs = self._Obs()
+        plan.attach(status_only)
+        plan.attach(obs)
+
+        async def go():
+            await plan.set_plan([(0, 0), (1, 1)])
+            await plan.set_plan([(0, 0), (2, 2)])
+            plan.detach(obs)
+        run(go())
+
+        assert status_only.received == []
+        assert len(obs.received) == 1
+        assert plan._clients == {}
+
+
 # ─────────────────────────────────────────────
 # Teleoperate
 # ─────────────────────────────────────────────
@@ -276,39 +1004,48 @@ class TestFeedbackLogEntry:
 class TestTeleoperate:
     """Tests for the Teleoperate model."""
 
-    def test_initial_empty_queue(self):
-        ""
+    def test_initial_setpoint_is_zero(self):
         t = Teleoperate()
         assert t.get_command() is None
+        assert t.get_setpoint() == (0.0, 0.0)
 
-    def test_add_command_queues_it(self):
-        
+    def test_add_command_sets_setpoint(self):
         t = Teleoperate()
-        t.add_command("FORWARD")
+        assert t.add_command("FORWARD") is True
         assert t.get_command() == "FORWARD"
+        assert t.get_setpoint() == (DirectionCommand.LINEAR_SPEED.value, 0.0)
 
-    def test_commands_are_fifo(self):
-        
+    def test_latest_command_wins(self):
         t = Teleoperate()
         t.add_command("FORWARD")
-        t.add_command("LEFT")
-        assert t.get_command() == "FORWARD"
-        assert t.get_command() == "LEFT"
+        t.add_command("ROTATE_RIGHT")
+        assert t.get_command() == "ROTATE_RIGHT"
+        assert t.get_setpoint() == (0.0, DirectionCommand.ANGULAR_SPEED.value)
 
-    def test_stop_clears_queue(self):
-        
+    def test_stop_zeroes_setpoint(self):
         t = Teleoperate()
         t.add_command("FORWARD")
-        t.add_command("LEFT")
         t.add_command("STOP")
-        # Only STOP should remain after the clear
         assert t.get_command() == "STOP"
-        assert t.get_command() is None
+        assert t.get_setpoint() == (0.0, 0.0)
 
-    def test_get_command_returns_none_when_empty(self):
+    def test_unknown_command_ignored(self):
         t = Teleoperate()
-        assert t.get_command() is None
-        assert t.get_command() is None  # still None on repeat
+        t.add_command("LEFT")
+        assert t.add_command("NOT_REAL") is False
+        assert t.add_command("LINEAR_SPEED") is False
+        assert t.get_command() == "LEFT"
+
+    def test_setpoint_expires_without_refresh(self):
+        now = [0.0]
+        t = Teleoperate(deadman_timeout=0.5, clock=lambda: now[0])
+        t.set_setpoint(0.2, 0.1)
+        now[0] = 0.4
+        assert t.get_setpoint() == (0.2, 0.1)
+        now[0] = 0.6
+        assert t.is_expired() and t.get_setpoint() == (0.0, 0.0)
+        t.set_setpoint(0.2, 0.1)  # a refresh re-arms the deadman
+        assert t.get_setpoint() == (0.2, 0.1)
 
     def test_attach_and_notify(self):
         
@@ -333,6 +1070,7 @@ class TestTeleoperate:
         t = Teleoperate()
         t.fromJSON({"command": "BACKWARD"})
         assert t.get_command() == "BACKWARD"
+        assert t.get_setpoint()[0] < 0
 
     def test_fromJSON_ignores_missing_command(self):
         
@@ -386,7 +1124,7 @@ class TestPath:
 
         p.attach(MockObserver())
         run(p.set_is_path_module_active(True))
-        assert any(d.get("type") == "PATH_UPDATE" for d in received)
+        assert any(d.get("type") == "PATH_FLAGS" for d in received)
 
     def test_set_is_path_module_active_no_notify_if_same(self):
         p = Path(is_path_module_active=True)
@@ -411,7 +1149,7 @@ class TestPath:
 
         p.attach(MockObserver())
         run(p.set_is_docked(True))
-        assert any(d.get("type") == "PATH_UPDATE" for d in received)
+        assert any(d.get("type") == "PATH_FLAGS" for d in received)
 
     def test_set_is_docked_no_notify_if_same(self):
 
@@ -465,6 +1203,15 @@ class TestRobotState:
         assert state.get_is_comms_connected() is None
         assert state.get_is_raspberry_pi_connected() is None
 
+    def test_every_status_sample_is_recorded_in_telemetry(self):
+        telemetry = MagicMock()
+        state = RobotState(path_model=Path(), telemetry=telemetry)
+        run(state.set_battery_percentage(150.0))
+        run(state.set_battery_percentage(150.0))
+        run(state.set_is_wifi_connected(True))
+        calls = [c.args for c in telemetry.record.call_args_list]
+        assert calls == [("battery", 100.0), ("battery", 100.0), ("wifiConnected", True)]
+
     def test_set_is_on_notifies(self):
         state = self._make_state()
         received = []
@@ -524,9 +1271,16 @@ class TestRobotState:
         state = self._make_state()
         j = state.toJSON()
         for key in ["isOn", "batteryPercentage", "isWifiConnected",
-                    "isCommsConnected", "isRaspberryPiConnected", "mode", "isDocked"]:
+                    "isCommsConnected", "isRaspberryPiConnected", "mode", "isDocked",
+                    "motionLatency"]:
             assert key in j
 
+    def test_toJSON_includes_motion_latency_summary(self):
+        motion = MotionLatency()
+        state = RobotState(path_model=Path(), motion_latency=motion)
+        assert state.toJSON()["motionLatency"]["count"] == 0
+        assert state.get_motion_latency() is motion
+
     def test_toJSON_mode_teleoperating_when_path_inactive(self):
         state = self._make_state()
         j = state.toJSON()
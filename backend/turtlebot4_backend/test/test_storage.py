@@ -0,0 +1,363 @@
+"""
+Unit tests for turtlebot4_backend storage classes.
+
+These tests write to pytest's tmp_path only — no ROS, no network.
+Run with:
+
+    pytest test_storage.py -v
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from turtlebot4_backend.turtlebot4_model.Path import Path
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+from turtlebot4_backend.turtlebot4_storage.PathJournal import PathJournal
+from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import (
+    RetentionPolicy, _iter_json_array, iter_path_history, latest_snapshot, list_snapshots,
+    load_latest_path_history, save_path_history)
+from turtlebot4_backend.turtlebot4_storage import PathSnapshotFormat
+from turtlebot4_backend.turtlebot4_utils.ThreadedIterator import iterate_in_thread
+
+
+# ─────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _entry(id="goal_1", feedback=""):
+    return PathLogEntry(label="Goal Entry", id=id, goal_type="global",
+                        timestamp=datetime(2024, 1, 1), fuzzy_output="rule", user_feedback=feedback)
+
+
+# ─────────────────────────────────────────────
+# PathJournal
+# ─────────────────────────────────────────────
+
+class TestPathJournal:
+    """Tests for the append-only path journal."""
+
+    @pytest.fixture
+    def journal_path(self, tmp_path):
+        return tmp_path / "journal.jsonl"
+
+    def test_replay_applies_appends_and_patches(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0)
+        j.record({"op": "append", "entry": {"id": "g1"}})
+        j.record({"op": "append", "entry": {"id": "g2"}})
+        j.record({"op": "patch", "index": 0, "entry": {"id": "g1", "userFeedback": "good"}})
+        j.close()
+        assert PathJournal(journal_path).replay() == [
+            {"id": "g1", "userFeedback": "good"}, {"id": "g2"}]
+
+    def test_flush_makes_records_durable(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=10)
+        j.record({"op": "append", "entry": {"id": "g1"}})
+        assert j.flush(timeout=5)
+        assert len(journal_path.read_text().splitlines()) == 1
+        j.close()
+
+    def test_records_are_group_committed(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0.5)
+        with patch.object(j, "_write_batch", wraps=j._write_batch) as write_batch:
+            for i in range(50):
+                j.record({"op": "append", "entry": {"id": f"g{i}"}})
+            j.close()
+        assert write_batch.call_count == 1
+        assert len(write_batch.call_args[0][0]) == 50
+        assert len(j.replay()) == 50
+
+    def test_failed_write_is_retried(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0, retry_interval=0.01)
+        real_write = j._write_batch
+        calls = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise OSError("disk full")
+            real_write(batch)
+
+        with patch.object(j, "_write_batch", side_effect=flaky):
+            j.record({"op": "append", "entry": {"id": "g1"}})
+            assert not j.flush(timeout=5)
+            assert j.flush(timeout=5)
+            j.close()
+        assert len(calls) == 2
+        assert j.replay() == [{"id": "g1"}]
+
+    def test_persistent_write_failure_is_reported(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0, retry_interval=0.01)
+        with patch.object(j, "_write_batch", side_effect=OSError("disk full")):
+            j.record({"op": "append", "entry": {"id": "g1"}})
+            assert not j.flush(timeout=5)
+            assert j._written == 0
+            with pytest.raises(OSError):
+                j.close()
+        assert j.replay() == []
+
+    def test_compaction_record_survives_retry(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0, retry_interval=0.01)
+        real_write = j._write_batch
+        calls = []
+
+        def flaky(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                real_write(batch)
+                raise OSError("disk full")
+            real_write(batch)
+
+        with patch.object(j, "_write_batch", side_effect=flaky):
+            j.compact([{"id": "g0"}])
+            j.close()
+        lines = journal_path.read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0]) == {"op": "reset", "entries": [{"id": "g0"}]}
+
+    def test_truncated_last_line_is_ignored(self, journal_path):
+        journal_path.write_text('{"op":"append","entry":{"id":"g1"}}\n{"op":"app')
+        assert PathJournal(journal_path).replay() == [{"id": "g1"}]
+
+    def test_compaction_rewrites_as_single_snapshot(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0, compact_every=3)
+        for i in range(3):
+            j.record({"op": "append", "entry": {"id": f"g{i}"}})
+        assert j.needs_compaction()
+        j.compact([{"id": "g0"}, {"id": "g1"}, {"id": "g2"}])
+        j.record({"op": "append", "entry": {"id": "g3"}})
+        j.close()
+        lines = journal_path.read_text().splitlines()
+        assert json.loads(lines[0])["op"] == "reset"
+        assert len(lines) == 2
+        assert [e["id"] for e in j.replay()] == ["g0", "g1", "g2", "g3"]
+
+    def test_path_model_writes_journal(self, journal_path):
+        j = PathJournal(journal_path, commit_interval=0)
+        p = Path(journal=j)
+        run(p.add_log_entry(_entry("g1")))
+        run(p.apply_feedback({"goalId": "g1", "feedback": "bad"}))
+        j.close()
+        restored = [PathLogEntry.fromJSON(e) for e in j.replay()]
+        assert restored[0].get_id() == "g1"
+        assert restored[0].get_user_feedback() == "bad"
+        assert restored[0].get_timestamp() == datetime(2024, 1, 1)
+
+
+# ─────────────────────────────────────────────
+# PathHistoryRepository — manifest and retention
+# ─────────────────────────────────────────────
+
+def _record(name, saved_at):
+    return {"filename": name, "savedAt": saved_at, "size": 1, "entries": 0, "format": "json"}
+
+
+class TestRetentionPolicy:
+    """Tests for snapshot retention rules."""
+
+    def test_keep_last(self):
+        snaps = [_record(f"s{i}", f"2024-01-01T10:0{i}:00+00:00") for i in range(5)]
+        kept = RetentionPolicy(keep_last=2, keep_daily=None, keep_weekly=None).select(snaps)
+        assert [s["filename"] for s in kept] == ["s3", "s4"]
+
+    def test_keep_daily_keeps_newest_of_each_day(self):
+        snaps = [_record("a", "2024-01-01T08:00:00+00:00"), _record("b", "2024-01-01T20:00:00+00:00"),
+                 _record("c", "2024-01-02T08:00:00+00:00"), _record("d", "2024-01-03T08:00:00+00:00")]
+        kept = RetentionPolicy(keep_last=None, keep_daily=2, keep_weekly=None).select(snaps)
+        assert [s["filename"] for s in kept] == ["c", "d"]
+
+    def test_keep_weekly(self):
+        snaps = [_record("w1", "2024-01-02T08:00:00+00:00"), _record("w1b", "2024-01-03T08:00:00+00:00"),
+                 _record("w2", "2024-01-10T08:00:00+00:00")]
+        kept = RetentionPolicy(keep_last=None, keep_daily=None, keep_weekly=5).select(snaps)
+        assert [s["filename"] for s in kept] == ["w1b", "w2"]
+
+    def test_all_rules_disabled_keeps_everything(self):
+        snaps = [_record("a", "2024-01-01T08:00:00+00:00")]
+        assert RetentionPolicy(None, None, None).select(snaps) == snaps
+
+
+class TestSnapshotManifest:
+    """Tests for saving and loading snapshots through the manifest."""
+
+    def _model(self, n):
+        model = MagicMock()
+        model.get_path_history.return_value = [_entry(f"g{i}") for i in range(n)]
+        return model
+
+    def test_save_records_size_and_count(self, tmp_path):
+        file_path = save_path_history(self._model(3), snapshot_dir=tmp_path)
+        record = list_snapshots(tmp_path)[-1]
+        assert record["filename"] == file_path.name
+        assert record["entries"] == 3
+        assert record["size"] == file_path.stat().st_size
+
+    def test_load_latest_uses_manifest(self, tmp_path):
+        save_path_history(self._model(2), snapshot_dir=tmp_path)
+        latest = load_latest_path_history(tmp_path)
+        assert [e["id"] for e in latest["pathHistory"]] == ["g0", "g1"]
+
+    def test_manifest_rebuilt_for_existing_snapshots(self, tmp_path):
+        (tmp_path / "path_history_2024-01-01T00-00-00Z.json").write_text(
+            json.dumps({"savedAt": "2024-01-01T00:00:00+00:00", "pathHistory": [{"id": "old"}]}))
+        assert load_latest_path_history(tmp_path)["pathHistory"] == [{"id": "old"}]
+        assert (tmp_path / "manifest.json").exists()
+
+    def test_retention_deletes_files(self, tmp_path):
+        old = tmp_path / "path_history_2024-01-01T00-00-00Z.json"
+        old.write_text(json.dumps({"savedAt": "2024-01-01T00:00:00+00:00", "pathHistory": []}))
+        save_path_history(self._model(1), retention=RetentionPolicy(1, None, None), snapshot_dir=tmp_path)
+        assert not old.exists()
+        assert len(list_snapshots(tmp_path)) == 1
+
+    def test_empty_directory(self, tmp_path):
+        assert load_latest_path_history(tmp_path) == {"pathHistory": [], "savedAt": None}
+
+
+class TestColumnarSnapshot:
+    """Tests for the compressed columnar snapshot format."""
+
+    def test_round_trip_matches_json_entries(self):
+        from datetime import timedelta, timezone
+        entries = [
+            _entry("g1", "good"),
+            PathLogEntry(label="Goal Entry", id="g2", goal_type="intermediate",
+                         timestamp=datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=2))),
+                         fuzzy_output="rule", user_feedback=""),
+            PathLogEntry(label="Other", id="g3", goal_type="global", timestamp=None),
+        ]
+        data = PathSnapshotFormat.encode_snapshot(entries, "2024-05-01T00:00:00+00:00")
+        assert PathSnapshotFormat.is_compressed(data)
+        decoded = PathSnapshotFormat.decode_snapshot(data)
+        assert decoded["savedAt"] == "2024-05-01T00:00:00+00:00"
+        assert decoded["pathHistory"] == [e.toJSON() for e in entries]
+
+    def test_unknown_format_rejected(self):
+        import gzip
+        with pytest.raises(ValueError):
+            PathSnapshotFormat.decode_snapshot(gzip.compress(b'{"format": "other"}'))
+
+    def test_load_latest_detects_format(self, tmp_path):
+        model = MagicMock()
+        model.get_path_history.return_value = [_entry("g0"), _entry("g1", "bad")]
+        save_path_history(model, snapshot_dir=tmp_path, format="json")
+        json_latest = load_latest_path_history(tmp_path)
+        columnar_path = save_path_history(model, snapshot_dir=tmp_path, format="columnar")
+        latest = load_latest_path_history(tmp_path)
+        assert latest["filename"] == columnar_path.name
+        assert latest["pathHistory"] == json_latest["pathHistory"]
+        assert [s["format"] for s in list_snapshots(tmp_path)] == ["json", "columnar"]
+
+
+# ─────────────────────────────────────────────
+# Streaming snapshot load
+# ─────────────────────────────────────────────
+
+async def _collect(aiter):
+    return [item async for item in aiter]
+
+
+class TestStreamingLoad:
+    """Tests for chunked, off-loop loading of snapshots."""
+
+    def test_parser_handles_items_split_across_blocks(self):
+        import io
+        items = [{"id": f"g{i}", "label": "x" * i, "nested": {"a": [i, "]"]}} for i in range(20)]
+        text = json.dumps({"savedAt": "t", "pathHistory": items}, indent=2)
+        assert list(_iter_json_array(io.StringIO(text), "pathHistory", block_size=7)) == items
+
+    def test_parser_empty_and_missing_array(self):
+        import io
+        assert list(_iter_json_array(io.StringIO('{"pathHistory": []}'), "pathHistory")) == []
+        assert list(_iter_json_array(io.StringIO('{"savedAt": null}'), "pathHistory")) == []
+
+    def test_iter_path_history_chunks(self, tmp_path):
+        model = MagicMock()
+        model.get_path_history.return_value = [_entry(f"g{i}") for i in range(5)]
+        save_path_history(model, snapshot_dir=tmp_path)
+        latest = latest_snapshot(tmp_path)
+        chunks = list(iter_path_history(tmp_path / latest["filename"], chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert chunks[2][0]["id"] == "g4"
+
+    def test_iterate_in_thread_yields_in_order(self):
+        assert run(_collect(iterate_in_thread(iter(range(10))))) == list(range(10))
+
+    def test_iterate_in_thread_reraises_worker_error(self):
+        def failing():
+            yield 1
+            raise ValueError("bad snapshot")
+
+        with pytest.raises(ValueError):
+            run(_collect(iterate_in_thread(failing())))
+
+    def test_load_path_history_streams_chunks_then_swaps(self):
+        observer = MagicMock()
+        observer.update = AsyncMock()
+        p = Path(path_history=[_entry("old")])
+        p.attach(observer)
+
+        async def chunks():
+            yield [_entry("g1"), _entry("g2", "good")]
+            yield [_entry("g3")]
+
+        assert run(p.load_path_history(chunks(), total=3, source="snap.json"))
+        types = [c.args[1]["type"] for c in observer.update.call_args_list]
+        assert types[:4] == ["PATH_LOAD_BEGIN", "PATH_LOAD_CHUNK", "PATH_LOAD_CHUNK", "PATH_LOAD_END"]
+        chunk = observer.update.call_args_list[2].args[1]
+        assert chunk["loaded"] == 3 and chunk["entries"][0]["id"] == "g3"
+        assert observer.update.call_args_list[3].args[1]["version"] == p.get_version()
+        assert [e.get_id() for e in p.get_path_history()] == ["g1", "g2", "g3"]
+        assert p.get_path_store().get_feedback_counts()["good"] == 1
+
+    def test_load_path_history_keeps_entries_appended_during_load(self, tmp_path):
+        observer = MagicMock()
+        observer.update = AsyncMock()
+        observer.is_subscribed.return_value = True
+        journal = PathJournal(tmp_path / "journal.jsonl")
+        p = Path(path_history=[_entry("old")], journal=journal)
+        p.attach(observer)
+
+        async def chunks():
+            yield [_entry("g1")]
+            await p.add_log_entry(_entry("live"))  # a goal arrives mid-load
+            yield [_entry("g2")]
+
+        assert run(p.load_path_history(chunks(), total=2))
+        assert [e.get_id() for e in p.get_path_history()] == ["g1", "g2", "live"]
+        messages = [c.args[1] for c in observer.update.call_args_list]
+        last_chunk = [m for m in messages if m["type"] == "PATH_LOAD_CHUNK"][-1]
+        assert last_chunk["entries"][0]["id"] == "live" and last_chunk["loaded"] == 3
+        journal.close()
+        assert [e["id"] for e in PathJournal(tmp_path / "journal.jsonl").replay()] == ["g1", "g2", "live"]
+
+    def test_load_path_history_failure_keeps_live_history(self):
+        observer = MagicMock()
+        observer.update = AsyncMock()
+        observer.is_subscribed.return_value = True
+        p = Path(path_history=[_entry("old")])
+        p.attach(observer)
+
+        async def chunks():
+            yield [_entry("g1")]
+            raise ValueError("corrupt snapshot")
+
+        with pytest.raises(ValueError):
+            run(p.load_path_history(chunks(), total=2))
+        last = observer.update.call_args_list[-1].args[1]
+        assert last["type"] == "PATH_UPDATE"
+        assert [e["id"] for e in last["pathHistory"]] == ["old"]
+        assert [e.get_id() for e in p.get_path_history()] == ["old"]
+
+        # The failed load does not block the next one
+        async def good():
+            yield [_entry("g2")]
+
+        assert run(p.load_path_history(good()))
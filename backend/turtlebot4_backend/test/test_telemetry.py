@@ -0,0 +1,140 @@
+"""
+Unit tests for the telemetry time series.
+
+These tests need the real numpy package and are skipped when it is not
+installed. conftest.py imports the telemetry modules before other test
+modules mock numpy, and the tests use the numpy those modules hold.
+Run with:
+
+    pytest test_telemetry.py -v
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from turtlebot4_backend.turtlebot4_model.Telemetry import Telemetry
+from turtlebot4_backend.turtlebot4_utils import TimeSeries as time_series
+from turtlebot4_backend.turtlebot4_utils.TimeSeries import RingBuffer, TimeSeries, lttb
+
+np = time_series.np
+if isinstance(np, MagicMock):
+    pytest.skip("numpy was mocked before the telemetry modules were imported", allow_module_level=True)
+
+
+# ─────────────────────────────────────────────
+# RingBuffer
+# ─────────────────────────────────────────────
+
+class TestRingBuffer:
+    """Tests for the fixed-capacity numpy ring buffer."""
+
+    def test_overwrites_oldest_and_stays_ordered(self):
+        b = RingBuffer(3)
+        for i in range(5):
+            b.append(float(i), float(i * 10))
+        t, v = b.range(0, 10)
+        assert t.tolist() == [2.0, 3.0, 4.0]
+        assert v.tolist() == [20.0, 30.0, 40.0]
+        assert b.oldest() == 2.0 and b.is_full()
+
+    def test_range_is_inclusive(self):
+        b = RingBuffer(10)
+        for i in range(5):
+            b.append(float(i), 0.0)
+        t, _ = b.range(1, 3)
+        assert t.tolist() == [1.0, 2.0, 3.0]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+# ─────────────────────────────────────────────
+# LTTB
+# ─────────────────────────────────────────────
+
+class TestLttb:
+    """Tests for Largest-Triangle-Three-Buckets downsampling."""
+
+    def test_short_series_unchanged(self):
+        t = np.arange(5, dtype=float)
+        out_t, _ = lttb(t, t, 10)
+        assert out_t.tolist() == t.tolist()
+
+    def test_keeps_endpoints_and_peak(self):
+        t = np.arange(1000, dtype=float)
+        v = np.zeros(1000)
+        v[437] = 100.0
+        out_t, out_v = lttb(t, v, 20)
+        assert len(out_t) == 20
+        assert out_t[0] == 0 and out_t[-1] == 999
+        assert 100.0 in out_v.tolist()
+        assert np.all(np.diff(out_t) > 0)
+
+    def test_tiny_threshold(self):
+        t = np.arange(10, dtype=float)
+        assert lttb(t, t, 2)[0].tolist() == [0.0, 9.0]
+
+
+# ─────────────────────────────────────────────
+# TimeSeries / Telemetry
+# ─────────────────────────────────────────────
+
+class TestTimeSeries:
+    """Tests for the multi-resolution time series."""
+
+    def test_rollups_average_per_bucket(self):
+        s = TimeSeries(levels=((1.0, 10), (60.0, 10)))
+        for i in range(4):
+            s.record(100.0 + i * 0.25, float(i))
+        s.record(101.0, 10.0)
+        width, t, v = s.query(0, 200, 100)
+        assert width == 1.0
+        assert t.tolist() == [100.5, 101.5]
+        assert v.tolist() == [1.5, 10.0]
+
+    def test_long_range_uses_coarser_level(self):
+        s = TimeSeries(levels=((1.0, 60), (60.0, 60)))
+        for i in range(0, 3600, 5):
+            s.record(float(i), float(i))
+        # The 1 s level only holds the last minute; an hour needs the 1 min level
+        width, t, _ = s.query(0, 3600, 1000)
+        assert width == 60.0
+        assert len(t) == 60
+        width, _, _ = s.query(3590, 3600, 1000)
+        assert width == 1.0
+
+    def test_out_of_order_samples_ignored(self):
+        s = TimeSeries(levels=((1.0, 10),))
+        s.record(10.0, 1.0)
+        s.record(5.0, 99.0)
+        _, _, v = s.query(0, 20, 10)
+        assert v.tolist() == [1.0]
+
+
+class TestTelemetry:
+    """Tests for the telemetry metric registry."""
+
+    def test_day_query_returns_requested_points(self):
+        now = [0.0]
+        telemetry = Telemetry(clock=lambda: now[0])
+        for i in range(0, 24 * 3600, 10):
+            telemetry.record("battery", 100 - i / 1000, t=float(i))
+        now[0] = 24 * 3600.0
+        result = telemetry.query("battery", points=300)
+        assert result["resolutionSeconds"] == 60.0
+        assert len(result["points"]) == 300
+
+    def test_booleans_and_unknown_values(self):
+        telemetry = Telemetry(clock=lambda: 5.0)
+        telemetry.record("wifiConnected", True)
+        telemetry.record("wifiConnected", None)
+        telemetry.record("notAMetric", 1.0)
+        assert telemetry.query("wifiConnected", start=0, end=10)["points"] == [[5.5, 1.0]]
+
+    def test_unknown_metric_raises(self):
+        with pytest.raises(KeyError):
+            Telemetry().query("altitude")
@@ -59,35 +59,6 @@ class MapController:
         print("[MapController] Subscribed to /odom")
 
 
-    def _send_initial_map_png(self):
-        """
-        Send MAP_DATA once if a cached PNG is already available.
-
-        This avoids waiting for /map messages during startup so the frontend can
-        render a map as soon as possible when prior data exists.
-
-        Params:
-            None.
-
-        Return:
-            None.
-        """
-        if self._map_model._mapDataPNG:
-            print("[MapController] Sending initial MAP_DATA on startup")
-
-            async def send_initial():
-                await self._map_model.notify_observers({
-                    "type": "MAP_DATA",
-                    "mapData": {
-                        "resolution": self._map_model._mapData.get_resolution(),
-                        "width": self._map_model._mapData.get_width(),
-                        "height": self._map_model._mapData.get_height(),
-                        "occupancyGridPNG": self._map_model._mapDataPNG
-                    }
-                })
-
-            self._loop.call_soon_threadsafe(lambda: asyncio.create_task(send_initial()))
-
     def _map_callback(self, message: Dict[str, Any]) -> None:
         """
         Handle the static /map message and publish MAP_DATA once.
@@ -171,8 +142,9 @@ class MapController:
         """
         Handle /odom updates and publish the robot pose.
 
-        The robot pose changes continuously, so each update is pushed to the UI
-        to keep navigation and visualization accurate.
+        The robot pose changes continuously, so each update that leaves the
+        map model's dead-band is pushed to the UI; poses of a parked robot are
+        dropped here so an idle robot costs almost nothing.
 
         Params:
             message: Rosbridge JSON payload for nav_msgs/msg/Odometry.
@@ -201,6 +173,17 @@ class MapController:
             }
         }
 
+        # Drop poses inside the dead-band before touching the event loop.
+        pose_filter = self._map_model.get_poseFilter()
+        if not pose_filter.should_publish(robot_pose):
+            # A moving pose held by the rate cap is published later if nothing replaces it
+            delay = pose_filter.take_hold_timer()
+            if delay is not None:
+                self._loop.call_soon_threadsafe(
+                    self._loop.call_later, delay, self._map_model.release_held_robotPose
+                )
+            return
+
         self._loop.call_soon_threadsafe(
             lambda: asyncio.create_task(self._map_model.set_robotPose(robot_pose))
         )
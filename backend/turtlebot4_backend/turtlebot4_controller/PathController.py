@@ -1,21 +1,37 @@
 import asyncio
 import json
+import threading
 import uuid
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict
-from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import RosbridgeConnection
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import EncodedMessage, RosbridgeConnection
 from turtlebot4_backend.turtlebot4_model.Map import Map
 from turtlebot4_backend.turtlebot4_model.Path import Path  
 from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
 from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
+from turtlebot4_backend.turtlebot4_utils.GoalIdAllocator import GoalIdAllocator
+
+# Parsed rule output waiting to be applied: (goal_type, position, rule, received_at).
+RuleItem = Tuple[str, Dict[str, Any], str, datetime]
 
 class PathController:
     """
     Subscribes to path-related topics via RosbridgeConnection.
     Bridges ROS messages to async model updates for the UI.
+
+    Rule outputs go through an ordered ingestion queue: the ROS thread
+    parses and enqueues them, and a single drain task on the event loop
+    applies them in batches, so a burst of rules produces one notification
+    per channel instead of one per rule.
     """
 
+    # Most rule messages applied in one batch.
+    RULE_BATCH_SIZE = 256
+    # Zero velocity for cancelNavigation, serialized once.
+    STOP_MESSAGE = EncodedMessage(DirectionCommand.STOP.value)
+
     def __init__(
         self,
         path_model: Path,
@@ -46,6 +62,12 @@ class PathController:
         self._connected = False  # Tracks rosbridge connection state.
         self._subscribed_topics = []  # Track subscriptions for clean shutdowns.
 
+        # Rule ingestion queue, filled by the ROS thread and drained on the loop.
+        self._rule_queue: Deque[RuleItem] = deque()
+        self._rule_lock = threading.Lock()
+        self._rule_drain_scheduled = False  # True while a drain task is pending or running.
+        self._goal_ids = GoalIdAllocator.from_ids(e.get_id() for e in path_model.get_path_history())
+
         # Rosbridge websocket connection for topic IO.
         self._ros = RosbridgeConnection(rosbridge_host, rosbridge_port)
         self._ros.connect()
@@ -127,6 +149,17 @@ class PathController:
             }
         }
 
+        # Drop poses inside the dead-band before touching the event loop.
+        pose_filter = self._map_model.get_poseFilter()
+        if not pose_filter.should_publish(robot_pose):
+            # A moving pose held by the rate cap is published later if nothing replaces it
+            delay = pose_filter.take_hold_timer()
+            if delay is not None:
+                self._loop.call_soon_threadsafe(
+                    self._loop.call_later, delay, self._map_model.release_held_robotPose
+                )
+            return
+
         # Schedule async update on MapModel.
         self._loop.call_soon_threadsafe(
             lambda: asyncio.create_task(self._map_model.set_robotPose(robot_pose))
@@ -136,10 +169,10 @@ class PathController:
 
     def _rule_callback(self, msg: Dict) -> None:
         """
-        Process rule output messages and update goals and logs.
+        Parse a rule output message and queue it for the event loop.
 
-        Rule outputs provide planning intent, so we translate them into
-        intermediate goals, global goals, and a log entry for review.
+        Runs on the ROS thread. The message is applied later, in order, by
+        _drain_rule_queue together with any other rules that arrive meanwhile.
 
         Params:
             msg: Rosbridge JSON payload for std_msgs/msg/String.
@@ -169,30 +202,64 @@ class PathController:
             return
 
 
-        goal_type = data.get("goal_type", "")
-        position = data.get("position", {})
-        rule_str = data.get("rule", "")
+        item = (data.get("goal_type", ""), data.get("position", {}), data.get("rule", ""), datetime.now())
 
-        # 1. Intermediate waypoint.
-        if goal_type == "intermediate":
-            waypoint = {
-                "position": {
-                    "x": position.get("x", 0.0),
-                    "y": position.get("y", 0.0),
-                    "z": 0.0
-                },
-                "orientation": {"x": 0, "y": 0, "z": 0, "w": 1}
-            }
-
-            updated = self._map_model._intermediateWaypoints + [waypoint]
+        with self._rule_lock:
+            self._rule_queue.append(item)
+            schedule = not self._rule_drain_scheduled
+            self._rule_drain_scheduled = True
 
+        # One drain task per burst; later messages join the queue it is draining.
+        if schedule:
             self._loop.call_soon_threadsafe(
-                lambda: asyncio.create_task(self._map_model.set_intermediateWaypoints(updated))
+                lambda: asyncio.create_task(self._drain_rule_queue())
             )
 
-        # 2. Global goal.
-        if goal_type == "global":
-            goal = {
+        print(f"[PathController] Queued rule: {item[2]}, type={item[0]}")
+
+    async def _drain_rule_queue(self) -> None:
+        """
+        Apply queued rule outputs in order, one batch at a time.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        while True:
+            with self._rule_lock:
+                if not self._rule_queue:
+                    self._rule_drain_scheduled = False
+                    return
+                count = min(len(self._rule_queue), self.RULE_BATCH_SIZE)
+                batch = [self._rule_queue.popleft() for _ in range(count)]
+
+            try:
+                await self._apply_rule_batch(batch)
+            except Exception as e:
+                print(f"[PathController] Failed to apply rule batch: {e}")
+
+    async def _apply_rule_batch(self, batch: List[RuleItem]) -> None:
+        """
+        Translate a batch of rule outputs into goals, waypoints and log entries.
+
+        Rule outputs provide planning intent: intermediate rules add
+        waypoints, global rules move the global goal, and every rule is
+        logged for review. Each model is updated once for the whole batch.
+
+        Params:
+            batch: Parsed rule outputs in arrival order.
+
+        Return:
+            None.
+        """
+        waypoints = []
+        global_goal = None
+        entries = []
+
+        for goal_type, position, rule_str, received_at in batch:
+            pose = {
                 "position": {
                     "x": position.get("x", 0.0),
                     "y": position.get("y", 0.0),
@@ -201,25 +268,49 @@ class PathController:
                 "orientation": {"x": 0, "y": 0, "z": 0, "w": 1}
             }
 
-            self._loop.call_soon_threadsafe(
-                lambda: asyncio.create_task(self._map_model.set_globalGoal(goal))
-            )
+            # 1. Intermediate waypoint.
+            if goal_type == "intermediate":
+                waypoints.append(pose)
+
+            # 2. Global goal; only the last one in the batch is visible.
+            if goal_type == "global":
+                global_goal = pose
+
+            # 3. Log rule entry.
+            entries.append(PathLogEntry(
+                label="Goal Entry",
+                id=self._next_goal_id(),
+                goal_type=goal_type,
+                timestamp=received_at,
+                fuzzy_output=rule_str,
+                user_feedback=""
+            ))
+
+        # The map model keeps a bounded store and publishes only the delta.
+        await self._map_model.add_intermediateWaypoints(waypoints)
+        if global_goal is not None:
+            await self._map_model.set_globalGoal(global_goal)
+        await self._path_model.add_log_entries(entries)
+
+    def _next_goal_id(self) -> str:
+        """
+        Allocate a goal id that is not used in the current history.
 
-        # 3. Log rule entry.
-        entry = PathLogEntry(
-            label="Goal Entry",
-            id=f"goal_{len(self._path_model.get_path_history()) + 1}",
-            goal_type=goal_type,
-            timestamp=datetime.now(),
-            fuzzy_output=rule_str,
-            user_feedback=""
-        )
+        A loaded history may already contain higher ids; in that case the
+        allocator is moved past them once.
 
-        self._loop.call_soon_threadsafe(
-            lambda: asyncio.create_task(self._path_model.add_log_entry(entry))
-        )
+        Params:
+            None.
 
-        print(f"[PathController] Logged rule: {rule_str}, type={goal_type}")
+        Return:
+            Goal id string.
+        """
+        goal_id = self._goal_ids.next_id()
+        store = self._path_model.get_path_store()
+        if store.index_of(goal_id) is not None:
+            self._goal_ids.advance_past(e.get_id() for e in store)
+            goal_id = self._goal_ids.next_id()
+        return goal_id
 
     def _global_goal_callback(self, message: Dict[str, Any]) -> None:
         """
@@ -317,7 +408,7 @@ class PathController:
         """
         self._ros.publish(
             "/cmd_vel",
-            DirectionCommand.STOP.get_message(),
+            self.STOP_MESSAGE,
             msg_type=
             "geometry_msgs/msg/Twist",
            
@@ -337,6 +428,96 @@ class PathController:
             List of PathLogEntry items stored in the path model.
         """
         return self._path_model.get_path_history()
+
+    # Largest page served by get_records_page.
+    MAX_PAGE_SIZE = 500
+
+    def get_records_page(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+        goal_type: Optional[str] = None,
+        feedback: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        rule: Optional[str] = None,
+        descending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Fetch one filtered page of the path history.
+
+        This lets the UI load long histories piece by piece instead of
+        receiving the whole list at once.
+
+        Params:
+            cursor: Position of the last entry of the previous page, or None.
+            limit: Page size, capped at MAX_PAGE_SIZE.
+            goal_type: Only entries with this goal type.
+            feedback: Only entries with this feedback (good, bad, unrated).
+            start: Only entries at or after this time.
+            end: Only entries at or before this time.
+            rule: Only entries whose rule output contains this text.
+            descending: True to return the newest entries first.
+
+        Return:
+            Dict with the page entries (each with its "index"), the cursor of
+            the next page (None on the last page) and the path version.
+        """
+        store = self._path_model.get_path_store()
+        positions = store.query(goal_type=goal_type, start=start, end=end, feedback=feedback)
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        items, next_cursor = store.page(positions, cursor, limit, descending, rule)
+
+        return {
+            "entries": [{"index": i, **entry.toJSON()} for i, entry in items],
+            "nextCursor": next_cursor,
+            "version": self._path_model.get_version(),
+        }
+
+    # Largest ranking served by get_rule_ranking.
+    MAX_RANKING_SIZE = 100
+
+    def get_rule_ranking(self, order: str = "worst", limit: int = 10) -> Dict[str, Any]:
+        """
+        Fetch the fuzzy rules with the most or fewest bad ratings.
+
+        The ranking is read from the per-rule aggregates the history store
+        keeps up to date, so the cost depends on the limit, not the history.
+
+        Params:
+            order: "worst" for the highest bad ratio first, "best" for the lowest.
+            limit: Number of rules, capped at MAX_RANKING_SIZE.
+
+        Return:
+            Dict with the rule rows, the number of rated rules and the path version.
+        """
+        rules = self._path_model.get_path_store().get_rule_aggregates()
+        limit = max(1, min(limit, self.MAX_RANKING_SIZE))
+        rows = rules.worst(limit) if order == "worst" else rules.best(limit)
+
+        return {
+            "rules": rows,
+            "ratedRules": rules.get_rated_count(),
+            "version": self._path_model.get_version(),
+        }
+
+    def get_segment_stats(self) -> Dict[str, Any]:
+        """
+        Fetch travel-time statistics per goal-type transition.
+
+        Mean, standard deviation and p50/p95/p99 come from the running
+        statistics of the history store, without rescanning the history.
+
+        Params:
+            None.
+
+        Return:
+            Dict with one row per transition and the path version.
+        """
+        return {
+            "transitions": self._path_model.get_path_store().get_segment_stats().toJSON(),
+            "version": self._path_model.get_version(),
+        }
    
     def stop(self):
         """
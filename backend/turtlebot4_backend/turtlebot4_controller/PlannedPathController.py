@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import RosbridgeConnection
+from turtlebot4_backend.turtlebot4_model.PlannedPath import PlannedPath
+from turtlebot4_backend.turtlebot4_utils.Polyline import Point
+
+class PlannedPathController:
+    """
+    Subscribes to the planner's /plan via RosbridgeConnection.
+    Simplifies every plan on the ROS thread and hands only the latest one
+    to the PlannedPath model.
+    """
+
+    def __init__(
+        self,
+        planned_path: PlannedPath,
+        rosbridge_host: str = "localhost",
+        rosbridge_port: int = 9090,
+        topic: str = "/plan"
+    ) -> None:
+        """
+        Initialize the rosbridge subscription and prepare async dispatch.
+
+        Params:
+            planned_path: Model that sends plan deltas to observers.
+            rosbridge_host: Hostname for the rosbridge websocket server.
+            rosbridge_port: Port for the rosbridge websocket server.
+            topic: Planner path topic (nav_msgs/msg/Path).
+
+        Return:
+            None.
+        """
+        self._planned_path = planned_path
+        self._loop = asyncio.get_event_loop()
+
+        # Plans can arrive faster than the event loop applies them; only the newest matters.
+        self._plan_lock = threading.Lock()
+        self._latest_plan: Optional[List[Point]] = None
+        self._apply_scheduled = False
+
+        self._ros = RosbridgeConnection(rosbridge_host, rosbridge_port)
+        self._ros.connect()
+        print("[PlannedPathController] Connected to rosbridge")
+
+        self._ros.subscribe(topic, "nav_msgs/msg/Path", self._plan_callback)
+        print(f"[PlannedPathController] Subscribed to {topic}")
+
+    def _plan_callback(self, message: Dict[str, Any]) -> None:
+        """
+        Simplify a planner path and queue it for the event loop.
+
+        Runs on the ROS thread, so simplifying thousands of poses does not
+        block websocket clients. A plan replaced before the event loop got
+        to it is dropped.
+
+        Params:
+            message: Rosbridge JSON payload for nav_msgs/msg/Path.
+
+        Return:
+            None.
+        """
+        poses = []
+        for stamped in message.get("poses", []):
+            pos = stamped.get("pose", {}).get("position", {})
+            poses.append((pos.get("x", 0.0), pos.get("y", 0.0)))
+
+        points = self._planned_path.simplify(poses)
+
+        with self._plan_lock:
+            self._latest_plan = points
+            schedule = not self._apply_scheduled
+            self._apply_scheduled = True
+
+        if schedule:
+            self._loop.call_soon_threadsafe(
+                lambda: asyncio.create_task(self._apply_latest_plan())
+            )
+
+    async def _apply_latest_plan(self) -> None:
+        """
+        Pass the newest queued plan to the model.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        with self._plan_lock:
+            points = self._latest_plan
+            self._latest_plan = None
+            self._apply_scheduled = False
+
+        if points is not None:
+            await self._planned_path.set_plan(points)
+
+    def shutdown(self) -> None:
+        """
+        Close the rosbridge connection.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        try:
+            self._ros.terminate()
+        except Exception:
+            pass
+        print("[PlannedPathController] Shutdown complete")
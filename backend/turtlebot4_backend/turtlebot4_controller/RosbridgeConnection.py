@@ -1,7 +1,65 @@
+import copy
+import json
 import time
 import threading
 import roslibpy
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+# roslibpy releases whose client internals RosbridgeConnection._send_frame
+# relies on: Ros.factory.on_ready(callback) calls callback(proto) once the
+# socket is ready, and proto.send_message(payload) writes one encoded frame.
+# Checked against roslibpy 1.7.0; other versions publish through
+# roslibpy.Message instead.
+RAW_SEND_ROSLIBPY_VERSIONS = ("1.",)
+
+class EncodedMessage(dict):
+    """
+    Message dict whose rosbridge publish frame is serialized only once.
+
+    Fixed messages such as the drive commands and STOP are published many
+    times per session. RosbridgeConnection.publish sends the cached frame of
+    an EncodedMessage as is, instead of copying the dict into a
+    roslibpy.Message and encoding it to JSON again on every publish.
+
+    It still is a plain dict with the message content, so it can be passed
+    anywhere a message dict is expected. Treat it as read-only: changes are
+    not reflected in the cached frame.
+    """
+
+    def __init__(self, message: Dict[str, Any]) -> None:
+        """
+        Copy the message and serialize its content.
+
+        Params:
+            message: Plain dict matching the ROS message structure.
+
+        Return:
+            None.
+        """
+        super().__init__(copy.deepcopy(message))
+        self._encoded = json.dumps(self)
+        self._frames: Dict[str, bytes] = {}  # Publish frame per topic.
+
+    def get_frame(self, topic_name: str) -> bytes:
+        """
+        Return the rosbridge publish frame for a topic, building it on first use.
+
+        Every publish of the frame carries the same id, since the frame is
+        cached; rosbridge only uses the id of a publish in status messages.
+
+        Params:
+            topic_name: ROS2 topic name the message is published to.
+
+        Return:
+            UTF-8 encoded JSON publish operation.
+        """
+        frame = self._frames.get(topic_name)
+        if frame is None:
+            frame = ('{"op": "publish", "id": %s, "topic": %s, "msg": %s, "latch": false}'
+                     % (json.dumps("publish:%s:cached" % topic_name), json.dumps(topic_name),
+                        self._encoded)).encode("utf8")
+            self._frames[topic_name] = frame
+        return frame
 
 class RosbridgeConnection:
     """
@@ -41,6 +99,9 @@ class RosbridgeConnection:
         # Keep created ActionClient objects
         self._actions: Dict[str, roslibpy.actionlib.ActionClient] = {}  
 
+        # Whether cached frames can be sent raw; None until the first EncodedMessage publish.
+        self._raw_send: Optional[bool] = None
+
     def connect(self, timeout: float = 5.0) -> None:
         """
         Connect to rosbridge and wait until the socket is ready.
@@ -130,11 +191,12 @@ class RosbridgeConnection:
         Publish a message dict to a ROS topic.
 
         This sends outbound data to ROS and creates the topic on first use if
-        needed.
+        needed. An EncodedMessage is sent as its cached frame when the client
+        allows it, otherwise it goes through roslibpy like any other dict.
 
         Params:
             topic_name: ROS2 topic name to publish to.
-            message: Plain dict matching the ROS message structure.
+            message: Plain dict matching the ROS message structure, or an EncodedMessage.
             msg_type: ROS2 message type required on first publish to a topic.
 
         Return:
@@ -150,8 +212,50 @@ class RosbridgeConnection:
             topic = roslibpy.Topic(self.client, topic_name, msg_type)
             self._topics[topic_name] = topic
 
+        if isinstance(message, EncodedMessage) and self._send_frame(topic, message.get_frame(topic_name)):
+            return
+
         topic.publish(roslibpy.Message(message))
 
+    def _send_frame(self, topic: roslibpy.Topic, frame: bytes) -> bool:
+        """
+        Send an already encoded publish frame on the websocket.
+
+        Uses the same path roslibpy takes after encoding a message, so the
+        frame is queued until the connection is ready like any other send.
+        That path is internal to roslibpy, so it is only used with the
+        versions in RAW_SEND_ROSLIBPY_VERSIONS. Otherwise the fallback is
+        logged once and every message goes through roslibpy.Message.
+
+        Params:
+            topic: Topic the frame publishes to; advertised first if needed.
+            frame: Encoded publish operation.
+
+        Return:
+            True if the frame was handed to the client, False if the client
+            does not expose a raw send and the caller should publish normally.
+        """
+        on_ready = getattr(getattr(self.client, 'factory', None), 'on_ready', None)
+        if self._raw_send is None:
+            version = getattr(roslibpy, '__version__', None)
+            if not isinstance(version, str) or not version.startswith(RAW_SEND_ROSLIBPY_VERSIONS):
+                print(f"[RosbridgeConnection] roslibpy {version} is not supported for cached frames, "
+                      f"publishing through roslibpy.Message")
+                self._raw_send = False
+            elif on_ready is None:
+                print("[RosbridgeConnection] roslibpy client has no factory.on_ready, "
+                      "publishing through roslibpy.Message")
+                self._raw_send = False
+            else:
+                self._raw_send = True
+        if not self._raw_send or on_ready is None:
+            return False
+
+        if not getattr(topic, 'is_advertised', True):
+            topic.advertise()
+        on_ready(lambda proto: proto.send_message(frame))
+        return True
+
     def call_service(self, service_name: str, service_type: str, request: dict, timeout: float = 5.0) -> dict:
         """
         Call a ROS service and wait for a response.
@@ -40,6 +40,11 @@ class StatusController:
         # This loop is used to schedule async notifications to websocket listeners:
         self._loop = loop or asyncio.get_event_loop()
         self._listeners: List[Callable[[Dict], Awaitable[None]]] = []
+
+        # Push new command-to-motion measurements with the status.
+        motion_latency = robot_state.get_motion_latency()
+        if motion_latency is not None:
+            motion_latency.attach(self._motion_latency_cb)
         self.subscribeToStatus()
 
     def subscribeToStatus(self) -> None:
@@ -160,6 +165,24 @@ class StatusController:
             lambda: asyncio.create_task(self.updateCommsConnection(msg))
         )
 
+    def _motion_latency_cb(self, source, latency: float) -> None:
+        """
+        Bridge new motion latency measurements into the async updater.
+
+        The tracker calls this on the ROS thread that delivered the
+        odometry, so we schedule the async handler on the event loop.
+
+        Params:
+            source: MotionLatency that measured the sample (unused).
+            latency: Measured latency in seconds (unused; the summary is re-read).
+
+        Return:
+            None.
+        """
+        self._loop.call_soon_threadsafe(
+            lambda: asyncio.create_task(self.updateMotionLatency())
+        )
+
     # Async updaters that modify RobotState and notify listeners upon proper value changes 
     async def updateBattery(self, msg: dict) -> None:
         """
@@ -243,6 +266,19 @@ class StatusController:
             await self.robot_state.set_is_comms_connected(val)
             await self._notify_listeners()
 
+    async def updateMotionLatency(self) -> None:
+        """
+        Publish the updated command-to-motion latency.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        await self.robot_state.set_motion_latency()
+        await self._notify_listeners()
+
     # helper to pull boolean out of std_msgs/Bool-like or dict {'data': True}
     def _extract_bool_from_msg(self, msg: dict) -> bool | None:
         """
@@ -4,20 +4,50 @@ import threading
 import asyncio
 import roslibpy
 
-from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import RosbridgeConnection
+from turtlebot4_backend.turtlebot4_controller.RosbridgeConnection import EncodedMessage, RosbridgeConnection
 from turtlebot4_backend.turtlebot4_model.Teleoperate import Teleoperate
 from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
+from turtlebot4_backend.turtlebot4_model.MotionLatency import MotionLatency
+from turtlebot4_backend.turtlebot4_utils.LatencyStats import LatencyStats
 
 class TeleopController:
     """
-    Subscribes to Teleoperate model updates and publishes drive commands to ROSBridge.
+    Streams the Teleoperate velocity setpoint to /cmd_vel at a fixed rate.
+
+    While the robot should move, a loop publishes every PUBLISH_PERIOD and
+    ramps the commanded velocity towards the setpoint with limited
+    acceleration. A zero setpoint (STOP, or a setpoint the client stopped
+    refreshing) is published at once without a ramp, after which the loop
+    goes idle until the next command.
+
+    The websocket handler calls publish_command, which updates the model
+    and publishes the first step right away, so the first motion does not
+    wait for the next tick.
+
+    Every publish is also handed to a MotionLatency tracker together with
+    the measured twist from /odom, to time how long the robot takes to
+    respond.
     """
+    # Seconds between two published setpoints while moving (20 Hz).
+    PUBLISH_PERIOD = 0.05
+    # Maximum change of the commanded velocities per second.
+    MAX_LINEAR_ACCEL = 2.0  # m/s^2
+    MAX_ANGULAR_ACCEL = 6.0  # rad/s^2
+    # The fixed drive commands, serialized once and keyed by (linear.x, angular.z).
+    # Once the ramp reaches a command's velocity, every tick publishes it as is.
+    ENCODED_COMMANDS = {
+        (c.value['linear']['x'], c.value['angular']['z']): EncodedMessage(c.value)
+        for c in DirectionCommand if isinstance(c.value, dict)
+    }
+    STOP_MESSAGE = ENCODED_COMMANDS[(0.0, 0.0)]
+
     def __init__( 
         self, 
         teleop: Teleoperate, 
         ros_host: str = 'localhost', 
         ros_port: int = 9090, 
-        loop: asyncio.AbstractEventLoop | None = None 
+        loop: asyncio.AbstractEventLoop | None = None,
+        motion_latency: MotionLatency | None = None
     ):
         """
         Initialize teleoperation forwarding and connect to rosbridge.
@@ -30,6 +60,7 @@ class TeleopController:
             ros_host: Hostname for the rosbridge websocket server.
             ros_port: Port for the rosbridge websocket server.
             loop: Optional asyncio loop for scheduling async work.
+            motion_latency: Optional shared command-to-motion tracker; a private one is created otherwise.
 
         Return:
             None.
@@ -37,6 +68,15 @@ class TeleopController:
         self.teleop = teleop  # Shared model that emits drive commands.
         self._ros = RosbridgeConnection(host=ros_host, port=ros_port)  # ROS bridge client.
         self._loop = loop or asyncio.get_event_loop()  # Loop for async publishing.
+        self._latency = LatencyStats()  # Command receipt to rosbridge send.
+        self._motion_latency = motion_latency or MotionLatency()  # Rosbridge send to /odom response.
+
+        # Velocity last published and when, used for the acceleration limit.
+        self._linear = 0.0
+        self._angular = 0.0
+        self._last_step: float | None = None
+        self._stopped = True  # True once a zero velocity was published.
+        self._stream_task: asyncio.Task | None = None
         self._ros.connect()
 
         # Wait for teleop updates and publish to ROSBridge when they occur.
@@ -55,35 +95,103 @@ class TeleopController:
             return
 
         print("[TeleopController] Connected to ROSBridge")
+        # Measured velocity, to time the robot's response to each command
+        self._ros.subscribe("/odom", "nav_msgs/msg/Odometry", self._odom_callback)
         # Advertise the topic with an empty message to ensure it exists before we try to publish real commands
         self._ros.publish('/cmd_vel', {}, msg_type='geometry_msgs/msg/Twist')  
         print("[TeleopController] /cmd_vel advertised")
 
+    def publish_command(self, command: str, received_at: float | None = None) -> bool:
+        """
+        Apply a websocket drive command and publish its first step right away.
+
+        The time from receipt to the rosbridge publish is recorded.
+
+        Params:
+            command: Drive command string (e.g., FORWARD, LEFT, STOP).
+            received_at: time.perf_counter() value taken when the command arrived.
+
+        Return:
+            True if the command was known and a velocity was published.
+        """
+        if not self.teleop.add_command(command):
+            return False
+
+        if not self._step(time.monotonic()):
+            return False
+
+        if received_at is not None:
+            self._latency.record(time.perf_counter() - received_at)
+        return True
+
+    def get_latency_stats(self):
+        """
+        Return the command latency summary.
+
+        Params:
+            None.
+
+        Return:
+            Dict with count, mean, max and p50/p95/p99 in milliseconds.
+        """
+        return self._latency.toJSON()
+
+    def get_motion_latency_stats(self):
+        """
+        Return the command-to-motion latency summary.
+
+        MotionLatency locks its state, since /odom records it from the
+        rosbridge thread, so this can be called from any thread.
+
+        Params:
+            None.
+
+        Return:
+            Dict with count, percentiles, histogram and timed out commands.
+        """
+        return self._motion_latency.toJSON()
+
+    def _odom_callback(self, message) -> None:
+        """
+        Pass the measured twist to the motion latency tracker.
+
+        Runs on the ROS thread; the tracker is thread-safe, so nothing is
+        scheduled on the event loop for the (frequent) odometry messages.
+
+        Params:
+            message: Rosbridge JSON payload for nav_msgs/msg/Odometry.
+
+        Return:
+            None.
+        """
+        twist = message.get("twist", {}).get("twist", {})
+        self._motion_latency.record_odom(
+            twist.get("linear", {}).get("x", 0.0),
+            twist.get("angular", {}).get("z", 0.0),
+        )
+
     # Teleoperate model calls this synchronously → schedule async work
     def _on_teleop_update(self, source, data):
         """
-        Schedule publishing when a teleop update arrives.
+        Make sure the setpoint stream runs when the setpoint changes.
 
         The model callback is synchronous, so we jump to the event loop to
-        safely run async publishing.
+        start the streaming task there.
 
         Params:
             source: Publisher of the update (unused).
-            data: Update payload (unused; command is read from the model).
+            data: Update payload (unused; the setpoint is read from the model).
 
         Return:
             None.
         """
-        self._loop.call_soon_threadsafe(
-            lambda: asyncio.create_task(self._publish_drive_command())
-        )
+        # Every command is published at least once, even a repeated STOP
+        self._stopped = False
+        self._loop.call_soon_threadsafe(self._ensure_streaming)
 
-    async def _publish_drive_command(self):
+    def _ensure_streaming(self) -> None:
         """
-        Publish the latest drive command to /cmd_vel.
-
-        This turns the latest teleop command into a ROS Twist message so the
-        robot moves in the requested direction.
+        Start the setpoint stream unless it is already running.
 
         Params:
             None.
@@ -91,36 +199,87 @@ class TeleopController:
         Return:
             None.
         """
-        cmd = self.teleop.get_command()
-        if not cmd:
-            return
+        if self._stream_task is None or self._stream_task.done():
+            self._stream_task = asyncio.create_task(self._stream_setpoint())
 
-        try:
-            # Convert string → enum (e.g. "FORWARD" → DirectionCommand.FORWARD)
-            direction_cmd = DirectionCommand[cmd]
+    async def _stream_setpoint(self) -> None:
+        """
+        Publish the setpoint at a fixed rate until the robot is stopped.
 
-            # Get the Twist dict from the enum
-            msg = direction_cmd.get_message()
+        Ticks are scheduled against the start time, so a slow publish does
+        not shift every later tick. When the client stops refreshing the
+        setpoint, the deadman turns it into STOP and the loop ends.
+
+        Params:
+            None.
 
-            print(f"[TeleopController] Command detected: {cmd}")
-            print("[TeleopController] Publishing:", msg)
+        Return:
+            None.
+        """
+        next_tick = time.monotonic()
+        while True:
+            now = time.monotonic()
+            self._step(now)
+            if self._stopped:
+                return
+            next_tick = max(next_tick + self.PUBLISH_PERIOD, now)
+            await asyncio.sleep(next_tick - now)
+
+    def _step(self, now: float) -> bool:
+        """
+        Move the commanded velocity towards the setpoint and publish it.
 
-            # Publish via rosbridge
-            self._ros.publish(
-                "/cmd_vel",
-                msg,
-                msg_type="geometry_msgs/msg/Twist"
-            )
+        Params:
+            now: Current time.monotonic() value.
 
-            print("[TeleopController] Published to /cmd_vel")
+        Return:
+            True if a velocity was published.
+        """
+        target_linear, target_angular = self.teleop.get_setpoint()
+
+        if target_linear == 0.0 and target_angular == 0.0:
+            # Stopping is never ramped; publish STOP once and then stay quiet.
+            self._linear = self._angular = 0.0
+            self._last_step = now
+            if self._stopped:
+                return False
+            if not self._publish(self.STOP_MESSAGE):
+                return False
+            self._motion_latency.record_command(0.0, 0.0)
+            self._stopped = True
+            return True
+
+        # A stream starting from rest ramps up over one period, not the idle time.
+        dt = self.PUBLISH_PERIOD if self._last_step is None else min(now - self._last_step, self.PUBLISH_PERIOD)
+        self._linear = _approach(self._linear, target_linear, self.MAX_LINEAR_ACCEL * dt)
+        self._angular = _approach(self._angular, target_angular, self.MAX_ANGULAR_ACCEL * dt)
+        self._last_step = now
+
+        msg = self.ENCODED_COMMANDS.get((self._linear, self._angular))
+        if msg is None:
+            msg = DirectionCommand.create_custom(self._linear, self._angular)
+        if not self._publish(msg):
+            return False
+        self._motion_latency.record_command(self._linear, self._angular)
+        self._stopped = False
+        return True
+
+    def _publish(self, msg) -> bool:
+        """
+        Publish one Twist to /cmd_vel.
 
-        except KeyError:
-            print(f"[TeleopController] Unknown command: {cmd}")
+        Params:
+            msg: Twist message dict.
 
+        Return:
+            True if rosbridge accepted the message.
+        """
+        try:
+            self._ros.publish("/cmd_vel", msg, msg_type="geometry_msgs/msg/Twist")
+            return True
         except Exception as e:
-            print(f"[TeleopController] ERROR publishing: {e}")# Get the next command from teleop
-    
-
+            print(f"[TeleopController] ERROR publishing: {e}")
+            return False
 
     def stop(self):
         """
@@ -134,6 +293,9 @@ class TeleopController:
         Return:
             None.
         """
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+
         try:
             self._ros.unadvertise('/cmd_vel')
         except Exception:
@@ -145,3 +307,20 @@ class TeleopController:
             pass
 
         print("[TeleopController] Teleop stopped")
+
+
+def _approach(current: float, target: float, max_change: float) -> float:
+    """
+    Move a value towards a target by at most max_change.
+
+    Params:
+        current: Current value.
+        target: Value to move towards.
+        max_change: Largest allowed step (non-negative).
+
+    Return:
+        The new value.
+    """
+    if target > current:
+        return min(target, current + max_change)
+    return max(target, current - max_change)
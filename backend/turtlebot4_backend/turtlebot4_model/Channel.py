@@ -0,0 +1,36 @@
+from enum import Enum
+from typing import Iterable, Set
+
+
+class Channel(str, Enum):
+    """
+    Named streams a websocket client can subscribe to.
+
+    Every message a model publishes belongs to exactly one channel, so the
+    server can skip building and sending data no client asked for.
+    """
+
+    MAP = "map"            # MAP_DATA
+    POSE = "pose"          # POSE_DATA (robot pose, global goal), WAYPOINT_UPDATE
+    HUMANS = "humans"      # POSE_DATA (detected humans)
+    STATUS = "status"      # STATUS_UPDATE
+    PATH = "path"          # PATH_UPDATE
+    FEEDBACK = "feedback"  # FEEDBACK_ENTRY, FEEDBACK_SUMMARY
+    PLAN = "plan"          # PLAN_UPDATE
+    TRAIL = "trail"        # TRAIL_APPEND, TRAIL_RESET
+
+    @classmethod
+    def parse(cls, names: Iterable[str]) -> Set["Channel"]:
+        """Convert channel names from a client message into channels.
+
+        Unknown names are ignored so older or newer clients do not break
+        the subscription.
+
+        Params:
+            names: Iterable of channel name strings.
+
+        Returns:
+            Set[Channel]: Recognized channels.
+        """
+        valid = {c.value: c for c in cls}
+        return {valid[n] for n in names if isinstance(n, str) and n in valid}
@@ -1,5 +1,11 @@
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Set
 from fastapi import WebSocket
 from turtlebot4_backend.turtlebot4_model.Observer import Observer
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
+from turtlebot4_backend.turtlebot4_utils.LatencyStats import LatencyStats
 
 
 class ConcreteObserver(Observer):
@@ -8,13 +14,24 @@ class ConcreteObserver(Observer):
 
     This bridges the observer pattern to live UI connections so state changes
     can be pushed to the frontend.
+
+    Every send is measured (count, bytes and latency per message type) so a
+    slow client can be identified from the admin endpoint.
     """
 
+    # Latest-value message types that may be skipped when a client falls behind;
+    # the next message of the same type replaces the skipped one.
+    DROPPABLE_TYPES = frozenset({"POSE_DATA", "STATUS_UPDATE"})
+    # Sends in flight above which droppable messages are skipped.
+    MAX_PENDING_SENDS = 8
+
     def __init__(self, websocket_client: WebSocket) -> None:
         """
         Initialize the observer with a websocket target.
 
         This stores the client so updates can be delivered as JSON messages.
+        New clients are subscribed to every channel until they send a
+        subscription message.
 
         Params:
             websocket_client: Target WebSocket used to deliver updates.
@@ -23,12 +40,61 @@ class ConcreteObserver(Observer):
             None.
         """
         self._client = websocket_client  # WebSocket used to push updates.
+        self._channels: Set[Channel] = set(Channel)  # Channels this client receives.
+        self._connected_at = time.time()
+        self._messages: Dict[str, int] = defaultdict(int)  # Sent messages per type.
+        self._bytes: Dict[str, int] = defaultdict(int)  # Sent bytes per type.
+        self._dropped: Dict[str, int] = defaultdict(int)  # Skipped messages per type.
+        self._latency = LatencyStats()  # Time spent in each send.
+        self._pending = 0  # Sends currently awaiting the socket.
+        self._max_pending = 0
+
+    def get_channels(self) -> Set[Channel]:
+        """
+        Return the channels this client is subscribed to.
+
+        Params:
+            None.
+
+        Return:
+            Set of subscribed channels.
+        """
+        return set(self._channels)
+
+    def set_channels(self, channels: Iterable[Channel]) -> Set[Channel]:
+        """
+        Replace the channel subscription of this client.
+
+        Params:
+            channels: Channels the client wants to receive.
+
+        Return:
+            Channels that were not subscribed before this call.
+        """
+        channels = set(channels)
+        added = channels - self._channels
+        self._channels = channels
+        return added
+
+    def is_subscribed(self, channel) -> bool:
+        """
+        Return whether this client subscribed to a channel.
+
+        Params:
+            channel: Channel the update belongs to.
+
+        Return:
+            True if updates on the channel should be sent to this client.
+        """
+        return channel in self._channels
 
     async def update(self, source, data) -> None:
         """
         Send an update payload to the connected WebSocket client.
 
-        This pushes model changes to the frontend in real time.
+        This pushes model changes to the frontend in real time. The payload
+        is encoded once so its size can be recorded without a second
+        serialization.
 
         Params:
             source: Update emitter (unused by this observer).
@@ -37,4 +103,50 @@ class ConcreteObserver(Observer):
         Return:
             None.
         """
-        await self._client.send_json(data)
+        msg_type = data.get("type", "UNKNOWN") if isinstance(data, dict) else "UNKNOWN"
+
+        # A backlogged client gets the next latest-value message instead of a stale one.
+        if self._pending >= self.MAX_PENDING_SENDS and msg_type in self.DROPPABLE_TYPES:
+            self._dropped[msg_type] += 1
+            return
+
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+        self._pending += 1
+        self._max_pending = max(self._max_pending, self._pending)
+        start = time.perf_counter()
+        try:
+            await self._client.send_text(text)
+        finally:
+            self._pending -= 1
+            self._latency.record(time.perf_counter() - start)
+
+        self._messages[msg_type] += 1
+        self._bytes[msg_type] += len(text.encode("utf-8"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the send statistics of this client.
+
+        Params:
+            None.
+
+        Return:
+            Dict with the client address, channels, per-type message, byte
+            and drop counts, send latency percentiles and queue depth.
+        """
+        client = getattr(self._client, "client", None)
+        return {
+            "client": f"{client.host}:{client.port}" if client else None,
+            "connectedSeconds": round(time.time() - self._connected_at, 1),
+            "channels": sorted(c.value for c in self._channels),
+            "messages": dict(self._messages),
+            "bytes": dict(self._bytes),
+            "dropped": dict(self._dropped),
+            "totalMessages": sum(self._messages.values()),
+            "totalBytes": sum(self._bytes.values()),
+            "totalDropped": sum(self._dropped.values()),
+            "sendLatency": self._latency.toJSON(),
+            "queueDepth": self._pending,
+            "maxQueueDepth": self._max_pending,
+        }
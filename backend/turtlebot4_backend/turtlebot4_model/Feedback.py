@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
 from turtlebot4_backend.turtlebot4_model.FeedbackLogEntry import FeedbackLogEntry
+from turtlebot4_backend.turtlebot4_model.PathHistoryStore import PathHistoryStore
 
 class Feedback:
     """Track navigation feedback metrics and history entries."""
@@ -14,10 +15,13 @@ class Feedback:
         Returns:
             None.
         """
-        self._path_history: List[PathLogEntry] = []
+        self._path_history = PathHistoryStore()  # Indexed by goal id for fromJSON.
         self._total_good_ratings: int = 0
         self._total_bad_ratings: int = 0
         self._feedback_history: List[FeedbackLogEntry] = []
+        self._logged_ids: Set[str] = set()  # Goal ids that already have a log entry.
+        self._log_cursor: int = 0  # Path entries before this position were processed.
+        self._pending_ids: Set[str] = set()  # Goal ids whose feedback changed since the last log update.
 
     # Getters
     def get_path_history(self) -> List[PathLogEntry]:
@@ -29,7 +33,7 @@ class Feedback:
         Returns:
             List[PathLogEntry]: Path log entries associated with this feedback.
         """
-        return self._path_history
+        return self._path_history.get_entries()
 
     def get_total_good_ratings(self) -> int:
         """Return the total count of good ratings.
@@ -75,7 +79,8 @@ class Feedback:
         Returns:
             None.
         """
-        self._path_history = history
+        self._path_history.reset(history)
+        self._log_cursor = 0
 
     def set_total_good_ratings(self, value: int) -> None:
         """Set the total count of good ratings.
@@ -104,6 +109,8 @@ class Feedback:
     def set_feedback_history(self, history: List[FeedbackLogEntry]) -> None:
         """Replace the feedback log history.
 
+        The next update_feedback_log call starts over against the new log.
+
         Params:
             self: Feedback instance.
             history: New feedback log entries to store.
@@ -112,69 +119,104 @@ class Feedback:
             None.
         """
         self._feedback_history = history
+        self._logged_ids = set()
+        self._log_cursor = 0
 
-    def calculate_feedback_ratio(self, path_history: List[PathLogEntry]) -> float:
+    def calculate_feedback_ratio(self, path_history: Optional[List[PathLogEntry]] = None) -> float:
         """Calculate the percentage of good feedback with the currently saved user feedback.
 
+        The ratio is read from the running counters of the stored history.
+        Passing a different list replaces the stored history first.
+
         Params:
             self: Feedback instance.
-            path_history: Path log entries to analyze.
+            path_history: Path log entries to analyze; None uses the stored history.
 
         Returns:
             float: Ratio of good feedback over total feedback entries.
         """
-        if not path_history:
-            return 0.0
+        if path_history is not None:
+            self._sync_path_history(path_history)
 
-        good = 0
-        total = 0
-
-        for entry in path_history:
-            feedback = entry.get_user_feedback()
-            if feedback is not None:
-                total += 1
-                if feedback.lower() == "good":
-                    good += 1
+        counts = self._path_history.get_feedback_counts()
+        good = counts[PathHistoryStore.GOOD]
+        bad = counts[PathHistoryStore.BAD]
 
-        if total == 0:
+        if good + bad == 0:
             return 0.0
 
         self._total_good_ratings = good
-        self._total_bad_ratings = total - good
+        self._total_bad_ratings = bad
 
-        return good / total
+        return good / (good + bad)
 
-    def update_feedback_log(self, path_history: List[PathLogEntry]) -> None:
+    def update_feedback_log(self, path_history: Optional[List[PathLogEntry]] = None) -> None:
         """Create feedback log entries for new user feedback.
 
+        Only path entries added since the last call and entries whose
+        feedback changed through fromJSON are examined, and each goal id is
+        logged at most once, so repeated calls with a growing history stay
+        linear overall.
+
         Params:
             self: Feedback instance.
-            path_history: Path log entries to process.
+            path_history: Path log entries to process; None uses the stored history.
 
         Returns:
             None.
         """
-        self._path_history = path_history
-
-        for entry in path_history:
+        if path_history is not None:
+            self._sync_path_history(path_history)
+
+        entries = self._path_history.get_entries()
+        candidates = entries[self._log_cursor:]
+        for goal_id in self._pending_ids:
+            index = self._path_history.index_of(goal_id)
+            if index is not None and index < self._log_cursor:
+                candidates.append(entries[index])
+        self._log_cursor = len(entries)
+        self._pending_ids = set()
+
+        for entry in candidates:
             feedback = entry.get_user_feedback()
-            if feedback is None:
+            # PathLogEntry defaults to "", which like None means not rated yet
+            if (PathHistoryStore.feedback_category(feedback) == PathHistoryStore.UNRATED
+                    or entry.get_id() in self._logged_ids):
                 continue
 
-            # Check if this entry has already been logged
-            already_logged = any(
-                log.get_start_point() == entry.get_id()
-                for log in self._feedback_history
+            log = FeedbackLogEntry(
+                duration=str(entry.get_timestamp()),
+                start_point=entry.get_label(),
+                end_point=entry.get_goal_type(),
+                feedback=feedback,
             )
+            self._feedback_history.append(log)
+            self._logged_ids.add(entry.get_id())
+
+    def _sync_path_history(self, path_history: List[PathLogEntry]) -> None:
+        """Bring the stored history in line with a list passed by a caller.
+
+        A list that extends the stored history only has its new tail
+        appended; any other list replaces the stored history.
+
+        Params:
+            self: Feedback instance.
+            path_history: Path log entries from the caller.
+
+        Returns:
+            None.
+        """
+        stored = self._path_history.get_entries()
+        if path_history is stored:
+            return
 
-            if not already_logged:
-                log = FeedbackLogEntry(
-                    duration=str(entry.get_timestamp()),
-                    start_point=entry.get_label(),
-                    end_point=entry.get_goal_type(),
-                    feedback=feedback,
-                )
-                self._feedback_history.append(log)
+        n = len(stored)
+        if len(path_history) >= n and (n == 0 or path_history[n - 1] is stored[n - 1]):
+            for entry in path_history[n:]:
+                self._path_history.append(entry)
+        else:
+            self._path_history.reset(path_history)
+            self._log_cursor = 0
 
     def toJSON(self) -> Dict[str, Any]:
         """Serialize the feedback state to a JSON-compatible dict.
@@ -221,7 +263,9 @@ class Feedback:
         if entry_id is None:
             return
 
-        for entry in self._path_history:
-            if entry.get_id() == entry_id:
-                entry.set_user_feedback(feedback)
-                break
+        index = self._path_history.index_of(entry_id)
+        if index is not None:
+            entry = self._path_history[index]
+            entry.set_user_feedback(feedback)
+            self._path_history.replace(index, entry)  # Keeps the feedback counters current.
+            self._pending_ids.add(entry_id)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import base64
 import numpy as np
@@ -5,6 +6,10 @@ import matplotlib.pyplot as plt
 from typing import Dict, Any
 from turtlebot4_backend.turtlebot4_model.Subject import Subject
 from turtlebot4_backend.turtlebot4_model.MapData import MapData
+from turtlebot4_backend.turtlebot4_model.WaypointStore import WaypointStore
+from turtlebot4_backend.turtlebot4_model.PoseFilter import PoseFilter
+from turtlebot4_backend.turtlebot4_model.Trail import Trail
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
 from geometry_msgs.msg import PoseStamped
 
 class Map(Subject):
@@ -13,7 +18,9 @@ class Map(Subject):
     # Save directory for generated map PNGs.
     SAVE_DIR = os.path.expanduser("~/ros2_ws/src/RobotDashboardSystem")
 
-    def __init__(self, mapData=None, robotPose=None, globalGoal=None, intermediateWaypoints=None):
+    def __init__(self, mapData=None, robotPose=None, globalGoal=None, intermediateWaypoints=None,
+                 waypointCapacity: int = WaypointStore.DEFAULT_CAPACITY, poseFilter: PoseFilter = None,
+                 telemetry=None, trail: Trail = None):
         """Initialize the map model and optional state.
 
         Params:
@@ -22,6 +29,10 @@ class Map(Subject):
             robotPose: Initial robot pose.
             globalGoal: Initial global goal pose.
             intermediateWaypoints: Initial list of waypoint poses.
+            waypointCapacity: Maximum number of intermediate waypoints kept.
+            poseFilter: Dead-band filter for incoming robot poses.
+            telemetry: Optional Telemetry that records the pose history.
+            trail: Simplified trail of the driven path.
 
         Returns:
             None.
@@ -31,7 +42,12 @@ class Map(Subject):
         self._mapDataPNG = None
         self._robotPose = robotPose
         self._globalGoal = globalGoal
-        self._intermediateWaypoints = intermediateWaypoints or []
+        # Bounded ring buffer, so long runs cannot grow the waypoint list forever.
+        self._intermediateWaypoints = WaypointStore(waypointCapacity, intermediateWaypoints)
+        # Shared by every controller that feeds /odom poses into this model.
+        self._poseFilter = poseFilter if poseFilter else PoseFilter()
+        self._telemetry = telemetry
+        self._trail = trail if trail else Trail()
 
         if mapData:
             self._convert_mapdata_to_png()
@@ -85,15 +101,40 @@ class Map(Subject):
         self._mapData = value
         self._convert_mapdata_to_png()
 
-        await self.notify_observers({
-            "type": "MAP_DATA",
-            "mapData": {
-                "resolution": self._mapData.get_resolution(),
-                "width": self._mapData.get_width(),
-                "height": self._mapData.get_height(),
-                "occupancyGridPNG": self._mapDataPNG
-            }
-        })
+        await self.notify_observers(self._map_data_message(), channel=Channel.MAP)
+
+    def get_poseFilter(self) -> PoseFilter:
+        """Return the dead-band filter applied to incoming robot poses.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            PoseFilter: Filter shared by the pose producers.
+        """
+        return self._poseFilter
+
+    def release_held_robotPose(self) -> None:
+        """Publish the pose the filter held back, once it is due.
+
+        Runs on the event loop, from a timer armed with
+        PoseFilter.take_hold_timer. A pose that is not due yet re-arms the
+        timer.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            None.
+        """
+        pose = self._poseFilter.release_held()
+        if pose is not None:
+            asyncio.create_task(self.set_robotPose(pose))
+            return
+
+        delay = self._poseFilter.take_hold_timer()
+        if delay is not None:
+            asyncio.get_running_loop().call_later(delay, self.release_held_robotPose)
 
     # DYNAMIC POSE UPDATE
     async def set_robotPose(self, value: PoseStamped) -> None:
@@ -107,7 +148,84 @@ class Map(Subject):
             None.
         """
         self._robotPose = value
+        if self._telemetry is not None and isinstance(value, dict):
+            position = value.get("position", {})
+            self._telemetry.record("poseX", position.get("x"))
+            self._telemetry.record("poseY", position.get("y"))
         await self._send_pose_update()
+        await self._extend_trail(value)
+
+    def get_trail(self) -> Trail:
+        """Return the simplified trail of the driven path.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            Trail: Trail fed by the robot poses.
+        """
+        return self._trail
+
+    async def clear_trail(self) -> None:
+        """Remove the driven trail and notify observers.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            None.
+        """
+        self._trail.clear()
+        await self.notify_observers(await self._trail_reset_message(), channel=Channel.TRAIL)
+
+    async def send_trail_snapshot(self, observer, tolerance=None) -> None:
+        """Send the whole trail, simplified to a tolerance, to one observer.
+
+        Clients ask again with a coarser tolerance when they zoom out, so
+        the number of vertices drawn follows the displayed detail.
+
+        Params:
+            self: Map instance.
+            observer: Observer that should receive the trail.
+            tolerance: Tolerance in meters; defaults to Trail.SNAPSHOT_TOLERANCE.
+
+        Returns:
+            None.
+        """
+        await self.notify_observer(observer, await self._trail_reset_message(tolerance))
+
+    async def _extend_trail(self, pose) -> None:
+        """Add a robot pose to the trail and send the vertices it completed.
+
+        Most poses fall on the current straight segment and complete no
+        vertex, so nothing is sent for them.
+
+        Params:
+            self: Map instance.
+            pose: New robot pose.
+
+        Returns:
+            None.
+        """
+        if pose is None:
+            return
+        # Pose can be a dict (simulator) or a PoseStamped (real robot)
+        if isinstance(pose, dict):
+            position = pose.get("position", {})
+            x, y = position.get("x", 0.0), position.get("y", 0.0)
+        else:
+            x, y = pose.pose.position.x, pose.pose.position.y
+
+        vertices = self._trail.add(x, y)
+        if not vertices or not self.has_subscribers(Channel.TRAIL):
+            return
+
+        await self.notify_observers({
+            "type": "TRAIL_APPEND",
+            "vertices": vertices,
+            # Vertices with lower ids were evicted from the bounded buffer
+            "firstId": self._trail.get_first_id()
+        }, channel=Channel.TRAIL)
 
     async def set_globalGoal(self, value: PoseStamped) -> None:
         """Update the global goal and notify observers.
@@ -122,8 +240,19 @@ class Map(Subject):
         self._globalGoal = value
         await self._send_pose_update()
 
+    def get_intermediateWaypoints(self):
+        """Return the stored intermediate waypoint poses, oldest first.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            List of waypoint poses.
+        """
+        return self._intermediateWaypoints.get_poses()
+
     async def set_intermediateWaypoints(self, value) -> None:
-        """Update intermediate waypoints and notify observers.
+        """Replace all intermediate waypoints and notify observers.
 
         Params:
             self: Map instance.
@@ -132,8 +261,92 @@ class Map(Subject):
         Returns:
             None.
         """
-        self._intermediateWaypoints = value
-        await self._send_pose_update()
+        self._intermediateWaypoints.replace(value)
+        await self.notify_observers(self._waypoint_reset_message(), channel=Channel.POSE)
+
+    async def add_intermediateWaypoint(self, pose) -> None:
+        """Append one intermediate waypoint and notify observers of the delta.
+
+        Only the new waypoint and the ids evicted to make room for it are
+        sent, so the message size does not depend on the waypoint count.
+
+        Params:
+            self: Map instance.
+            pose: Waypoint pose to append.
+
+        Returns:
+            None.
+        """
+        waypoint_id, evicted = self._intermediateWaypoints.append(pose)
+        await self.notify_observers({
+            "type": "WAYPOINT_UPDATE",
+            "op": "append",
+            "waypoints": [self._waypoint_to_dict(waypoint_id, pose)],
+            "evicted": evicted
+        }, channel=Channel.POSE)
+
+    async def add_intermediateWaypoints(self, poses) -> None:
+        """Append several intermediate waypoints and send one delta for all of them.
+
+        Waypoints that are evicted again within the same call are left out
+        of the message, since clients never saw them.
+
+        Params:
+            self: Map instance.
+            poses: Waypoint poses to append, oldest first.
+
+        Returns:
+            None.
+        """
+        if not poses:
+            return
+
+        added = []
+        evicted = []
+        for pose in poses:
+            waypoint_id, dropped = self._intermediateWaypoints.append(pose)
+            added.append((waypoint_id, pose))
+            evicted.extend(dropped)
+
+        dropped_ids = set(evicted)
+        await self.notify_observers({
+            "type": "WAYPOINT_UPDATE",
+            "op": "append",
+            "waypoints": [self._waypoint_to_dict(i, p) for i, p in added if i not in dropped_ids],
+            "evicted": [i for i in evicted if i < added[0][0]]
+        }, channel=Channel.POSE)
+
+    async def evict_intermediateWaypoint(self, waypoint_id: int) -> None:
+        """Remove one intermediate waypoint by id and notify observers.
+
+        Params:
+            self: Map instance.
+            waypoint_id: Id of the waypoint to remove.
+
+        Returns:
+            None.
+        """
+        if self._intermediateWaypoints.evict(waypoint_id):
+            await self.notify_observers({
+                "type": "WAYPOINT_UPDATE",
+                "op": "evict",
+                "evicted": [waypoint_id]
+            }, channel=Channel.POSE)
+
+    async def clear_intermediateWaypoints(self) -> None:
+        """Remove all intermediate waypoints and notify observers.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            None.
+        """
+        self._intermediateWaypoints.clear()
+        await self.notify_observers({
+            "type": "WAYPOINT_UPDATE",
+            "op": "clear"
+        }, channel=Channel.POSE)
 
     async def set_detectedHumans(self, humans) -> None:
         """Update detected humans and notify observers.
@@ -146,11 +359,15 @@ class Map(Subject):
             None.
         """
         self._detectedHumans = humans
-        await self._send_pose_update()
+        await self._send_humans_update()
 
     # Helper to send POSE_DATA
     async def _send_pose_update(self):
-        """Send the latest pose-related data to observers.
+        """Send the latest robot pose and global goal to observers.
+
+        Intermediate waypoints are not part of POSE_DATA; they are published
+        as WAYPOINT_UPDATE deltas so pose ticks stay constant-size. Humans
+        are sent separately on their own channel.
 
         Params:
             self: Map instance.
@@ -158,13 +375,151 @@ class Map(Subject):
         Returns:
             None.
         """
-        await self.notify_observers({
+        if not self.has_subscribers(Channel.POSE):
+            return
+
+        await self.notify_observers(self._pose_message(), channel=Channel.POSE)
+
+    async def _send_humans_update(self):
+        """Send the detected humans to observers of the humans channel.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            None.
+        """
+        if not self.has_subscribers(Channel.HUMANS):
+            return
+
+        await self.notify_observers(self._humans_message(), channel=Channel.HUMANS)
+
+    async def send_snapshot(self, observer, channels=None) -> None:
+        """Send the current map, pose, waypoints, humans and trail to one observer.
+
+        Only the given observer receives the data, so a new connection does
+        not re-send the full map to every connected client.
+
+        Params:
+            self: Map instance.
+            observer: Observer that should receive the snapshot.
+            channels: Optional set of channels to limit the snapshot to.
+
+        Returns:
+            None.
+        """
+        def wants(channel):
+            return observer.is_subscribed(channel) and (channels is None or channel in channels)
+
+        if wants(Channel.MAP) and self._mapDataPNG:
+            await self.notify_observer(observer, self._map_data_message())
+        if wants(Channel.POSE):
+            await self.notify_observer(observer, self._pose_message())
+            await self.notify_observer(observer, self._waypoint_reset_message())
+        if wants(Channel.HUMANS):
+            await self.notify_observer(observer, self._humans_message())
+        if wants(Channel.TRAIL):
+            await self.notify_observer(observer, await self._trail_reset_message())
+
+    # Message builders shared by broadcasts and per-client snapshots
+    def _map_data_message(self):
+        """Build the MAP_DATA message for the current map.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            Dict[str, Any]: MAP_DATA payload.
+        """
+        return {
+            "type": "MAP_DATA",
+            "mapData": {
+                "resolution": self._mapData.get_resolution(),
+                "width": self._mapData.get_width(),
+                "height": self._mapData.get_height(),
+                "occupancyGridPNG": self._mapDataPNG
+            }
+        }
+
+    def _pose_message(self):
+        """Build the POSE_DATA message for the robot pose and global goal.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            Dict[str, Any]: POSE_DATA payload.
+        """
+        return {
             "type": "POSE_DATA",
             "robotPose": self._pose_to_dict(self._robotPose),
             "globalGoal": self._pose_to_dict(self._globalGoal),
-            "intermediateWaypoints": [self._pose_to_dict(p) for p in self._intermediateWaypoints],
+        }
+
+    def _humans_message(self):
+        """Build the POSE_DATA message for the detected humans.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            Dict[str, Any]: POSE_DATA payload with only the humans key.
+        """
+        return {
+            "type": "POSE_DATA",
             "humans": [h.toJSON() for h in getattr(self, "_detectedHumans", [])]
-        })
+        }
+
+    def _waypoint_reset_message(self):
+        """Build a WAYPOINT_UPDATE message that replaces all waypoints.
+
+        Params:
+            self: Map instance.
+
+        Returns:
+            Dict[str, Any]: WAYPOINT_UPDATE payload with op "reset".
+        """
+        return {
+            "type": "WAYPOINT_UPDATE",
+            "op": "reset",
+            "waypoints": [self._waypoint_to_dict(i, p) for i, p in self._intermediateWaypoints.get_items()]
+        }
+
+    async def _trail_reset_message(self, tolerance=None):
+        """Build a TRAIL_RESET message that replaces the whole trail.
+
+        Simplifying a long trail takes tens of milliseconds, so it runs in
+        a worker thread on a copy of the vertices instead of on the event loop.
+
+        Params:
+            self: Map instance.
+            tolerance: Tolerance in meters; defaults to Trail.SNAPSHOT_TOLERANCE.
+
+        Returns:
+            Dict[str, Any]: TRAIL_RESET payload.
+        """
+        tolerance = Trail.SNAPSHOT_TOLERANCE if tolerance is None else tolerance
+        vertices = self._trail.get_vertices()
+        if tolerance > self._trail.get_tolerance() and len(vertices) > 2:
+            vertices = await asyncio.to_thread(Trail.simplify_vertices, vertices, tolerance)
+        return {
+            "type": "TRAIL_RESET",
+            "tolerance": max(tolerance, self._trail.get_tolerance()),
+            "vertices": vertices
+        }
+
+    def _waypoint_to_dict(self, waypoint_id: int, pose):
+        """Convert a stored waypoint to a JSON-compatible dict with its id.
+
+        Params:
+            self: Map instance.
+            waypoint_id: Id assigned by the waypoint store.
+            pose: Waypoint pose.
+
+        Returns:
+            Dict[str, Any]: Pose data with an added "id" key.
+        """
+        return {"id": waypoint_id, **self._pose_to_dict(pose)}
 
     def _pose_to_dict(self, pose):
         """Convert a pose to a JSON-compatible dict.
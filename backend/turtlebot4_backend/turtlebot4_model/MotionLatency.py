@@ -0,0 +1,234 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from turtlebot4_backend.turtlebot4_utils.LatencyStats import LatencyStats
+
+Twist = Tuple[float, float]  # (linear.x, angular.z)
+
+
+class _PendingCommand:
+    """A published velocity command that odometry has not reflected yet."""
+
+    __slots__ = ("sent_at", "baseline", "change")
+
+    def __init__(self, sent_at: float, baseline: Twist, change: Twist) -> None:
+        self.sent_at = sent_at
+        self.baseline = baseline  # Measured twist when the command was published.
+        self.change = change  # Commanded twist minus baseline.
+
+
+class MotionLatency:
+    """
+    Command-to-motion latency: from a /cmd_vel publish to the first /odom
+    twist that reflects it.
+
+    A command is reflected once the measured twist has moved from its value
+    at publish time towards the commanded one by at least the motion
+    threshold on every axis the command changes. This times the onset of
+    the robot's response, which covers the rosbridge link, the network and
+    the robot's controller, not how long the robot takes to reach speed.
+
+    Only one command is tracked at a time. The steps of an acceleration
+    ramp continue the command that started it, so the first publish is
+    timed; a command in another direction replaces it. Commands that are
+    not reflected within MATCH_TIMEOUT are counted as timed out.
+
+    Publishes and odometry come from different threads, so all state is
+    guarded by a lock.
+    """
+
+    # Smallest measured velocity change that counts as a response.
+    LINEAR_THRESHOLD = 0.02  # m/s
+    ANGULAR_THRESHOLD = 0.05  # rad/s
+    # Seconds after which an unreflected command is given up.
+    MATCH_TIMEOUT = 2.0
+    # Upper histogram bucket edges in milliseconds.
+    HISTOGRAM_EDGES_MS = (50, 100, 150, 200, 300, 500, 750, 1000, 2000)
+
+    def __init__(self, window: int = LatencyStats.DEFAULT_WINDOW,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize empty statistics and the observer list.
+
+        Params:
+            window: Number of recent latencies kept for percentiles and the histogram.
+            clock: Monotonic time source, injectable for tests.
+
+        Return:
+            None.
+        """
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._stats = LatencyStats(window)
+        self._measured: Twist = (0.0, 0.0)
+        self._pending: Optional[_PendingCommand] = None
+        self._timed_out = 0
+        self._observers = []
+
+    def attach(self, callback) -> None:
+        """
+        Register a callback for new latency samples.
+
+        Callbacks run on the thread that delivered the odometry.
+
+        Params:
+            callback: Function called as callback(source, latency_seconds).
+
+        Return:
+            None.
+        """
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def detach(self, callback) -> None:
+        """
+        Remove a previously registered callback.
+
+        Params:
+            callback: Function to remove.
+
+        Return:
+            None.
+        """
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def record_command(self, linear_x: float, angular_z: float) -> None:
+        """
+        Note a velocity command that was just published.
+
+        Params:
+            linear_x: Published linear.x velocity (m/s).
+            angular_z: Published angular.z velocity (rad/s).
+
+        Return:
+            None.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            pending = self._pending
+            if pending is not None:
+                so_far = (linear_x - pending.baseline[0], angular_z - pending.baseline[1])
+                if _same_direction(pending.change, so_far):
+                    return  # Still the same motion, e.g. the next ramp step.
+
+            baseline = self._measured
+            change = (linear_x - baseline[0], angular_z - baseline[1])
+            # A command odometry cannot show (the robot already does it) is not timed
+            self._pending = _PendingCommand(now, baseline, change) if _significant(change) else None
+
+    def record_odom(self, linear_x: float, angular_z: float) -> Optional[float]:
+        """
+        Note a measured twist from /odom and time the pending command if it reflects it.
+
+        Params:
+            linear_x: Measured linear.x velocity (m/s).
+            angular_z: Measured angular.z velocity (rad/s).
+
+        Return:
+            Latency in seconds when this twist completed a measurement, otherwise None.
+        """
+        now = self._clock()
+        with self._lock:
+            self._measured = (linear_x, angular_z)
+            self._expire(now)
+            pending = self._pending
+            if pending is None or not _reflects(pending, self._measured):
+                return None
+            self._pending = None
+            latency = now - pending.sent_at
+            self._stats.record(latency)
+
+        for cb in list(self._observers):
+            cb(self, latency)
+        return latency
+
+    def _expire(self, now: float) -> None:
+        """
+        Give up on the pending command once MATCH_TIMEOUT passed. Caller holds the lock.
+
+        Params:
+            now: Current clock value.
+
+        Return:
+            None.
+        """
+        if self._pending is not None and now - self._pending.sent_at > self.MATCH_TIMEOUT:
+            self._pending = None
+            self._timed_out += 1
+
+    def toJSON(self) -> Dict[str, Any]:
+        """
+        Summarize the measured latencies.
+
+        Params:
+            None.
+
+        Return:
+            Dict with count, mean, max and p50/p95/p99 in milliseconds, the
+            histogram of recent latencies and the number of timed out commands.
+        """
+        with self._lock:
+            return {
+                **self._stats.toJSON(),
+                "histogram": self._stats.histogram(self.HISTOGRAM_EDGES_MS),
+                "timedOut": self._timed_out,
+            }
+
+
+def _significant(change: Twist) -> bool:
+    """
+    Return whether a twist change is large enough to show in odometry.
+
+    Params:
+        change: (linear, angular) velocity difference.
+
+    Return:
+        True if either axis exceeds its motion threshold.
+    """
+    return (abs(change[0]) > MotionLatency.LINEAR_THRESHOLD
+            or abs(change[1]) > MotionLatency.ANGULAR_THRESHOLD)
+
+
+def _same_direction(change: Twist, other: Twist) -> bool:
+    """
+    Return whether two twist changes move the same axes the same way.
+
+    Params:
+        change: Change of the pending command.
+        other: Change of a newer command, from the same baseline.
+
+    Return:
+        True if every axis is either unchanged in both or changed in both with the same sign.
+    """
+    for a, b, threshold in ((change[0], other[0], MotionLatency.LINEAR_THRESHOLD),
+                            (change[1], other[1], MotionLatency.ANGULAR_THRESHOLD)):
+        if (abs(a) > threshold) != (abs(b) > threshold):
+            return False
+        if abs(a) > threshold and (a > 0) != (b > 0):
+            return False
+    return True
+
+
+def _reflects(pending: _PendingCommand, measured: Twist) -> bool:
+    """
+    Return whether a measured twist shows the response to a pending command.
+
+    Params:
+        pending: Command being timed.
+        measured: Latest measured (linear, angular) twist.
+
+    Return:
+        True if every changed axis moved at least its threshold in the commanded direction.
+    """
+    for change, baseline, value, threshold in (
+            (pending.change[0], pending.baseline[0], measured[0], MotionLatency.LINEAR_THRESHOLD),
+            (pending.change[1], pending.baseline[1], measured[1], MotionLatency.ANGULAR_THRESHOLD)):
+        if abs(change) <= threshold:
+            continue
+        moved = value - baseline if change > 0 else baseline - value
+        if moved < threshold:
+            return False
+    return True
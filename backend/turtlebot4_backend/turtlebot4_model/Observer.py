@@ -24,4 +24,19 @@ class Observer(ABC):
         Return:
             None.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def is_subscribed(self, channel) -> bool:
+        """
+        Return whether this observer wants updates from a channel.
+
+        Observers receive every channel unless they override this, so plain
+        observers keep working without a subscription step.
+
+        Params:
+            channel: Channel the update belongs to.
+
+        Return:
+            True if updates on the channel should be delivered.
+        """
+        return True
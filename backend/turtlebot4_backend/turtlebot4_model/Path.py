@@ -1,6 +1,8 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 from turtlebot4_backend.turtlebot4_model.Subject import Subject
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
 from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+from turtlebot4_backend.turtlebot4_model.PathHistoryStore import PathHistoryStore
 
 class Path(Subject):
     """
@@ -8,12 +10,20 @@ class Path(Subject):
 
     This model notifies observers when its state changes so the frontend can
     stay in sync with navigation activity and user feedback.
+
+    The path channel is a versioned stream: clients receive one PATH_UPDATE
+    snapshot, then PATH_APPEND, PATH_PATCH and PATH_FLAGS operations that each
+    carry only the changed entry or flags. Every message bumps the version by
+    one, so a client that sees a gap can request a new snapshot. Large
+    histories are loaded as PATH_LOAD_BEGIN, PATH_LOAD_CHUNK and
+    PATH_LOAD_END; PATH_LOAD_END carries the version of the new history.
     """
     def __init__(
         self,
         path_history: List[PathLogEntry] | None = None,
         is_path_module_active: bool = False,
         is_docked: bool = False,
+        journal=None,
     ) -> None:
         """
         Initialize path state and observer support.
@@ -25,22 +35,31 @@ class Path(Subject):
             path_history: Optional initial list of PathLogEntry records.
             is_path_module_active: Whether the path module starts enabled.
             is_docked: Whether the robot starts in a docked state.
+            journal: Optional PathJournal that persists history changes as they happen.
 
         Return:
             None.
         """
         super().__init__()
-        self._path_history: List[PathLogEntry] = path_history if path_history is not None else []
+        # Indexed by goal id, goal type and time so lookups do not scan the history.
+        self._path_history = PathHistoryStore(path_history)
         self._is_path_module_active: bool = is_path_module_active
         self._is_docked: bool = is_docked
         self._path_controller = None 
+        self._version: int = 0  # Incremented on every path stream message.
+        self._journal = journal
+        self._loading: bool = False  # True while load_path_history runs.
+        # Entries appended while a load runs, re-applied on top of the loaded history.
+        self._load_appends: List[PathLogEntry] = []
 
     # Getters
     def get_path_history(self) -> List[PathLogEntry]:
         """
         Return the stored path log entries.
 
-        This exposes the history for UI display and analytics.
+        This exposes the history for UI display and analytics. The list
+        must not be modified directly; use the setters so the indexes stay
+        valid.
 
         Params:
             None.
@@ -48,8 +67,36 @@ class Path(Subject):
         Return:
             List of PathLogEntry items.
         """
+        return self._path_history.get_entries()
+
+    def get_path_store(self) -> PathHistoryStore:
+        """
+        Return the indexed store backing the path history.
+
+        This gives filtered queries access to the goal type and time indexes.
+
+        Params:
+            None.
+
+        Return:
+            PathHistoryStore holding the entries.
+        """
         return self._path_history
 
+    def get_version(self) -> int:
+        """
+        Return the version of the path stream.
+
+        This lets clients detect missed incremental operations.
+
+        Params:
+            None.
+
+        Return:
+            Current path stream version.
+        """
+        return self._version
+
     def get_is_path_module_active(self) -> bool:
         """
         Return whether the path module is active.
@@ -92,11 +139,97 @@ class Path(Subject):
         Return:
             None.
         """
-        self._path_history = value
-        await self.notify_observers({ 
-                "type": "PATH_UPDATE", 
-                **self.toJSON() 
-        })
+        self._path_history.reset(value)
+        self._journal_record({"op": "reset", "entries": [e.toJSON() for e in self._path_history]})
+        await self._send_path_update()
+
+    async def load_path_history(self, chunks: AsyncIterator[List[PathLogEntry]], total: int = 0,
+                                source: Optional[str] = None) -> bool:
+        """
+        Replace the path history with entries that arrive in chunks.
+
+        Chunks are forwarded to the UI as they arrive (PATH_LOAD_BEGIN,
+        PATH_LOAD_CHUNK with progress, PATH_LOAD_END), while the new history
+        is built in a separate store. The current history stays live until
+        the last chunk, then the stores are swapped in one step. Entries
+        appended while the load runs are kept and appended to the loaded
+        history, as a last chunk. Only one load runs at a time.
+
+        If a chunk fails, the current history is kept and sent to observers
+        as a PATH_UPDATE snapshot, which ends the load on the clients, and
+        the error is raised to the caller.
+
+        Params:
+            chunks: Async iterator over lists of PathLogEntry, in history order.
+            total: Expected number of entries, for progress reporting.
+            source: Name of the snapshot being loaded.
+
+        Return:
+            True if the history was replaced, False if a load was already running.
+        """
+        if self._loading:
+            return False
+
+        self._loading = True
+        self._load_appends = []
+        try:
+            store = PathHistoryStore()
+            entries_json: List[Dict[str, Any]] = []
+            await self.notify_observers({
+                "type": "PATH_LOAD_BEGIN",
+                "total": total,
+                "source": source,
+            }, channel=Channel.PATH)
+
+            async for chunk in chunks:
+                chunk_json = [e.toJSON() for e in chunk]
+                for e in chunk:
+                    store.append(e)
+                entries_json.extend(chunk_json)
+                await self.notify_observers({
+                    "type": "PATH_LOAD_CHUNK",
+                    "entries": chunk_json,
+                    "loaded": len(store),
+                    "total": max(total, len(store)),
+                }, channel=Channel.PATH)
+
+            # Swap without awaiting, so no live entry lands in the old store afterwards
+            appended = self._load_appends
+            appended_json = [e.toJSON() for e in appended]
+            for e in appended:
+                store.append(e)
+            entries_json.extend(appended_json)
+            self._loading = False
+            self._load_appends = []
+            self._path_history = store
+            self._version += 1
+            version = self._version
+            self._journal_record({"op": "reset", "entries": entries_json})
+
+            if appended:
+                await self.notify_observers({
+                    "type": "PATH_LOAD_CHUNK",
+                    "entries": appended_json,
+                    "loaded": len(entries_json),
+                    "total": max(total, len(entries_json)),
+                }, channel=Channel.PATH)
+            await self.notify_observers({
+                "type": "PATH_LOAD_END",
+                "version": version,
+                "loaded": len(entries_json),
+                "isPathModuleActive": self._is_path_module_active,
+                "isDocked": self._is_docked,
+            }, channel=Channel.PATH)
+            await self._send_feedback_summary()
+            return True
+        except BaseException:
+            # Only a failure before the swap leaves the load running; a new one may start after it
+            if self._loading:
+                # The old history is still live; the snapshot ends the load on the clients
+                self._loading = False
+                self._load_appends = []
+                await self._send_path_update()
+            raise
 
     async def set_is_path_module_active(self, value: bool) -> None:
         """
@@ -113,10 +246,7 @@ class Path(Subject):
         """
         if self._is_path_module_active != value:
             self._is_path_module_active = value
-            await self.notify_observers({ 
-                "type": "PATH_UPDATE", 
-                **self.toJSON() 
-            })
+            await self._send_path_flags()
 
     async def set_is_docked(self, value: bool) -> None:
         """
@@ -132,10 +262,7 @@ class Path(Subject):
         """
         if self._is_docked != value:
             self._is_docked = value
-            await self.notify_observers({ 
-                "type": "PATH_UPDATE", 
-                **self.toJSON() 
-            })
+            await self._send_path_flags()
 
     def set_path_controller(self, controller) -> None:
         """
@@ -165,10 +292,36 @@ class Path(Subject):
             None.
         """
         self._path_history.append(entry)
-        await self.notify_observers({ 
-            "type": "PATH_UPDATE", 
-            **self.toJSON() 
-        })
+        if self._loading:
+            self._load_appends.append(entry)
+        self._journal_record({"op": "append", "entry": entry.toJSON()})
+        await self._send_path_op({"type": "PATH_APPEND", "entry": entry.toJSON()})
+
+    async def add_log_entries(self, entries: List[PathLogEntry]) -> None:
+        """
+        Append several log entries and notify observers once.
+
+        This is used for batches of rule outputs, so a burst produces one
+        PATH_APPEND with all new entries instead of one message per entry.
+
+        Params:
+            entries: PathLogEntry items to add, in order.
+
+        Return:
+            None.
+        """
+        if not entries:
+            return
+
+        entries_json = []
+        for entry in entries:
+            self._path_history.append(entry)
+            if self._loading:
+                self._load_appends.append(entry)
+            entry_json = entry.toJSON()
+            self._journal_record({"op": "append", "entry": entry_json})
+            entries_json.append(entry_json)
+        await self._send_path_op({"type": "PATH_APPEND", "entries": entries_json})
 
     async def update_log_entry(self, index: int, entry: PathLogEntry) -> None:
         """
@@ -184,11 +337,9 @@ class Path(Subject):
             None.
         """
         if 0 <= index < len(self._path_history):
-            self._path_history[index] = entry
-            await self.notify_observers({ 
-                "type": "PATH_UPDATE", 
-                **self.toJSON() 
-            })
+            self._path_history.replace(index, entry)
+            self._journal_record({"op": "patch", "index": index, "entry": entry.toJSON()})
+            await self._send_path_op({"type": "PATH_PATCH", "index": index, "entry": entry.toJSON()})
     
     # Handles user feedback updates from the frontend, matching them to the correct PathLogEntry 
     # and updating the feedback summary.
@@ -213,44 +364,130 @@ class Path(Subject):
             return
 
         # Find the entry
-        for i, entry in enumerate(self._path_history):
-            if entry.get_id() == goal_id:
-                entry.set_user_feedback(feedback)
+        i = self._path_history.index_of(goal_id)
+        if i is None:
+            print(f"[Path] No matching goal entry found for feedback: {goal_id}")
+            return
 
-                # Update entry and notify frontend
-                await self.update_log_entry(i, entry)
-                print(f"[Path] Feedback updated for {goal_id}: {feedback}")
+        entry = self._path_history[i]
+        entry.set_user_feedback(feedback)
 
-                end_point = entry.get_goal_type()
+        # Update entry and notify frontend
+        await self.update_log_entry(i, entry)
+        print(f"[Path] Feedback updated for {goal_id}: {feedback}")
 
-                # Start point = previous entry (if exists)
-                if i > 0:
-                    prev = self._path_history[i - 1]
-                    start_point = prev.get_goal_type()
+        end_point = entry.get_goal_type()
 
-                    # Duration = difference between timestamps
-                    if prev.get_timestamp() and entry.get_timestamp():
-                        duration = (entry.get_timestamp() - prev.get_timestamp()).total_seconds()
-                    else:
-                        duration = 0
-                else:
-                    start_point = "START"
-                    duration = 0
+        # Start point = previous entry (if exists)
+        if i > 0:
+            prev = self._path_history[i - 1]
+            start_point = prev.get_goal_type()
 
-                # Notify frontend of new feedback entry
-                await self.notify_observers({
-                    "type": "FEEDBACK_ENTRY",
-                    "startPoint": start_point,
-                    "endPoint": end_point,
-                    "duration": duration,
-                    "feedback": feedback
-                })
+            # Duration = difference between timestamps
+            if prev.get_timestamp() and entry.get_timestamp():
+                duration = (entry.get_timestamp() - prev.get_timestamp()).total_seconds()
+            else:
+                duration = 0
+        else:
+            start_point = "START"
+            duration = 0
+
+        # Notify frontend of new feedback entry
+        await self.notify_observers({
+            "type": "FEEDBACK_ENTRY",
+            "startPoint": start_point,
+            "endPoint": end_point,
+            "duration": duration,
+            "feedback": feedback
+        }, channel=Channel.FEEDBACK)
+
+        # Send summary of good/bad ratios for all feedback received so far
+        await self._send_feedback_summary()
+
+    def _journal_record(self, record: Dict[str, Any]) -> None:
+        """
+        Persist one history change and compact the journal when it is due.
+
+        Params:
+            record: Journal record for the change.
+
+        Return:
+            None.
+        """
+        if self._journal is None:
+            return
+
+        self._journal.record(record)
+        if self._journal.needs_compaction():
+            self._journal.compact([e.toJSON() for e in self._path_history])
 
-                # Send summary of good/bad ratios for all feedback received so far
-                await self._send_feedback_summary()
-                return
+    async def _send_path_update(self) -> None:
+        """
+        Send the full path state to observers of the path channel.
+
+        Only used when the whole history is replaced. The payload contains
+        the whole history, so it is only built when at least one client
+        subscribed to the path channel.
 
-        print(f"[Path] No matching goal entry found for feedback: {goal_id}")
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        self._version += 1
+        if not self.has_subscribers(Channel.PATH):
+            return
+
+        await self.notify_observers(self._path_snapshot_message(), channel=Channel.PATH)
+
+    async def _send_path_flags(self) -> None:
+        """
+        Send the path module and dock flags without the history.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        await self._send_path_op({
+            "type": "PATH_FLAGS",
+            "isPathModuleActive": self._is_path_module_active,
+            "isDocked": self._is_docked,
+        })
+
+    async def _send_path_op(self, op: Dict[str, Any]) -> None:
+        """
+        Send one incremental path operation with the next stream version.
+
+        Params:
+            op: PATH_APPEND, PATH_PATCH or PATH_FLAGS payload without version.
+
+        Return:
+            None.
+        """
+        self._version += 1
+        if not self.has_subscribers(Channel.PATH):
+            return
+
+        await self.notify_observers({**op, "version": self._version}, channel=Channel.PATH)
+
+    def _path_snapshot_message(self) -> Dict[str, Any]:
+        """
+        Build the PATH_UPDATE snapshot at the current version.
+
+        Params:
+            None.
+
+        Return:
+            PATH_UPDATE payload with the full path state.
+        """
+        return {
+            "type": "PATH_UPDATE",
+            "version": self._version,
+            **self.toJSON()
+        }
 
     async def _send_feedback_summary(self):
         """
@@ -264,20 +501,61 @@ class Path(Subject):
         Return:
             None.
         """
+        if not self.has_subscribers(Channel.FEEDBACK):
+            return
+
+        await self.notify_observers(self._feedback_summary_message(), channel=Channel.FEEDBACK)
+
+    def _feedback_summary_message(self) -> Dict[str, Any]:
+        """
+        Build the FEEDBACK_SUMMARY message with good/bad ratios.
+
+        The counts come from the running counters of the history store, so
+        the cost does not depend on the history length.
+
+        Params:
+            None.
+
+        Return:
+            FEEDBACK_SUMMARY payload.
+        """
+        counts = self._path_history.get_feedback_counts()
         total = len(self._path_history)
-        if total == 0:
-            good_ratio = bad_ratio = 0
-        else:
-            good = sum(1 for e in self._path_history if e.get_user_feedback() == "good")
-            bad = sum(1 for e in self._path_history if e.get_user_feedback() == "bad")
-            good_ratio = good / total
-            bad_ratio = bad / total
+        good = counts[PathHistoryStore.GOOD]
+        bad = counts[PathHistoryStore.BAD]
 
-        await self.notify_observers({
+        return {
             "type": "FEEDBACK_SUMMARY",
-            "goodRatio": good_ratio,
-            "badRatio": bad_ratio
-        })
+            "goodRatio": good / total if total else 0,
+            "badRatio": bad / total if total else 0,
+            "goodCount": good,
+            "badCount": bad,
+            "unratedCount": counts[PathHistoryStore.UNRATED],
+            "total": total,
+            "byGoalType": self._path_history.get_feedback_counts_by_goal_type()
+        }
+
+    async def send_snapshot(self, observer, channels=None) -> None:
+        """
+        Send the current path state and feedback summary to one observer.
+
+        New clients get the full history once, addressed only to them, so a
+        connection storm does not re-send the history to everyone.
+
+        Params:
+            observer: Observer that should receive the snapshot.
+            channels: Optional set of channels to limit the snapshot to.
+
+        Return:
+            None.
+        """
+        def wants(channel):
+            return observer.is_subscribed(channel) and (channels is None or channel in channels)
+
+        if wants(Channel.PATH):
+            await self.notify_observer(observer, self._path_snapshot_message())
+        if wants(Channel.FEEDBACK):
+            await self.notify_observer(observer, self._feedback_summary_message())
 
     def toJSON(self) -> Dict[str, Any]:
         """
@@ -292,21 +570,10 @@ class Path(Subject):
         Return:
             Dictionary containing path module state and history.
         """
-        print()
         return {
             "isPathModuleActive": self._is_path_module_active,
             "isDocked": self._is_docked,
-            "pathHistory": [
-                {
-                    "label": e.get_label(),
-                    "id": e.get_id(),
-                    "goalType": e.get_goal_type(),
-                    "timestamp": e.get_timestamp().isoformat() if e.get_timestamp() else None,
-                    "fuzzyOutput": e.get_fuzzy_output(),
-                    "userFeedback": e.get_user_feedback(),
-                }
-                for e in self._path_history
-            ],
+            "pathHistory": [e.toJSON() for e in self._path_history],
         }
 
     async def fromJSON(self, msg: Dict[str, Any]) -> None:
@@ -330,10 +597,7 @@ class Path(Subject):
 
         if self._is_path_module_active != new_path_active:
             self._is_path_module_active = new_path_active
-            await self.notify_observers({ 
-                "type": "PATH_UPDATE", 
-                **self.toJSON() 
-            })
+            await self._send_path_flags()
             
             # If changing from True to False, cancel navigation
             if old_path_active == True and new_path_active == False:
@@ -348,10 +612,7 @@ class Path(Subject):
 
             if old_dock_status != new_dock_status:
                 self._is_docked = new_dock_status
-                await self.notify_observers({ 
-                    "type": "PATH_UPDATE", 
-                    **self.toJSON() 
-                })
+                await self._send_path_flags()
 
                 # Trigger dock/undock command based on state change
                 if self._path_controller is not None:
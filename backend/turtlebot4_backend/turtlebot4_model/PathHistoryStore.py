@@ -0,0 +1,558 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+from turtlebot4_backend.turtlebot4_model.RuleAggregates import RuleAggregates
+from turtlebot4_backend.turtlebot4_model.SegmentStats import SegmentStats
+
+
+class PathHistoryStore:
+    """
+    Ordered path history with indexes by goal id, goal type and time.
+
+    Entries keep their insertion order (their position is what the frontend
+    patches), while the indexes let feedback and filtered queries find
+    entries without scanning the whole history. Feedback counts are kept up
+    to date on every change so summaries never recount the history, and so
+    are the per-rule aggregates (see RuleAggregates). Travel times between
+    consecutive goals feed the per-transition SegmentStats as they arrive.
+    """
+
+    # Width of one time bucket of the timestamp index.
+    BUCKET_SECONDS = 60
+
+    # Feedback categories used by the running counters.
+    GOOD = "good"
+    BAD = "bad"
+    UNRATED = "unrated"
+
+    def __init__(self, entries: Optional[Iterable[PathLogEntry]] = None) -> None:
+        """
+        Initialize the store, optionally with existing entries.
+
+        Params:
+            entries: Initial entries in history order.
+
+        Return:
+            None.
+        """
+        self._entries: List[PathLogEntry] = []
+        self._index_by_id: Dict[str, int] = {}  # Goal id -> position of its first entry.
+        self._by_goal_type: Dict[str, List[int]] = {}  # Goal type -> sorted positions.
+        self._by_bucket: Dict[int, List[int]] = {}  # Time bucket -> sorted positions.
+        self._bucket_keys: List[int] = []  # Sorted keys of _by_bucket.
+        # (goal type, feedback category) each position is currently counted under.
+        # Entries are mutated in place, so the old values must be remembered here.
+        self._counted: List[Tuple[str, str]] = []
+        self._feedback_counts: Dict[str, int] = self._empty_counts()
+        self._feedback_by_goal_type: Dict[str, Dict[str, int]] = {}
+        self._by_feedback: Dict[str, List[int]] = {}  # Feedback category -> sorted positions.
+        # (rule, timestamp) each position is currently aggregated under.
+        self._rule_keys: List[Tuple[str, Optional[datetime]]] = []
+        self._rules = RuleAggregates()
+        self._segments = SegmentStats()
+        if entries:
+            self.reset(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[PathLogEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> PathLogEntry:
+        return self._entries[index]
+
+    def get_entries(self) -> List[PathLogEntry]:
+        """
+        Return the entries in history order.
+
+        The list is the store's own list and must be treated as read-only;
+        changes have to go through append, replace or reset so the indexes
+        stay valid.
+
+        Params:
+            None.
+
+        Return:
+            List of PathLogEntry items.
+        """
+        return self._entries
+
+    def append(self, entry: PathLogEntry) -> int:
+        """
+        Add an entry at the end of the history.
+
+        Params:
+            entry: Entry to add.
+
+        Return:
+            Position of the new entry.
+        """
+        index = len(self._entries)
+        self._entries.append(entry)
+        self._add_to_indexes(index, entry)
+        counted = (entry.get_goal_type(), self.feedback_category(entry.get_user_feedback()))
+        self._counted.append(counted)
+        self._tally(counted, 1)
+        self._by_feedback.setdefault(counted[1], []).append(index)
+
+        rule_key = (entry.get_fuzzy_output(), entry.get_timestamp())
+        self._rule_keys.append(rule_key)
+        self._rules.tally(rule_key[0], counted[1], 1)
+        if index > 0:
+            self._segment(index - 1, 1)
+            seconds = self._seconds_between(self._rule_keys[index - 1][1], rule_key[1])
+            if seconds is not None:
+                self._segments.record(self._counted[index - 1][0], counted[0], seconds)
+        return index
+
+    def replace(self, index: int, entry: PathLogEntry) -> None:
+        """
+        Replace the entry at a position and update the indexes.
+
+        Also call this after changing an entry in place (e.g. its feedback)
+        so the feedback counters follow the change.
+
+        Params:
+            index: Position of the entry to replace.
+            entry: New entry for that position.
+
+        Return:
+            None.
+        """
+        old = self._entries[index]
+        self._entries[index] = entry
+
+        counted = (entry.get_goal_type(), self.feedback_category(entry.get_user_feedback()))
+        self._update_rule(index, (entry.get_fuzzy_output(), entry.get_timestamp()), counted[1])
+        if counted != self._counted[index]:
+            old_category = self._counted[index][1]
+            self._tally(self._counted[index], -1)
+            self._tally(counted, 1)
+            self._counted[index] = counted
+            if old_category != counted[1]:
+                self._discard(self._by_feedback, old_category, index)
+                insort(self._by_feedback.setdefault(counted[1], []), index)
+
+        if old is entry or self._index_keys(old) == self._index_keys(entry):
+            return
+        self._remove_from_indexes(index, old)
+        self._add_to_indexes(index, entry)
+
+    def reset(self, entries: Iterable[PathLogEntry]) -> None:
+        """
+        Replace the whole history and rebuild the indexes.
+
+        Params:
+            entries: New entries in history order.
+
+        Return:
+            None.
+        """
+        self._entries = []
+        self._index_by_id = {}
+        self._by_goal_type = {}
+        self._by_bucket = {}
+        self._bucket_keys = []
+        self._counted = []
+        self._feedback_counts = self._empty_counts()
+        self._feedback_by_goal_type = {}
+        self._by_feedback = {}
+        self._rule_keys = []
+        self._rules = RuleAggregates()
+        self._segments = SegmentStats()
+        for entry in entries:
+            self.append(entry)
+
+    def get_rule_aggregates(self) -> RuleAggregates:
+        """
+        Return the per-rule feedback and timing aggregates.
+
+        Params:
+            None.
+
+        Return:
+            RuleAggregates kept up to date by this store.
+        """
+        return self._rules
+
+    def get_segment_stats(self) -> SegmentStats:
+        """
+        Return the travel-time statistics per goal-type transition.
+
+        Params:
+            None.
+
+        Return:
+            SegmentStats fed by this store.
+        """
+        return self._segments
+
+    def index_of(self, goal_id: str) -> Optional[int]:
+        """
+        Return the position of the first entry with a goal id.
+
+        Params:
+            goal_id: Goal id to look up.
+
+        Return:
+            Position of the entry, or None if no entry has the id.
+        """
+        return self._index_by_id.get(goal_id)
+
+    def get(self, goal_id: str) -> Optional[PathLogEntry]:
+        """
+        Return the first entry with a goal id.
+
+        Params:
+            goal_id: Goal id to look up.
+
+        Return:
+            Matching entry, or None.
+        """
+        index = self._index_by_id.get(goal_id)
+        return self._entries[index] if index is not None else None
+
+    def get_feedback_counts(self) -> Dict[str, int]:
+        """
+        Return the number of good, bad and unrated entries.
+
+        Params:
+            None.
+
+        Return:
+            Dict with "good", "bad" and "unrated" counts.
+        """
+        return dict(self._feedback_counts)
+
+    def get_feedback_counts_by_goal_type(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return the feedback counts broken down by goal type.
+
+        Params:
+            None.
+
+        Return:
+            Dict of goal type -> dict with "good", "bad" and "unrated" counts.
+        """
+        return {goal_type: dict(counts) for goal_type, counts in self._feedback_by_goal_type.items()}
+
+    @classmethod
+    def feedback_category(cls, feedback: Optional[str]) -> str:
+        """
+        Map a feedback value to the category it is counted under.
+
+        Params:
+            feedback: User feedback of an entry.
+
+        Return:
+            GOOD, BAD or UNRATED.
+        """
+        if isinstance(feedback, str):
+            value = feedback.lower()
+            if value == cls.GOOD or value == cls.BAD:
+                return value
+        return cls.UNRATED
+
+    def query(
+        self,
+        goal_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        feedback: Optional[str] = None,
+    ) -> Sequence[int]:
+        """
+        Return the positions of entries matching all given filters.
+
+        The smallest matching index (goal type, feedback category or time
+        buckets) provides the candidates and the other filters are checked
+        on those entries only, so the cost depends on the number of
+        candidates rather than on the history length.
+
+        Params:
+            goal_type: Only entries with this goal type.
+            start: Only entries at or after this time.
+            end: Only entries at or before this time.
+            feedback: Only entries in this feedback category (good, bad, unrated).
+
+        Return:
+            Sorted sequence of matching positions.
+        """
+        # Entries carry naive local times; compare bounds with an offset in local time too
+        start = self._naive_local(start)
+        end = self._naive_local(end)
+        by_time = start is not None or end is not None
+        candidates: List[Sequence[int]] = []
+        if goal_type is not None:
+            candidates.append(self._by_goal_type.get(goal_type, []))
+        if feedback is not None:
+            candidates.append(self._by_feedback.get(self.feedback_category(feedback), []))
+
+        if not candidates:
+            if by_time:
+                return self._positions_in_range(start, end)
+            return range(len(self._entries))
+
+        positions = min(candidates, key=len)
+        category = self.feedback_category(feedback) if feedback is not None else None
+        return [
+            i for i in positions
+            if (goal_type is None or self._counted[i][0] == goal_type)
+            and (category is None or self._counted[i][1] == category)
+            and (not by_time or self._in_range(self._entries[i], start, end))
+        ]
+
+    def page(
+        self,
+        positions: Sequence[int],
+        cursor: Optional[int] = None,
+        limit: int = 50,
+        descending: bool = False,
+        rule: Optional[str] = None,
+    ) -> Tuple[List[Tuple[int, PathLogEntry]], Optional[int]]:
+        """
+        Return one page of entries from a sorted sequence of positions.
+
+        The cursor is the position of the last entry of the previous page;
+        the page starts right after it (or right before it when descending).
+        Rule text is matched case-insensitively while the page is filled, so
+        only as many entries are checked as needed.
+
+        Params:
+            positions: Sorted positions, e.g. from query.
+            cursor: Position of the last entry already returned, or None.
+            limit: Maximum number of entries in the page.
+            descending: True to page from the newest entry backwards.
+            rule: Only entries whose rule output contains this text.
+
+        Return:
+            Tuple of ([(position, entry), ...], next cursor or None).
+        """
+        if descending:
+            stop = bisect_left(positions, cursor) if cursor is not None else len(positions)
+            order = range(stop - 1, -1, -1)
+        else:
+            begin = bisect_right(positions, cursor) if cursor is not None else 0
+            order = range(begin, len(positions))
+
+        needle = rule.lower() if rule else None
+        items: List[Tuple[int, PathLogEntry]] = []
+        for k in order:
+            entry = self._entries[positions[k]]
+            if needle and needle not in (entry.get_fuzzy_output() or "").lower():
+                continue
+            if len(items) == limit:
+                return items, items[-1][0]
+            items.append((positions[k], entry))
+        return items, None
+
+    def _positions_in_range(self, start: Optional[datetime], end: Optional[datetime]) -> List[int]:
+        """
+        Collect positions of entries whose timestamp is within a range.
+
+        Params:
+            start: Inclusive lower bound, or None.
+            end: Inclusive upper bound, or None.
+
+        Return:
+            Sorted list of positions.
+        """
+        lo = bisect_left(self._bucket_keys, self._bucket(start)) if start else 0
+        hi = bisect_right(self._bucket_keys, self._bucket(end)) if end else len(self._bucket_keys)
+
+        positions: List[int] = []
+        for key in self._bucket_keys[lo:hi]:
+            positions.extend(i for i in self._by_bucket[key]
+                             if self._in_range(self._entries[i], start, end))
+        positions.sort()
+        return positions
+
+    @classmethod
+    def _empty_counts(cls) -> Dict[str, int]:
+        return {cls.GOOD: 0, cls.BAD: 0, cls.UNRATED: 0}
+
+    def _tally(self, counted: Tuple[str, str], delta: int) -> None:
+        """
+        Add to or subtract from the feedback counters.
+
+        Params:
+            counted: (goal type, feedback category) of one entry.
+            delta: 1 to count the entry, -1 to remove it.
+
+        Return:
+            None.
+        """
+        goal_type, category = counted
+        self._feedback_counts[category] += delta
+        by_type = self._feedback_by_goal_type.setdefault(goal_type, self._empty_counts())
+        by_type[category] += delta
+        if not any(by_type.values()):
+            del self._feedback_by_goal_type[goal_type]
+
+    def _update_rule(self, index: int, rule_key: Tuple[str, Optional[datetime]], category: str) -> None:
+        """
+        Move a replaced entry to its new rule, timestamp and feedback category.
+
+        The segments on both sides of the entry depend on its timestamp and
+        the segment after it belongs to its rule, so they are re-measured
+        when either changes.
+
+        Params:
+            index: Position of the replaced entry.
+            rule_key: New (rule, timestamp) of the entry.
+            category: New feedback category of the entry.
+
+        Return:
+            None.
+        """
+        old_key = self._rule_keys[index]
+        old_category = self._counted[index][1]
+        if rule_key == old_key and category == old_category:
+            return
+
+        segments = [i for i in (index - 1, index) if i >= 0 and i + 1 < len(self._rule_keys)]
+        if rule_key != old_key:
+            for i in segments:
+                self._segment(i, -1)
+        # Add before removing so a rule with one entry keeps its durations.
+        self._rules.tally(rule_key[0], category, 1)
+        self._rules.tally(old_key[0], old_category, -1)
+        self._rule_keys[index] = rule_key
+        if rule_key != old_key:
+            for i in segments:
+                self._segment(i, 1)
+
+    def _segment(self, index: int, sign: int) -> None:
+        """
+        Add or remove the duration from one entry to the next.
+
+        The duration counts for the rule of the first entry.
+
+        Params:
+            index: Position of the segment's first entry.
+            sign: 1 to add the duration, -1 to remove it.
+
+        Return:
+            None.
+        """
+        rule, start = self._rule_keys[index]
+        seconds = self._seconds_between(start, self._rule_keys[index + 1][1])
+        if seconds is not None:
+            self._rules.add_duration(rule, seconds, sign)
+
+    @staticmethod
+    def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+        """
+        Return the length of a segment, or None if it cannot be measured.
+
+        Segments with a missing timestamp, mixed naive and aware timestamps
+        or a negative length are not measured.
+
+        Params:
+            start: Timestamp of the first entry.
+            end: Timestamp of the next entry.
+
+        Return:
+            Duration in seconds, or None.
+        """
+        if start is None or end is None or (start.tzinfo is None) != (end.tzinfo is None):
+            return None
+        seconds = (end - start).total_seconds()
+        return seconds if seconds >= 0 else None
+
+    @staticmethod
+    def _in_range(entry: PathLogEntry, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        ts = PathHistoryStore._naive_local(entry.get_timestamp())
+        if ts is None:
+            return False
+        return (start is None or ts >= start) and (end is None or ts <= end)
+
+    @staticmethod
+    def _naive_local(ts: Optional[datetime]) -> Optional[datetime]:
+        """
+        Convert an aware datetime to naive local time; naive ones and None pass through.
+
+        Params:
+            ts: Datetime or None.
+
+        Return:
+            Naive datetime in local time, or None.
+        """
+        if ts is None or ts.tzinfo is None:
+            return ts
+        return ts.astimezone().replace(tzinfo=None)
+
+    @classmethod
+    def _bucket(cls, ts: datetime) -> int:
+        return int(ts.timestamp() // cls.BUCKET_SECONDS)
+
+    @staticmethod
+    def _index_keys(entry: PathLogEntry):
+        return entry.get_id(), entry.get_goal_type(), entry.get_timestamp()
+
+    def _add_to_indexes(self, index: int, entry: PathLogEntry) -> None:
+        """
+        Register an entry position in every index.
+
+        Params:
+            index: Position of the entry.
+            entry: Entry to register.
+
+        Return:
+            None.
+        """
+        goal_id = entry.get_id()
+        current = self._index_by_id.get(goal_id)
+        if current is None or index < current:
+            self._index_by_id[goal_id] = index
+
+        insort(self._by_goal_type.setdefault(entry.get_goal_type(), []), index)
+
+        ts = entry.get_timestamp()
+        if ts is not None:
+            key = self._bucket(ts)
+            if key not in self._by_bucket:
+                insort(self._bucket_keys, key)
+                self._by_bucket[key] = []
+            insort(self._by_bucket[key], index)
+
+    def _remove_from_indexes(self, index: int, entry: PathLogEntry) -> None:
+        """
+        Remove an entry position from every index.
+
+        Params:
+            index: Position of the entry.
+            entry: Entry that was stored at the position.
+
+        Return:
+            None.
+        """
+        goal_id = entry.get_id()
+        if self._index_by_id.get(goal_id) == index:
+            del self._index_by_id[goal_id]
+            # Another entry may share the id; fall back to it.
+            for i, other in enumerate(self._entries):
+                if i != index and other.get_id() == goal_id:
+                    self._index_by_id[goal_id] = i
+                    break
+
+        self._discard(self._by_goal_type, entry.get_goal_type(), index)
+
+        ts = entry.get_timestamp()
+        if ts is not None:
+            key = self._bucket(ts)
+            self._discard(self._by_bucket, key, index)
+            if key not in self._by_bucket:
+                del self._bucket_keys[bisect_left(self._bucket_keys, key)]
+
+    @staticmethod
+    def _discard(index_map: Dict, key, position: int) -> None:
+        positions = index_map.get(key)
+        if not positions:
+            return
+        i = bisect_left(positions, position)
+        if i < len(positions) and positions[i] == position:
+            del positions[i]
+        if not positions:
+            del index_map[key]
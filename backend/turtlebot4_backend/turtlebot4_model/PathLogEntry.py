@@ -1,5 +1,6 @@
+import sys
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 class PathLogEntry:
     """
@@ -7,7 +8,13 @@ class PathLogEntry:
 
     This stores goal metadata and feedback so the UI can display the
     navigation timeline and user assessments.
+
+    Histories stay in memory for the whole process lifetime, so entries use
+    __slots__ (no per-instance __dict__) and the frequently repeated strings
+    (label, goal type, rule output, feedback) are interned and shared.
     """
+    __slots__ = ("_label", "_id", "_goal_type", "_timestamp", "_fuzzy_output", "_user_feedback")
+
     def __init__(
         self,
         label: str = "",
@@ -34,12 +41,12 @@ class PathLogEntry:
         Return:
             None.
         """
-        self._label = label
+        self._label = _intern(label)
         self._id = id
-        self._goal_type = goal_type
+        self._goal_type = _intern(goal_type)
         self._timestamp = timestamp  # remains None if not provided
-        self._fuzzy_output = fuzzy_output
-        self._user_feedback = user_feedback
+        self._fuzzy_output = _intern(fuzzy_output)
+        self._user_feedback = _intern(user_feedback)
 
     # Getters
     def get_label(self) -> str:
@@ -139,7 +146,7 @@ class PathLogEntry:
         Return:
             None.
         """
-        self._label = value
+        self._label = _intern(value)
 
     def set_id(self, value: str) -> None:
         """
@@ -167,7 +174,7 @@ class PathLogEntry:
         Return:
             None.
         """
-        self._goal_type = value
+        self._goal_type = _intern(value)
 
     def set_timestamp(self, value: Optional[datetime]) -> None:
         """
@@ -195,7 +202,7 @@ class PathLogEntry:
         Return:
             None.
         """
-        self._fuzzy_output = value
+        self._fuzzy_output = _intern(value)
 
     def set_user_feedback(self, value: str) -> None:
         """
@@ -209,4 +216,63 @@ class PathLogEntry:
         Return:
             None.
         """
-        self._user_feedback = value
+        self._user_feedback = _intern(value)
+
+    @classmethod
+    def fromJSON(cls, data: Dict[str, Any]) -> "PathLogEntry":
+        """
+        Create an entry from its JSON representation.
+
+        This is the inverse of toJSON and is used when restoring saved or
+        journaled histories.
+
+        Params:
+            data: Dictionary with the entry fields in frontend naming.
+
+        Return:
+            New PathLogEntry.
+        """
+        ts = data.get("timestamp")
+        return cls(
+            label=data.get("label", ""),
+            id=data.get("id", ""),
+            goal_type=data.get("goalType", ""),
+            timestamp=datetime.fromisoformat(ts) if ts else None,
+            fuzzy_output=data.get("fuzzyOutput", ""),
+            user_feedback=data.get("userFeedback", ""),
+        )
+
+    def toJSON(self) -> Dict[str, Any]:
+        """
+        Convert this entry into a JSON-serializable structure.
+
+        This is the single wire format for an entry, shared by full path
+        snapshots and incremental path operations.
+
+        Params:
+            None.
+
+        Return:
+            Dictionary with the entry fields in frontend naming.
+        """
+        return {
+            "label": self._label,
+            "id": self._id,
+            "goalType": self._goal_type,
+            "timestamp": self._timestamp.isoformat() if self._timestamp else None,
+            "fuzzyOutput": self._fuzzy_output,
+            "userFeedback": self._user_feedback,
+        }
+
+
+def _intern(value):
+    """
+    Intern a string so equal values share one object.
+
+    Params:
+        value: String to intern; other values are returned unchanged.
+
+    Return:
+        Interned string or the original value.
+    """
+    return sys.intern(value) if type(value) is str else value
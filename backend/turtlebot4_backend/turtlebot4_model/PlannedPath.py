@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
+from turtlebot4_backend.turtlebot4_model.Subject import Subject
+from turtlebot4_backend.turtlebot4_utils.Polyline import Point, splice_diff, sleeve_simplify
+
+
+class _ClientPlan:
+    """What one client last received and when."""
+
+    __slots__ = ("points", "version", "sent_at", "timer")
+
+    def __init__(self) -> None:
+        self.points: List[Point] = []
+        self.version = 0
+        self.sent_at = float("-inf")
+        self.timer: Optional[asyncio.TimerHandle] = None  # Pending delayed send, if any.
+
+
+class PlannedPath(Subject):
+    """
+    Planner path (nav_msgs/Path) simplified for display and sent as deltas.
+
+    Every plan is simplified and rounded, then each client gets the
+    difference between the plan it has and the current one as a single
+    splice. Clients are rate-limited independently: a plan that arrives
+    too soon after the last send is held back, and only the latest plan
+    is sent when the interval has passed, so a slow client never queues
+    stale plans and fast replanning does not flood the websocket.
+    """
+
+    # Maximum distance in meters between a planner pose and the displayed path.
+    DEFAULT_TOLERANCE = 0.05
+    # Coordinates are rounded to this many decimals (1 cm).
+    PRECISION = 2
+    # Minimum seconds between two plan messages to the same client.
+    DEFAULT_MIN_INTERVAL = 0.5
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize an empty plan.
+
+        Params:
+            tolerance: Simplification tolerance in meters.
+            min_interval: Minimum seconds between two sends to one client.
+            clock: Monotonic time source, injectable for tests.
+
+        Return:
+            None.
+        """
+        super().__init__()
+        self._tolerance = tolerance
+        self._min_interval = min_interval
+        self._clock = clock
+        self._points: List[Point] = []
+        self._version = 0
+        self._clients: Dict[Any, _ClientPlan] = {}
+
+    def get_points(self) -> List[Point]:
+        """
+        Return the current simplified plan.
+
+        Params:
+            None.
+
+        Return:
+            List of (x, y) points from the robot to the goal.
+        """
+        return list(self._points)
+
+    def get_version(self) -> int:
+        """
+        Return the version of the current plan.
+
+        Params:
+            None.
+
+        Return:
+            Version, increased on every change.
+        """
+        return self._version
+
+    def simplify(self, poses: Sequence[Point]) -> List[Point]:
+        """
+        Simplify and round planner poses for display.
+
+        Simplification runs from the goal backwards, so a replanned path
+        that only differs near the robot keeps the same vertices near the
+        goal and the deltas stay small. Safe to call from any thread.
+
+        Params:
+            poses: Planner poses (x, y) from the robot to the goal.
+
+        Return:
+            Simplified (x, y) points in the same order.
+        """
+        reverse = list(reversed(poses))
+        kept = sleeve_simplify(reverse, self._tolerance)
+        digits = self.PRECISION
+        return [(round(reverse[i][0], digits), round(reverse[i][1], digits)) for i in reversed(kept)]
+
+    async def set_plan(self, points: Sequence[Point]) -> None:
+        """
+        Replace the plan with already simplified points and update clients.
+
+        Params:
+            points: Output of simplify.
+
+        Return:
+            None.
+        """
+        points = list(points)
+        if points == self._points:
+            return
+
+        self._points = points
+        self._version += 1
+        for observer in list(self._observers):
+            if observer.is_subscribed(Channel.PLAN):
+                await self._send_to(observer)
+
+    def detach(self, o) -> None:
+        """
+        Remove an observer and cancel its delayed plan send.
+
+        Params:
+            o: Observer instance to detach.
+
+        Return:
+            None.
+        """
+        super().detach(o)
+        client = self._clients.pop(o, None)
+        if client and client.timer:
+            client.timer.cancel()
+
+    async def send_snapshot(self, observer, channels=None) -> None:
+        """
+        Send the whole current plan to one observer.
+
+        Params:
+            observer: Observer that should receive the snapshot.
+            channels: Optional set of channels to limit the snapshot to.
+
+        Return:
+            None.
+        """
+        if not observer.is_subscribed(Channel.PLAN) or (channels is not None and Channel.PLAN not in channels):
+            return
+
+        client = self._clients.setdefault(observer, _ClientPlan())
+        client.points = list(self._points)
+        client.version = self._version
+        client.sent_at = self._clock()
+        await self.notify_observer(observer, {
+            "type": "PLAN_UPDATE",
+            "op": "reset",
+            "version": self._version,
+            "points": [list(p) for p in self._points]
+        })
+
+    async def _send_to(self, observer) -> None:
+        """
+        Send the plan delta to one observer, or delay it until its interval passed.
+
+        Params:
+            observer: Observer that should receive the plan.
+
+        Return:
+            None.
+        """
+        client = self._clients.setdefault(observer, _ClientPlan())
+        if client.version == self._version:
+            return
+
+        wait = client.sent_at + self._min_interval - self._clock()
+        if wait > 0:
+            # One delayed send per client; it picks up whatever plan is latest by then
+            if client.timer is None:
+                loop = asyncio.get_running_loop()
+                client.timer = loop.call_later(wait, lambda: loop.create_task(self._flush(observer)))
+            return
+
+        start, delete_count, inserted = splice_diff(client.points, self._points)
+        message = {
+            "type": "PLAN_UPDATE",
+            "op": "splice",
+            "baseVersion": client.version,
+            "version": self._version,
+            "start": start,
+            "deleteCount": delete_count,
+            "points": [list(p) for p in inserted]
+        }
+        # Update before awaiting, so a concurrent send diffs against this plan
+        client.points = list(self._points)
+        client.version = self._version
+        client.sent_at = self._clock()
+        await self.notify_observer(observer, message, channel=Channel.PLAN)
+
+    async def _flush(self, observer) -> None:
+        """
+        Send a delayed plan update once the client's interval passed.
+
+        Params:
+            observer: Observer whose delayed send is due.
+
+        Return:
+            None.
+        """
+        client = self._clients.get(observer)
+        if client is None:
+            return
+        client.timer = None
+        await self._send_to(observer)
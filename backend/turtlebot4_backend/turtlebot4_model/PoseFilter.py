@@ -0,0 +1,244 @@
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class PoseFilter:
+    """
+    Dead-band filter that decides which robot poses are worth publishing.
+
+    /odom arrives at full rate even when the robot is parked, so the filter
+    only lets a pose through when it moved or turned past a threshold, with a
+    heartbeat so idle clients still see a fresh pose now and then. While
+    moving, output is capped at a maximum rate, so the publish rate follows
+    actual motion instead of the odometry rate.
+
+    A moving pose dropped by the rate cap is held. If no later pose replaces
+    it, for example because the robot stopped right after it, the caller
+    publishes it through release_held once the interval has passed, so
+    clients do not keep showing an older position.
+    """
+
+    # Default thresholds, chosen to be below what the map view can display.
+    DEFAULT_TRANSLATION_THRESHOLD = 0.02  # meters
+    DEFAULT_YAW_THRESHOLD = 0.035  # radians (~2 degrees)
+    DEFAULT_HEARTBEAT_INTERVAL = 2.0  # seconds between publishes when idle
+    DEFAULT_MIN_INTERVAL = 0.05  # seconds between publishes when moving (20 Hz)
+
+    def __init__(
+        self,
+        translation_threshold: float = DEFAULT_TRANSLATION_THRESHOLD,
+        yaw_threshold: float = DEFAULT_YAW_THRESHOLD,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize thresholds and the last published pose.
+
+        Params:
+            translation_threshold: Minimum travelled distance in meters.
+            yaw_threshold: Minimum heading change in radians.
+            heartbeat_interval: Seconds after which a pose is sent regardless.
+            min_interval: Minimum seconds between two published poses.
+            clock: Monotonic time source, injectable for tests.
+
+        Return:
+            None.
+        """
+        self._translation_threshold = translation_threshold
+        self._yaw_threshold = yaw_threshold
+        self._heartbeat_interval = heartbeat_interval
+        self._min_interval = min_interval
+        self._clock = clock
+
+        # ROS callbacks from several rosbridge connections may call in concurrently.
+        self._lock = threading.Lock()
+        self._last_x: Optional[float] = None
+        self._last_y: Optional[float] = None
+        self._last_yaw: Optional[float] = None
+        self._last_time: float = 0.0
+        self._held: Optional[Dict[str, Any]] = None  # Last moving pose dropped by the rate cap.
+        self._hold_timer = False  # Whether a caller was asked to call release_held.
+
+        self._accepted = 0
+        self._dropped = 0
+
+    @staticmethod
+    def yaw_from_quaternion(orientation: Dict[str, Any]) -> float:
+        """
+        Extract the heading (rotation around z) from a quaternion dict.
+
+        Params:
+            orientation: Mapping with x, y, z, w quaternion components.
+
+        Return:
+            Yaw angle in radians.
+        """
+        x = orientation.get("x", 0.0)
+        y = orientation.get("y", 0.0)
+        z = orientation.get("z", 0.0)
+        w = orientation.get("w", 1.0)
+        return math.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+
+    def should_publish(self, pose: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Decide whether a pose should be forwarded to observers.
+
+        Params:
+            pose: Pose dict with "position" and "orientation" mappings.
+            now: Optional timestamp from the filter clock.
+
+        Return:
+            True if the pose should be published, otherwise False.
+        """
+        now = self._clock() if now is None else now
+        x, y, yaw = self._coordinates(pose)
+
+        with self._lock:
+            elapsed = now - self._last_time
+            if self._last_x is None:
+                publish = True
+            elif elapsed >= self._heartbeat_interval:
+                publish = True
+            elif elapsed < self._min_interval:
+                publish = False
+                # Only a pose outside the dead-band is worth publishing later
+                self._held = pose if self._moved(x, y, yaw) else None
+            else:
+                publish = self._moved(x, y, yaw)
+                self._held = None
+
+            if publish:
+                self._accept(x, y, yaw, now)
+            else:
+                self._dropped += 1
+
+        return publish
+
+    def take_hold_timer(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Return when release_held should be called for the held pose.
+
+        Only one caller is told per held pose, until release_held runs, so
+        several pose producers do not each start a timer.
+
+        Params:
+            now: Optional timestamp from the filter clock.
+
+        Return:
+            Seconds until the held pose is due, or None if there is nothing
+            to schedule.
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            if self._held is None or self._hold_timer:
+                return None
+            self._hold_timer = True
+            return max(0.0, self._last_time + self._min_interval - now)
+
+    def release_held(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Publish the held pose if the minimum interval has passed.
+
+        Params:
+            now: Optional timestamp from the filter clock.
+
+        Return:
+            The held pose, now counted as published, or None if nothing is
+            held or it is not due yet (take_hold_timer then returns the
+            remaining delay).
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            self._hold_timer = False
+            pose = self._held
+            if pose is None or now - self._last_time < self._min_interval:
+                return None
+            self._held = None
+            self._accept(*self._coordinates(pose), now)
+        return pose
+
+    def _moved(self, x: float, y: float, yaw: float) -> bool:
+        """
+        Return whether a pose left the dead-band around the last published one. Caller holds the lock.
+
+        Params:
+            x: Position x in meters.
+            y: Position y in meters.
+            yaw: Heading in radians.
+
+        Return:
+            True if it moved or turned past a threshold.
+        """
+        moved = math.hypot(x - self._last_x, y - self._last_y) >= self._translation_threshold
+        # Wrap the heading difference into [-pi, pi] before comparing.
+        turn = math.atan2(math.sin(yaw - self._last_yaw), math.cos(yaw - self._last_yaw))
+        return moved or abs(turn) >= self._yaw_threshold
+
+    def _accept(self, x: float, y: float, yaw: float, now: float) -> None:
+        """
+        Record a published pose. Caller holds the lock.
+
+        Params:
+            x: Position x in meters.
+            y: Position y in meters.
+            yaw: Heading in radians.
+            now: Timestamp from the filter clock.
+
+        Return:
+            None.
+        """
+        self._last_x, self._last_y, self._last_yaw = x, y, yaw
+        self._last_time = now
+        self._held = None
+        self._accepted += 1
+
+    @classmethod
+    def _coordinates(cls, pose: Dict[str, Any]) -> Tuple[float, float, float]:
+        """
+        Extract the position and heading the filter compares.
+
+        Params:
+            pose: Pose dict with "position" and "orientation" mappings.
+
+        Return:
+            Tuple of x, y and yaw.
+        """
+        pos = pose.get("position", {})
+        return pos.get("x", 0.0), pos.get("y", 0.0), cls.yaw_from_quaternion(pose.get("orientation", {}))
+
+    def reset(self) -> None:
+        """
+        Forget the last published pose so the next one always passes.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        with self._lock:
+            self._last_x = self._last_y = self._last_yaw = None
+            self._last_time = 0.0
+            self._held = None
+
+    def toJSON(self) -> Dict[str, Any]:
+        """
+        Return the filter configuration and counters.
+
+        Params:
+            None.
+
+        Return:
+            Dict with thresholds and accepted/dropped pose counts.
+        """
+        return {
+            "translationThreshold": self._translation_threshold,
+            "yawThreshold": self._yaw_threshold,
+            "heartbeatInterval": self._heartbeat_interval,
+            "minInterval": self._min_interval,
+            "accepted": self._accepted,
+            "dropped": self._dropped,
+        }
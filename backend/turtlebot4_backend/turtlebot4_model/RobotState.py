@@ -1,6 +1,7 @@
 
 from typing import Dict, Any
 from turtlebot4_backend.turtlebot4_model.Subject import Subject
+from turtlebot4_backend.turtlebot4_model.Channel import Channel
 from turtlebot4_backend.turtlebot4_model.Path import Path
 
 class RobotState(Subject):
@@ -19,6 +20,8 @@ class RobotState(Subject):
         is_wifi_connected: bool = None,
         is_comms_connected: bool = None,
         is_raspberry_pi_connected: bool = None,
+        telemetry=None,
+        motion_latency=None,
     ) -> None:
         """
         Initialize robot status fields and observer support.
@@ -33,6 +36,8 @@ class RobotState(Subject):
             is_wifi_connected: Initial wifi connection state, or None if unknown.
             is_comms_connected: Initial communications link state, or None if unknown.
             is_raspberry_pi_connected: Initial Raspberry Pi link state, or None if unknown.
+            telemetry: Optional Telemetry that records the status history.
+            motion_latency: Optional MotionLatency reported with the status.
 
         Return:
             None.
@@ -44,6 +49,8 @@ class RobotState(Subject):
         self._is_comms_connected = is_comms_connected
         self._is_raspberry_pi_connected = is_raspberry_pi_connected
         self._path_model = path_model
+        self._telemetry = telemetry
+        self._motion_latency = motion_latency
 
     # Getters
     def get_is_on(self) -> bool:
@@ -116,6 +123,20 @@ class RobotState(Subject):
         """
         return self._is_raspberry_pi_connected
 
+    def get_motion_latency(self):
+        """
+        Return the command-to-motion latency tracker.
+
+        This lets the status controller listen for new measurements.
+
+        Params:
+            None.
+
+        Return:
+            MotionLatency instance, or None if not tracked.
+        """
+        return self._motion_latency
+
     # Setters 
     async def set_is_on(self, value: bool) -> None:
         """
@@ -134,7 +155,7 @@ class RobotState(Subject):
             await self.notify_observers({ 
                 "type": "STATUS_UPDATE", 
                 **self.toJSON() 
-            })
+            }, channel=Channel.STATUS)
 
     async def set_battery_percentage(self, value: float | None) -> None:
         """
@@ -150,12 +171,13 @@ class RobotState(Subject):
         """
         if value is not None:
             value = max(0.0, min(100.0, value))  # clamp to [0, 100]
+        self._record("battery", value)
         if self._battery_percentage != value:
             self._battery_percentage = value
             await self.notify_observers({ 
                 "type": "STATUS_UPDATE", 
                 **self.toJSON() 
-            })
+            }, channel=Channel.STATUS)
 
     async def set_is_wifi_connected(self, value: bool | None) -> None:
         """
@@ -169,12 +191,13 @@ class RobotState(Subject):
         Return:
             None.
         """
+        self._record("wifiConnected", value)
         if self._is_wifi_connected != value:
             self._is_wifi_connected = value
             await self.notify_observers({ 
                 "type": "STATUS_UPDATE", 
                 **self.toJSON() 
-            })
+            }, channel=Channel.STATUS)
 
     async def set_is_comms_connected(self, value: bool | None) -> None:
         """
@@ -188,12 +211,13 @@ class RobotState(Subject):
         Return:
             None.
         """
+        self._record("commsConnected", value)
         if self._is_comms_connected != value:
             self._is_comms_connected = value
             await self.notify_observers({ 
                 "type": "STATUS_UPDATE", 
                 **self.toJSON() 
-            })
+            }, channel=Channel.STATUS)
 
     async def set_is_raspberry_pi_connected(self, value: bool | None) -> None:
         """
@@ -207,13 +231,31 @@ class RobotState(Subject):
         Return:
             None.
         """
+        self._record("raspberryPiConnected", value)
         if self._is_raspberry_pi_connected != value:
             self._is_raspberry_pi_connected = value
             await self.notify_observers({ 
                 "type": "STATUS_UPDATE", 
                 **self.toJSON() 
-            })
+            }, channel=Channel.STATUS)
     
+    def _record(self, metric: str, value) -> None:
+        """
+        Add a status sample to the telemetry history, if one is attached.
+
+        Every sample is recorded, not only changes, so the history shows
+        how long a value was held.
+
+        Params:
+            metric: Telemetry metric name.
+            value: Sample value.
+
+        Return:
+            None.
+        """
+        if self._telemetry is not None:
+            self._telemetry.record(metric, value)
+
     async def set_mode(self) -> None:
         """
         Notify observers that the derived mode may have changed.
@@ -231,7 +273,7 @@ class RobotState(Subject):
         await self.notify_observers({ 
             "type": "STATUS_UPDATE", 
             **self.toJSON()
-        })
+        }, channel=Channel.STATUS)
 
     async def set_docked(self) -> None:
         """
@@ -250,7 +292,46 @@ class RobotState(Subject):
         await self.notify_observers({ 
             "type": "STATUS_UPDATE", 
             **self.toJSON()    
-        })
+        }, channel=Channel.STATUS)
+
+    async def set_motion_latency(self) -> None:
+        """
+        Notify observers that the command-to-motion latency was measured again.
+
+        The tracker holds the statistics, so no local field is set;
+        observers simply re-read the summary.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        await self.notify_observers({
+            "type": "STATUS_UPDATE",
+            **self.toJSON()
+        }, channel=Channel.STATUS)
+
+    async def send_snapshot(self, observer, channels=None) -> None:
+        """
+        Send the current status to a single observer.
+
+        This lets a newly connected client render status immediately without
+        broadcasting a STATUS_UPDATE to every other client.
+
+        Params:
+            observer: Observer that should receive the snapshot.
+            channels: Optional set of channels to limit the snapshot to.
+
+        Return:
+            None.
+        """
+        if channels is not None and Channel.STATUS not in channels:
+            return
+        await self.notify_observer(observer, {
+            "type": "STATUS_UPDATE",
+            **self.toJSON()
+        }, channel=Channel.STATUS)
 
     def toJSON(self) -> Dict[str, Any]:
         """
@@ -275,5 +356,6 @@ class RobotState(Subject):
                 "Running Path Module" if self._path_model and self._path_model.get_is_path_module_active()
                 else "Teleoperating"
             ),
-            "isDocked": self._path_model.get_is_docked() if self._path_model else None
+            "isDocked": self._path_model.get_is_docked() if self._path_model else None,
+            "motionLatency": self._motion_latency.toJSON() if self._motion_latency else None
         }
\ No newline at end of file
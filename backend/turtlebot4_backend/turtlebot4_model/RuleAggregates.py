@@ -0,0 +1,172 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ranking key: (bad ratio, bad - good, rule). See RuleAggregates.
+RankKey = Tuple[float, int, str]
+
+
+class RuleAggregates:
+    """
+    Running per-rule feedback and timing aggregates for the path history.
+
+    For every fuzzy rule output the table keeps the entry count, the good,
+    bad and unrated counts, and the total and number of segment durations
+    (time from an entry to the next one). The history store updates it
+    incrementally on every change.
+
+    Rules with at least one rating are also kept in a list sorted by
+    (bad ratio, bad - good), so the best and worst rules are read from the
+    ends of the list without scanning the table. The second key ranks rules
+    with more ratings further out: at the same ratio, a rule that was rated
+    bad more often is worse, and one rated good more often is better.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty table.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        # Rule -> [count, good, bad, duration_total, duration_count].
+        self._stats: Dict[str, List[float]] = {}
+        self._ranking: List[RankKey] = []  # Sorted keys of rated rules.
+        self._rank_keys: Dict[str, RankKey] = {}  # Rule -> its key in _ranking.
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def tally(self, rule: str, category: str, sign: int) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one entry of a rule.
+
+        Params:
+            rule: Fuzzy rule output of the entry.
+            category: Feedback category (good, bad or unrated).
+            sign: 1 to add the entry, -1 to remove it.
+
+        Return:
+            None.
+        """
+        stats = self._stats.get(rule)
+        if stats is None:
+            stats = self._stats[rule] = [0, 0, 0, 0.0, 0]
+        stats[0] += sign
+        if category == "good":
+            stats[1] += sign
+        elif category == "bad":
+            stats[2] += sign
+
+        if stats[0] == 0:
+            del self._stats[rule]
+        self._rerank(rule)
+
+    def add_duration(self, rule: str, seconds: float, sign: int) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one segment duration of a rule.
+
+        Params:
+            rule: Fuzzy rule output of the segment's first entry.
+            seconds: Segment length.
+            sign: 1 to add the duration, -1 to remove it.
+
+        Return:
+            None.
+        """
+        stats = self._stats.get(rule)
+        if stats is None:
+            return
+        stats[3] += sign * seconds
+        stats[4] += sign
+
+    def get(self, rule: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the aggregates of one rule.
+
+        Params:
+            rule: Fuzzy rule output.
+
+        Return:
+            Aggregate dict, or None if no entry has the rule.
+        """
+        return self._row(rule) if rule in self._stats else None
+
+    def worst(self, k: int) -> List[Dict[str, Any]]:
+        """
+        Return the k rated rules with the highest bad ratio, worst first.
+
+        Params:
+            k: Number of rules.
+
+        Return:
+            Aggregate dicts.
+        """
+        if k <= 0:
+            return []
+        return [self._row(key[2]) for key in reversed(self._ranking[-k:])]
+
+    def best(self, k: int) -> List[Dict[str, Any]]:
+        """
+        Return the k rated rules with the lowest bad ratio, best first.
+
+        Params:
+            k: Number of rules.
+
+        Return:
+            Aggregate dicts.
+        """
+        if k <= 0:
+            return []
+        return [self._row(key[2]) for key in self._ranking[:k]]
+
+    def get_rated_count(self) -> int:
+        """
+        Return the number of rules with at least one rating.
+
+        Params:
+            None.
+
+        Return:
+            Number of ranked rules.
+        """
+        return len(self._ranking)
+
+    def _rerank(self, rule: str) -> None:
+        """
+        Move a rule to its current place in the ranking.
+
+        Params:
+            rule: Rule whose counts changed.
+
+        Return:
+            None.
+        """
+        old = self._rank_keys.pop(rule, None)
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, old)]
+
+        stats = self._stats.get(rule)
+        if stats is None:
+            return
+        good, bad = stats[1], stats[2]
+        if good + bad == 0:
+            return
+        key = (bad / (good + bad), bad - good, rule)
+        insort(self._ranking, key)
+        self._rank_keys[rule] = key
+
+    def _row(self, rule: str) -> Dict[str, Any]:
+        count, good, bad, duration_total, duration_count = self._stats[rule]
+        rated = good + bad
+        return {
+            "rule": rule,
+            "count": count,
+            "good": good,
+            "bad": bad,
+            "unrated": count - rated,
+            "badRatio": bad / rated if rated else None,
+            "meanSegmentSeconds": duration_total / duration_count if duration_count else None,
+        }
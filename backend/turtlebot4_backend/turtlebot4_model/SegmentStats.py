@@ -0,0 +1,111 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from turtlebot4_backend.turtlebot4_utils.QuantileSketch import QuantileSketch
+
+
+class _Transition:
+    """Running statistics of the segments of one goal-type transition."""
+
+    __slots__ = ("count", "mean", "m2", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean (Welford).
+        self.sketch = QuantileSketch()
+
+
+class SegmentStats:
+    """
+    Streaming travel-time statistics per goal-type transition.
+
+    A segment is the time between two consecutive goals; its transition is
+    the pair of their goal types, e.g. intermediate -> global. Each
+    transition keeps a Welford mean/variance and a quantile sketch, so
+    percentiles are available without keeping the raw durations.
+
+    Statistics only grow: a segment whose goals are edited later keeps its
+    original contribution.
+    """
+
+    # Percentiles reported by toJSON.
+    PERCENTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self) -> None:
+        """
+        Initialize empty statistics.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        self._transitions: Dict[Tuple[str, str], _Transition] = {}
+
+    def __len__(self) -> int:
+        return len(self._transitions)
+
+    def record(self, start_type: str, end_type: str, seconds: float) -> None:
+        """
+        Add one segment duration.
+
+        Params:
+            start_type: Goal type of the segment's first goal.
+            end_type: Goal type of the segment's second goal.
+            seconds: Segment duration.
+
+        Return:
+            None.
+        """
+        t = self._transitions.get((start_type, end_type))
+        if t is None:
+            t = self._transitions[(start_type, end_type)] = _Transition()
+        t.count += 1
+        delta = seconds - t.mean
+        t.mean += delta / t.count
+        t.m2 += delta * (seconds - t.mean)
+        t.sketch.add(seconds)
+
+    def get(self, start_type: str, end_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the statistics of one transition.
+
+        Params:
+            start_type: Goal type of the first goal.
+            end_type: Goal type of the second goal.
+
+        Return:
+            Statistics dict, or None if no such segment was recorded.
+        """
+        t = self._transitions.get((start_type, end_type))
+        return self._row(start_type, end_type, t) if t else None
+
+    def toJSON(self) -> List[Dict[str, Any]]:
+        """
+        Convert all transitions into a JSON-serializable list.
+
+        Params:
+            None.
+
+        Return:
+            One statistics dict per transition, most frequent first.
+        """
+        rows = [self._row(start, end, t) for (start, end), t in self._transitions.items()]
+        rows.sort(key=lambda r: -r["count"])
+        return rows
+
+    def _row(self, start_type: str, end_type: str, t: _Transition) -> Dict[str, Any]:
+        row = {
+            "startType": start_type,
+            "endType": end_type,
+            "count": t.count,
+            "meanSeconds": t.mean,
+            "stdDevSeconds": math.sqrt(t.m2 / (t.count - 1)) if t.count > 1 else 0.0,
+            "minSeconds": t.sketch.get_min(),
+            "maxSeconds": t.sketch.get_max(),
+        }
+        for q in self.PERCENTILES:
+            row[f"p{round(q * 100)}Seconds"] = t.sketch.quantile(q)
+        return row
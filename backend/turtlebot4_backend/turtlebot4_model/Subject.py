@@ -56,17 +56,69 @@ class Subject(ABC):
         if o in self._observers:
             self._observers.remove(o)
 
-    async def notify_observers(self, data: dict) -> None:
+    def has_subscribers(self, channel) -> bool:
+        """
+        Return whether any observer wants updates from a channel.
+
+        Models call this before building expensive payloads so nothing is
+        serialized when no client subscribed to the channel.
+
+        Params:
+            channel: Channel to check.
+
+        Return:
+            True if at least one observer is subscribed.
+        """
+        return any(o.is_subscribed(channel) for o in self._observers)
+
+    async def notify_observers(self, data: dict, channel=None) -> None:
         """
         Notify all registered observers of a state change.
 
-        This delivers the update payload to each observer in order.
+        This delivers the update payload to each observer in order. When a
+        channel is given, observers that did not subscribe to it are skipped.
 
         Params:
             data: JSON-serializable update payload.
+            channel: Optional Channel the payload belongs to.
 
         Return:
             None.
         """
         for observer in list(self._observers):
+            if channel is None or observer.is_subscribed(channel):
+                await observer.update(self, data)
+
+    async def notify_observer(self, observer, data: dict, channel=None) -> None:
+        """
+        Send an update payload to a single observer.
+
+        This is used for per-client messages such as the initial snapshot,
+        so a new connection does not cause a broadcast to every client.
+
+        Params:
+            observer: Observer that should receive the payload.
+            data: JSON-serializable update payload.
+            channel: Optional Channel the payload belongs to.
+
+        Return:
+            None.
+        """
+        if channel is None or observer.is_subscribed(channel):
             await observer.update(self, data)
+
+    async def send_snapshot(self, observer, channels=None) -> None:
+        """
+        Send the current state of this subject to a single observer.
+
+        Subjects override this to replay their latest state to a newly
+        connected or newly subscribed client. The default sends nothing.
+
+        Params:
+            observer: Observer that should receive the snapshot.
+            channels: Optional set of channels to limit the snapshot to.
+
+        Return:
+            None.
+        """
+        pass
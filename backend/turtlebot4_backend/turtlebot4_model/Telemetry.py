@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from turtlebot4_backend.turtlebot4_utils.TimeSeries import TimeSeries
+
+
+class Telemetry:
+    """
+    Time-series history of robot metrics for trend charts.
+
+    Every metric has its own fixed-memory TimeSeries, so the memory use does
+    not depend on uptime. Models record samples as they receive them and
+    the REST API queries downsampled ranges. Samples arrive on the event
+    loop while queries run in the API thread pool, so access is locked.
+    """
+
+    # Metrics recorded by the models.
+    METRICS = ("battery", "wifiConnected", "commsConnected", "raspberryPiConnected", "poseX", "poseY")
+
+    # Points returned by query when the caller does not ask for a number.
+    DEFAULT_POINTS = 300
+    # Largest number of points a query may return.
+    MAX_POINTS = 5000
+    # Range queried when no start is given.
+    DEFAULT_RANGE_SECONDS = 24 * 3600
+
+    def __init__(self, metrics: Iterable[str] = METRICS, clock: Callable[[], float] = time.time) -> None:
+        """
+        Create one time series per metric.
+
+        Params:
+            metrics: Names of the recorded metrics.
+            clock: Source of epoch seconds for samples without a timestamp.
+
+        Return:
+            None.
+        """
+        self._series: Dict[str, TimeSeries] = {name: TimeSeries() for name in metrics}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get_metrics(self) -> List[str]:
+        """
+        Return the names of the recorded metrics.
+
+        Params:
+            None.
+
+        Return:
+            Metric names.
+        """
+        return list(self._series)
+
+    def record(self, metric: str, value: Any, t: Optional[float] = None) -> None:
+        """
+        Add one sample of a metric.
+
+        Booleans are stored as 0/1; None (unknown) and unknown metrics are ignored.
+
+        Params:
+            metric: Metric name.
+            value: Sample value.
+            t: Epoch seconds of the sample; defaults to now.
+
+        Return:
+            None.
+        """
+        series = self._series.get(metric)
+        if series is None or value is None:
+            return
+        with self._lock:
+            series.record(self._clock() if t is None else t, float(value))
+
+    def query(self, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+              points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        """
+        Return a downsampled range of one metric.
+
+        Params:
+            metric: Metric name.
+            start: First epoch second; defaults to DEFAULT_RANGE_SECONDS before end.
+            end: Last epoch second; defaults to now.
+            points: Maximum number of points, capped at MAX_POINTS.
+
+        Return:
+            Dict with the metric, the bucket width used and [t, value] points.
+
+        Raises:
+            KeyError: If the metric is not recorded.
+        """
+        series = self._series[metric]
+        end = self._clock() if end is None else end
+        start = end - self.DEFAULT_RANGE_SECONDS if start is None else start
+        points = max(2, min(points, self.MAX_POINTS))
+
+        with self._lock:
+            width, t, v = series.query(start, end, points)
+
+        return {
+            "metric": metric,
+            "resolutionSeconds": width,
+            "points": [[ts, value] for ts, value in zip(t.tolist(), v.tolist())],
+        }
@@ -1,27 +1,41 @@
-from typing import List, Dict, Any
+import time
+from typing import Callable, Optional, Tuple
+from turtlebot4_backend.turtlebot4_model.DirectionCommand import DirectionCommand
 
 class Teleoperate:
     """
-    Stores teleoperation commands and notifies listeners.
+    Stores the latest teleoperation velocity setpoint and notifies listeners.
 
-    This keeps a queue of drive commands from the UI and alerts controllers so
-    they can publish commands to the robot.
+    A new command replaces the setpoint instead of queueing behind older
+    ones, so rapid key repeats cannot build a backlog that the robot keeps
+    executing after the key is released. Every command also refreshes a
+    deadman timer: a setpoint that is not refreshed within DEADMAN_TIMEOUT
+    reads as STOP, so a lost client cannot leave the robot driving.
     """
-    def __init__(self):
+    # Seconds a setpoint stays valid without a refresh from the client.
+    DEADMAN_TIMEOUT = 0.5
+
+    def __init__(self, deadman_timeout: float = DEADMAN_TIMEOUT, clock: Callable[[], float] = time.monotonic):
         """
-        Initialize the command queue and observer list.
+        Initialize a zero setpoint and the observer list.
 
         This prepares the model to accept commands and to notify controllers
-        whenever a new command arrives.
+        whenever the setpoint changes.
 
         Params:
-            None.
+            deadman_timeout: Seconds after which an unrefreshed setpoint reads as STOP.
+            clock: Monotonic time source, injectable for tests.
 
         Return:
             None.
         """
-        self._commands = []
-        # Teleoperate needs to notify the controller when a new command is added, so it can publish to ROSBridge.
+        self._command: Optional[str] = None  # Name of the latest command, for logging and status.
+        self._linear = 0.0  # Requested linear.x velocity (m/s).
+        self._angular = 0.0  # Requested angular.z velocity (rad/s).
+        self._refreshed_at: Optional[float] = None
+        self._deadman_timeout = deadman_timeout
+        self._clock = clock
+        # Teleoperate needs to notify the controller when the setpoint changes, so it can publish to ROSBridge.
         # Thus it needs its own list of observers (the controller) and a notify mechanism. 
         self._observers = [] 
 
@@ -30,10 +44,10 @@ class Teleoperate:
         """
         Register a callback to receive command notifications.
 
-        This allows controllers to react immediately when a new command is queued.
+        This allows controllers to react immediately when the setpoint changes.
 
         Params:
-            callback: Function invoked when a command is added.
+            callback: Function invoked when the setpoint changes.
 
         Return:
             None.
@@ -58,7 +72,7 @@ class Teleoperate:
 
     def notify(self):
         """
-        Notify all observers that a new command is available.
+        Notify all observers that the setpoint changed.
 
         This triggers synchronous callbacks so controllers can publish promptly.
 
@@ -71,47 +85,92 @@ class Teleoperate:
         for cb in list(self._observers):
             cb(self, None)   # synchronous callback
 
-    def add_command(self, command: str):
+    def add_command(self, command: str) -> bool:
         """
-        Add a new command to the queue and notify observers.
-
-        This queues commands in order; STOP clears the queue to prioritize a halt.
+        Set the setpoint from a named drive command and notify observers.
 
         Params:
             command: Drive command string (e.g., FORWARD, LEFT, STOP).
 
         Return:
-            None.
+            True if the command is known and the setpoint was updated.
         """
-        if command == "STOP":
-            self._commands.clear() # ensures that once a stop command is appended, the entire queue is cleared, and the robot instantly comes to a halt.
-            self._commands.append(command)
-        else:
-            self._commands.append(command)
+        try:
+            twist = DirectionCommand[command].value
+        except KeyError:
+            twist = None
+        if not isinstance(twist, dict):
+            print(f"[Teleoperate] Unknown command: {command}")
+            return False
+
+        self.set_setpoint(twist["linear"]["x"], twist["angular"]["z"], command)
+        return True
+
+    def set_setpoint(self, linear_x: float, angular_z: float, command: Optional[str] = None) -> None:
+        """
+        Replace the velocity setpoint, refresh the deadman timer and notify observers.
 
-        self.notify()
+        Params:
+            linear_x: Requested linear velocity along x (m/s).
+            angular_z: Requested angular velocity around z (rad/s).
+            command: Optional command name the setpoint came from.
 
-    def get_command(self):
+        Return:
+            None.
         """
-        Pop the next command from the queue.
+        self._linear = float(linear_x)
+        self._angular = float(angular_z)
+        self._command = command if command is not None else "CUSTOM"
+        self._refreshed_at = self._clock()
+        self.notify()
 
-        This allows controllers to fetch commands in FIFO order.
+    def get_command(self) -> Optional[str]:
+        """
+        Return the name of the latest command.
 
         Params:
             None.
 
         Return:
-            The next command string, or None if no commands are queued.
+            The latest command string, or None if no command was received.
+        """
+        return self._command
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Return whether the deadman window passed without a refresh.
+
+        Params:
+            now: Current clock value; defaults to the model clock.
+
+        Return:
+            True if no command arrived within DEADMAN_TIMEOUT.
+        """
+        if self._refreshed_at is None:
+            return True
+        now = self._clock() if now is None else now
+        return now - self._refreshed_at > self._deadman_timeout
+
+    def get_setpoint(self, now: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Return the velocity the robot should currently drive at.
+
+        Params:
+            now: Current clock value; defaults to the model clock.
+
+        Return:
+            (linear x, angular z); zero once the deadman window passed.
         """
-        if not self._commands:
-            return None
-        return self._commands.pop(0)
+        if self.is_expired(now):
+            return 0.0, 0.0
+        return self._linear, self._angular
 
     def fromJSON(self, msg):
         """
         Load a command from a JSON-style message.
 
-        This accepts a frontend payload and queues the command if present.
+        This accepts a frontend payload and updates the setpoint if it
+        carries a command.
 
         Params:
             msg: Dict that may contain a "command" field.
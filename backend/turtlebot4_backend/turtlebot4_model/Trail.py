@@ -0,0 +1,176 @@
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from turtlebot4_backend.turtlebot4_utils.Polyline import douglas_peucker, point_segment_distance
+
+# (vertex id, x, y, epoch seconds)
+Vertex = Tuple[int, float, float, float]
+
+
+class Trail:
+    """
+    Simplified breadcrumb trail of where the robot actually drove.
+
+    Poses are simplified online: a point only becomes a vertex once the
+    straight line from the previous vertex no longer covers every pose in
+    between within the tolerance, so a straight drive costs two vertices no
+    matter how many poses arrived. Vertices get increasing ids and live in
+    a bounded buffer, which lets clients receive only new vertices and drop
+    evicted ones by id. Coarser, zoomed-out views are produced on request
+    by running Douglas-Peucker over the stored vertices.
+    """
+
+    # Maximum distance in meters between a dropped pose and the live trail.
+    DEFAULT_TOLERANCE = 0.05
+    # Number of vertices kept before the oldest ones are evicted.
+    DEFAULT_CAPACITY = 20000
+    # Tolerance of the trail sent to newly connected clients.
+    SNAPSHOT_TOLERANCE = 0.1
+    # Poses checked against the open segment at most; bounds the cost per pose.
+    MAX_PENDING = 200
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE, capacity: int = DEFAULT_CAPACITY,
+                 clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize an empty trail.
+
+        Params:
+            tolerance: Simplification tolerance of the live trail in meters.
+            capacity: Maximum number of vertices kept.
+            clock: Source of epoch seconds for poses without a timestamp.
+
+        Return:
+            None.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self._tolerance = tolerance
+        self._clock = clock
+        self._vertices: Deque[Vertex] = deque(maxlen=capacity)
+        self._next_id = 1  # Ids are monotonically increasing and never reused.
+        # Poses after the last vertex that the next vertex has to cover.
+        self._pending: List[Tuple[float, float, float]] = []
+
+    def __len__(self) -> int:
+        return len(self._vertices)
+
+    def get_tolerance(self) -> float:
+        """
+        Return the simplification tolerance of the live trail.
+
+        Params:
+            None.
+
+        Return:
+            Tolerance in meters.
+        """
+        return self._tolerance
+
+    def get_first_id(self) -> Optional[int]:
+        """
+        Return the id of the oldest stored vertex.
+
+        Params:
+            None.
+
+        Return:
+            Vertex id, or None if the trail is empty.
+        """
+        return self._vertices[0][0] if self._vertices else None
+
+    def add(self, x: float, y: float, t: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Add one robot position and return the vertices it completed.
+
+        Params:
+            x: Position x in meters.
+            y: Position y in meters.
+            t: Epoch seconds of the pose; defaults to now.
+
+        Return:
+            New vertices as dicts, usually empty.
+        """
+        point = (x, y, self._clock() if t is None else t)
+        if not self._vertices:
+            return [self._commit(point)]
+
+        anchor = self._vertices[-1]
+        pending = self._pending
+        last = pending[-1] if pending else anchor[1:]
+        if x == last[0] and y == last[1]:
+            # Heartbeat poses of a parked robot add nothing to the trail
+            return []
+        if len(pending) < self.MAX_PENDING and self._covers((anchor[1], anchor[2]), (x, y)):
+            pending.append(point)
+            return []
+
+        # The previous pose was the last one that kept the segment within tolerance
+        vertex = self._commit(pending[-1])
+        self._pending = [point]
+        return [vertex]
+
+    def clear(self) -> None:
+        """
+        Remove all vertices; ids keep increasing.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        self._vertices.clear()
+        self._pending = []
+
+    def get_vertices(self, tolerance: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Return the stored trail, optionally simplified further.
+
+        Params:
+            tolerance: Tolerance in meters for a zoomed-out view. Values at or
+                below the live tolerance return every stored vertex.
+
+        Return:
+            Vertices as dicts, oldest first.
+        """
+        vertices = [self._vertex_to_dict(v) for v in self._vertices]
+        if tolerance is not None and tolerance > self._tolerance:
+            vertices = self.simplify_vertices(vertices, tolerance)
+        return vertices
+
+    @staticmethod
+    def simplify_vertices(vertices: List[Dict[str, Any]], tolerance: float) -> List[Dict[str, Any]]:
+        """
+        Simplify vertices returned by get_vertices to a coarser tolerance.
+
+        Works on a copy, not on the trail, so it can run in a worker thread
+        while new poses keep extending the trail.
+
+        Params:
+            vertices: Vertices as dicts, oldest first.
+            tolerance: Tolerance in meters.
+
+        Return:
+            The kept vertices, oldest first.
+        """
+        kept = douglas_peucker([(v["x"], v["y"]) for v in vertices], tolerance)
+        return [vertices[i] for i in kept]
+
+    def _covers(self, a: Tuple[float, float], b: Tuple[float, float]) -> bool:
+        tolerance = self._tolerance
+        for px, py, _ in self._pending:
+            if point_segment_distance((px, py), a, b) > tolerance:
+                return False
+        return True
+
+    def _commit(self, point: Tuple[float, float, float]) -> Dict[str, Any]:
+        vertex = (self._next_id, point[0], point[1], point[2])
+        self._next_id += 1
+        self._vertices.append(vertex)
+        return self._vertex_to_dict(vertex)
+
+    @staticmethod
+    def _vertex_to_dict(vertex: Vertex) -> Dict[str, Any]:
+        return {"id": vertex[0], "x": vertex[1], "y": vertex[2], "t": vertex[3]}
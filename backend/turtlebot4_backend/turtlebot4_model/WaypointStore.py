@@ -0,0 +1,147 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class WaypointStore:
+    """
+    Bounded store for intermediate waypoints with stable, increasing ids.
+
+    Waypoints are kept in a ring buffer so a long patrol cannot grow memory
+    without bound. Every waypoint gets an id that is never reused, which lets
+    observers apply small append/evict deltas instead of full resends.
+    """
+
+    # Default number of waypoints kept before the oldest ones are evicted.
+    DEFAULT_CAPACITY = 200
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, waypoints: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Initialize an empty ring buffer and the id counter.
+
+        Params:
+            capacity: Maximum number of waypoints kept at the same time.
+            waypoints: Optional initial waypoint poses.
+
+        Return:
+            None.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self._capacity = capacity
+        self._next_id = 1  # Ids are monotonically increasing and never reused.
+        self._items: Deque[Tuple[int, Dict[str, Any]]] = deque()
+
+        for pose in waypoints or []:
+            self.append(pose)
+
+    # Getters
+    def get_capacity(self) -> int:
+        """
+        Return the maximum number of stored waypoints.
+
+        Params:
+            None.
+
+        Return:
+            Capacity of the ring buffer.
+        """
+        return self._capacity
+
+    def get_poses(self) -> List[Dict[str, Any]]:
+        """
+        Return the stored waypoint poses, oldest first.
+
+        Params:
+            None.
+
+        Return:
+            List of waypoint poses.
+        """
+        return [pose for _, pose in self._items]
+
+    def get_items(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Return the stored (id, pose) pairs, oldest first.
+
+        Params:
+            None.
+
+        Return:
+            List of (waypoint id, pose) tuples.
+        """
+        return list(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # Mutations
+    def append(self, pose: Dict[str, Any]) -> Tuple[int, List[int]]:
+        """
+        Add a waypoint, evicting the oldest one when the buffer is full.
+
+        Params:
+            pose: Waypoint pose to store.
+
+        Return:
+            Tuple of the new waypoint id and the list of evicted ids.
+        """
+        evicted: List[int] = []
+        while len(self._items) >= self._capacity:
+            evicted.append(self._items.popleft()[0])
+
+        waypoint_id = self._next_id
+        self._next_id += 1
+        self._items.append((waypoint_id, pose))
+        return waypoint_id, evicted
+
+    def evict(self, waypoint_id: int) -> bool:
+        """
+        Remove a single waypoint by id.
+
+        The oldest waypoint is the common case (reached waypoints), so it is
+        removed in O(1); other ids fall back to a scan of the buffer.
+
+        Params:
+            waypoint_id: Id of the waypoint to remove.
+
+        Return:
+            True if a waypoint was removed, otherwise False.
+        """
+        if self._items and self._items[0][0] == waypoint_id:
+            self._items.popleft()
+            return True
+
+        for item in self._items:
+            if item[0] == waypoint_id:
+                self._items.remove(item)
+                return True
+        return False
+
+    def clear(self) -> None:
+        """
+        Remove all waypoints. Ids keep increasing after a clear.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        self._items.clear()
+
+    def replace(self, poses: List[Dict[str, Any]]) -> None:
+        """
+        Replace all waypoints with a new list of poses.
+
+        Only the newest `capacity` poses are kept.
+
+        Params:
+            poses: New waypoint poses, oldest first.
+
+        Return:
+            None.
+        """
+        self._items.clear()
+        for pose in poses[-self._capacity:]:
+            self.append(pose)
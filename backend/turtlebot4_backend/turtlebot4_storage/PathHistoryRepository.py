@@ -1,7 +1,10 @@
 from pathlib import Path
 import json
+import os
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from turtlebot4_backend.turtlebot4_storage import PathSnapshotFormat
 
 # Go up to backend/
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
@@ -11,43 +14,323 @@ BACKEND_ROOT = Path(__file__).resolve().parents[1]
 SNAPSHOT_DIR = BACKEND_ROOT / "turtlebot4_storage" / "path_history_snapshots"
 SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Manifest listing every snapshot (oldest first) with its size and entry count,
+# so the latest snapshot is found without listing the directory.
+MANIFEST_NAME = "manifest.json"
+
+# Format of new snapshots: "columnar" (gzip-compressed, see PathSnapshotFormat)
+# or "json" (pretty-printed). Loading detects the format from the file itself.
+SNAPSHOT_FORMAT = "columnar"
+SNAPSHOT_SUFFIXES = {"json": ".json", "columnar": ".json.gz"}
+
+# Entries per chunk when streaming a snapshot to clients.
+LOAD_CHUNK_SIZE = 500
+# Characters read per block by the streaming parser.
+READ_BLOCK_SIZE = 1 << 16
+
+
+class RetentionPolicy:
+    """
+    Rules for which snapshots are kept when a new one is saved.
+
+    A snapshot is kept if any rule selects it: it is among the newest
+    keep_last snapshots, or it is the newest snapshot of one of the last
+    keep_daily days or keep_weekly ISO weeks that have snapshots. A value
+    of None disables that rule; a policy with all rules disabled keeps
+    everything.
+    """
+
+    def __init__(self, keep_last: Optional[int] = 50, keep_daily: Optional[int] = 30,
+                 keep_weekly: Optional[int] = 52) -> None:
+        """
+        Store the retention limits.
+
+        Params:
+            keep_last: Number of newest snapshots to keep.
+            keep_daily: Number of days for which the newest snapshot is kept.
+            keep_weekly: Number of weeks for which the newest snapshot is kept.
+
+        Return:
+            None.
+        """
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+
+    def select(self, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return the snapshots this policy keeps.
+
+        Params:
+            snapshots: Manifest records, oldest first.
+
+        Return:
+            Kept manifest records, oldest first.
+        """
+        if self.keep_last is None and self.keep_daily is None and self.keep_weekly is None:
+            return list(snapshots)
+
+        newest_first = list(reversed(snapshots))
+        keep = set()
+        if self.keep_last:
+            keep.update(s["filename"] for s in newest_first[:self.keep_last])
+
+        def keep_newest_per(period, limit):
+            seen = set()
+            for s in newest_first:
+                key = period(_saved_at(s))
+                if key not in seen:
+                    if len(seen) == limit:
+                        break
+                    seen.add(key)
+                    keep.add(s["filename"])
+
+        if self.keep_daily:
+            keep_newest_per(lambda ts: ts.date(), self.keep_daily)
+        if self.keep_weekly:
+            keep_newest_per(lambda ts: ts.isocalendar()[:2], self.keep_weekly)
+
+        return [s for s in snapshots if s["filename"] in keep]
+
+
+# Policy applied after every save.
+RETENTION = RetentionPolicy()
+
+
 def _safe_ts() -> str:
     return datetime.now().astimezone().strftime("%Y-%m-%dT%H-%M-%SZ")
 
-def save_path_history(path_model) -> Path:
-    """
-    Save pathHistory into a timestamped JSON file.
-    """
-    payload: Dict[str, Any] = {
-        "savedAt": datetime.now().astimezone().isoformat(),
-        "pathHistory": [
-            {
-                "label": e.get_label(),
-                "id": e.get_id(),
-                "goalType": e.get_goal_type(),
-                "timestamp": e.get_timestamp().isoformat() if e.get_timestamp() else None,
-                "fuzzyOutput": e.get_fuzzy_output(),
-                "userFeedback": e.get_user_feedback(),
-            }
-            for e in path_model.get_path_history()
-        ],
-    }
+def _saved_at(record: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(record["savedAt"])
+
+def save_path_history(path_model, retention: Optional[RetentionPolicy] = None,
+                      snapshot_dir: Path = SNAPSHOT_DIR, format: Optional[str] = None) -> Path:
+    """
+    Save pathHistory into a timestamped snapshot file.
+
+    The snapshot is written in the given format (SNAPSHOT_FORMAT by default),
+    added to the manifest, and the retention policy removes snapshots that
+    are no longer needed.
+    """
+    format = format or SNAPSHOT_FORMAT
+    if format not in SNAPSHOT_SUFFIXES:
+        raise ValueError(f"Unknown snapshot format: {format}")
 
-    file_path = SNAPSHOT_DIR / f"path_history_{_safe_ts()}.json"
-    file_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    saved_at = datetime.now().astimezone().isoformat()
+    entries = path_model.get_path_history()
+    if format == "columnar":
+        data = PathSnapshotFormat.encode_snapshot(entries, saved_at)
+    else:
+        payload: Dict[str, Any] = {
+            "savedAt": saved_at,
+            "pathHistory": [e.toJSON() for e in entries],
+        }
+        data = json.dumps(payload, indent=2).encode("utf-8")
+
+    file_path = snapshot_dir / f"path_history_{_safe_ts()}{SNAPSHOT_SUFFIXES[format]}"
+    file_path.write_bytes(data)
+
+    manifest = _load_manifest(snapshot_dir)
+    snapshots = [s for s in manifest["snapshots"] if s["filename"] != file_path.name]
+    snapshots.append({
+        "filename": file_path.name,
+        "savedAt": saved_at,
+        "size": len(data),
+        "entries": len(entries),
+        "format": format,
+    })
+    manifest["snapshots"] = _apply_retention(snapshots, retention or RETENTION, snapshot_dir)
+    _write_manifest(manifest, snapshot_dir)
     return file_path
 
-def load_latest_path_history() -> Dict[str, Any]:
-    # Find newest file by name and timestamp
-    files = sorted(SNAPSHOT_DIR.glob("path_history_*.json"))
-    if not files:
+def load_latest_path_history(snapshot_dir: Path = SNAPSHOT_DIR) -> Dict[str, Any]:
+    latest = latest_snapshot(snapshot_dir)
+    if latest is None:
         return {"pathHistory": [], "savedAt": None}
 
-    latest = files[-1]
-    data = json.loads(latest.read_text(encoding="utf-8"))
+    data = _read_snapshot(snapshot_dir / latest["filename"])
 
     return {
         "pathHistory": data.get("pathHistory", []),
         "savedAt": data.get("savedAt"),
-        "filename": latest.name,
-    }
\ No newline at end of file
+        "filename": latest["filename"],
+    }
+
+def latest_snapshot(snapshot_dir: Path = SNAPSHOT_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Return the manifest record of the newest snapshot, or None if there is none.
+    """
+    # The newest snapshot is the last manifest record
+    manifest = _load_manifest(snapshot_dir)
+    if manifest["snapshots"] and not (snapshot_dir / manifest["snapshots"][-1]["filename"]).exists():
+        # A snapshot was removed by hand; rebuild the manifest from the directory
+        manifest = _rebuild_manifest(snapshot_dir)
+    return manifest["snapshots"][-1] if manifest["snapshots"] else None
+
+def iter_path_history(file_path: Path, chunk_size: int = LOAD_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream the pathHistory entries of a snapshot file in chunks.
+
+    The file is read block by block and each entry is decoded on its own,
+    so memory use is bounded by the chunk size rather than the file size.
+    This is blocking; run it in a worker thread when called from the loop.
+
+    Params:
+        file_path: Snapshot file.
+        chunk_size: Maximum entries per chunk.
+
+    Return:
+        Iterator over lists of entry dicts, in history order.
+    """
+    if _is_compressed(file_path):
+        # Columnar snapshots decode as a whole; they are small enough to hold in memory
+        history = _read_snapshot(file_path)["pathHistory"]
+        for i in range(0, len(history), chunk_size):
+            yield history[i:i + chunk_size]
+        return
+
+    chunk: List[Dict[str, Any]] = []
+    with open(file_path, encoding="utf-8") as f:
+        for item in _iter_json_array(f, "pathHistory"):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def _is_compressed(file_path: Path) -> bool:
+    with open(file_path, "rb") as f:
+        return PathSnapshotFormat.is_compressed(f.read(2))
+
+def _read_snapshot(file_path: Path) -> Dict[str, Any]:
+    """
+    Read a snapshot file in either format, detected from its first bytes.
+    """
+    data = file_path.read_bytes()
+    if PathSnapshotFormat.is_compressed(data):
+        return PathSnapshotFormat.decode_snapshot(data)
+    return json.loads(data.decode("utf-8"))
+
+def _iter_json_array(f: TextIO, key: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[Any]:
+    """
+    Yield the items of the top-level array stored under key, one at a time.
+
+    Params:
+        f: Open text file holding a JSON object.
+        key: Name of the array member.
+        block_size: Characters read per block.
+
+    Return:
+        Iterator over the decoded array items.
+    """
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    buf = ""
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        block = f.read(block_size)
+        if not block:
+            return False
+        buf = buf[pos:] + block
+        pos = 0
+        return True
+
+    # Find the opening bracket of the array
+    while True:
+        start = buf.find(marker)
+        bracket = buf.find("[", start + len(marker)) if start >= 0 else -1
+        if bracket >= 0:
+            pos = bracket + 1
+            break
+        if not fill():
+            return
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buf):
+            if not fill():
+                raise ValueError(f"Unterminated {key} array")
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # The item continues past the end of the buffer
+            if not fill():
+                raise
+            continue
+        if end == len(buf) and not isinstance(item, (dict, list, str)):
+            # A number or literal at the end of the buffer may be cut short
+            if fill():
+                continue
+        yield item
+        pos = end
+
+def list_snapshots(snapshot_dir: Path = SNAPSHOT_DIR) -> List[Dict[str, Any]]:
+    """
+    Return the manifest records of all snapshots, oldest first.
+    """
+    return _load_manifest(snapshot_dir)["snapshots"]
+
+def _apply_retention(snapshots: List[Dict[str, Any]], policy: RetentionPolicy,
+                     snapshot_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Delete the snapshot files the policy does not keep.
+
+    Returns the remaining manifest records, oldest first.
+    """
+    kept = policy.select(snapshots)
+    kept_names = {s["filename"] for s in kept}
+    for s in snapshots:
+        if s["filename"] not in kept_names:
+            try:
+                (snapshot_dir / s["filename"]).unlink()
+            except FileNotFoundError:
+                pass
+    return kept
+
+def _load_manifest(snapshot_dir: Path) -> Dict[str, Any]:
+    """
+    Read the manifest, building it from the directory if it does not exist yet.
+    """
+    manifest_path = snapshot_dir / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _rebuild_manifest(snapshot_dir)
+
+def _rebuild_manifest(snapshot_dir: Path) -> Dict[str, Any]:
+    """
+    Scan the snapshot directory once and write a fresh manifest.
+    """
+    snapshots = []
+    for f in sorted(snapshot_dir.glob("path_history_*.json*")):
+        try:
+            data = _read_snapshot(f)
+        except (OSError, ValueError):
+            continue
+        snapshots.append({
+            "filename": f.name,
+            "savedAt": data.get("savedAt") or datetime.fromtimestamp(f.stat().st_mtime).astimezone().isoformat(),
+            "size": f.stat().st_size,
+            "entries": len(data.get("pathHistory", [])),
+            "format": "columnar" if f.name.endswith(".gz") else "json",
+        })
+
+    manifest = {"version": 1, "snapshots": snapshots}
+    _write_manifest(manifest, snapshot_dir)
+    return manifest
+
+def _write_manifest(manifest: Dict[str, Any], snapshot_dir: Path) -> None:
+    """
+    Atomically replace the manifest file.
+    """
+    manifest_path = snapshot_dir / MANIFEST_NAME
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest_path)
@@ -0,0 +1,304 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from turtlebot4_backend.turtlebot4_storage.PathHistoryRepository import BACKEND_ROOT
+
+# Append-only journal of path history changes:
+# turtlebot4_backend/turtlebot4_storage/path_journal.jsonl
+JOURNAL_PATH = BACKEND_ROOT / "turtlebot4_storage" / "path_journal.jsonl"
+
+
+class PathJournal:
+    """
+    Append-only JSONL journal of path history changes.
+
+    Every change is one line: {"op": "append", "entry": {...}},
+    {"op": "patch", "index": i, "entry": {...}} or
+    {"op": "reset", "entries": [...]}. Records are queued without blocking
+    the caller and written by a background thread in batches, with one
+    fsync per batch (group commit). Compaction rewrites the journal as a
+    single reset record holding the current history.
+
+    A batch that fails to write stays queued and is retried, and a record
+    only counts as durable once its batch was written. flush reports
+    False while a write error is pending, and close raises it if records
+    could not be written.
+    """
+
+    # Seconds the writer waits to collect more records into one batch.
+    COMMIT_INTERVAL = 0.05
+    # Records written since the last compaction before compaction is due.
+    COMPACT_EVERY = 10000
+    # Seconds to wait before retrying a batch that failed to write.
+    RETRY_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path: Path = JOURNAL_PATH,
+        commit_interval: float = COMMIT_INTERVAL,
+        compact_every: int = COMPACT_EVERY,
+        retry_interval: float = RETRY_INTERVAL,
+    ) -> None:
+        """
+        Open the journal and start the writer thread.
+
+        Params:
+            path: Journal file location.
+            commit_interval: Seconds to gather records before each fsync.
+            compact_every: Records after which needs_compaction returns True.
+            retry_interval: Seconds between attempts to write a failed batch.
+
+        Return:
+            None.
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._commit_interval = commit_interval
+        self._compact_every = compact_every
+        self._retry_interval = retry_interval
+
+        self._cond = threading.Condition()
+        self._queue: List[Dict[str, Any]] = []  # Records not yet written.
+        self._queued = 0  # Sequence number of the last queued record.
+        self._written = 0  # Sequence number of the last durable record.
+        self._since_compaction = self._count_lines()
+        self._closed = False
+        self._flush_requested = False  # Cuts the current batch wait short.
+        self._error: Optional[OSError] = None  # Last write error, until a batch succeeds.
+
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._writer, name="PathJournal", daemon=True)
+        self._thread.start()
+
+    def record(self, record: Dict[str, Any]) -> None:
+        """
+        Queue one change record for writing.
+
+        Params:
+            record: Change record with an "op" key.
+
+        Return:
+            None.
+        """
+        self._enqueue(record)
+
+    def needs_compaction(self) -> bool:
+        """
+        Return whether enough records were written to justify compaction.
+
+        Params:
+            None.
+
+        Return:
+            True if compact should be called.
+        """
+        return self._since_compaction >= self._compact_every
+
+    def compact(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Replace the journal with a snapshot of the current history.
+
+        The snapshot is queued behind all earlier records, so the writer
+        rewrites the file only after those are on disk.
+
+        Params:
+            entries: Current path history as JSON dicts.
+
+        Return:
+            None.
+        """
+        self._since_compaction = 0
+        self._enqueue({"op": "reset", "entries": entries, "_compact": True})
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record is durable.
+
+        Returns early when a write fails; the writer keeps retrying.
+
+        Params:
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Return:
+            True if all records were written in time.
+        """
+        with self._cond:
+            target = self._queued
+            if self._written >= target:
+                return True
+            self._flush_requested = True
+            self._error = None  # Only a failure of this attempt ends the wait early.
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._written >= target or self._error is not None, timeout)
+            return self._written >= target
+
+    def close(self) -> None:
+        """
+        Write the remaining records and stop the writer thread.
+
+        The writer makes one last attempt for records that failed before.
+
+        Params:
+            None.
+
+        Return:
+            None.
+
+        Raises:
+            OSError: If records could not be written; they are lost.
+        """
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._file.close()
+        if self._written < self._queued:
+            raise self._error or OSError("PathJournal records were not written")
+
+    def replay(self) -> List[Dict[str, Any]]:
+        """
+        Rebuild the path history from the journal file.
+
+        A partly written last line (crash during a write) is ignored.
+
+        Params:
+            None.
+
+        Return:
+            List of entry dicts in history order.
+        """
+        entries: List[Dict[str, Any]] = []
+        if not self._path.exists():
+            return entries
+
+        with open(self._path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                op = record.get("op")
+                if op == "append":
+                    entries.append(record["entry"])
+                elif op == "patch" and 0 <= record["index"] < len(entries):
+                    entries[record["index"]] = record["entry"]
+                elif op == "reset":
+                    entries = list(record["entries"])
+        return entries
+
+    def _enqueue(self, record: Dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PathJournal is closed")
+            self._queue.append(record)
+            self._queued += 1
+            self._since_compaction += 1
+            self._cond.notify_all()
+
+    def _writer(self) -> None:
+        """
+        Background loop: collect records, write them, fsync once per batch.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue and self._closed:
+                    return
+                # Give producers a moment to add to this batch; new records do not end the wait.
+                self._cond.wait_for(lambda: self._flush_requested or self._closed, self._commit_interval)
+                self._flush_requested = False
+                batch, self._queue = self._queue, []
+                last = self._queued
+
+            try:
+                self._write_batch(batch)
+            except OSError as e:
+                print(f"[PathJournal] Write failed: {e}")
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                    if self._closed:
+                        return  # The final attempt failed; close reports it.
+                    # Keep the batch in front of newer records and retry it later
+                    self._queue = batch + self._queue
+                    self._cond.wait_for(lambda: self._closed, self._retry_interval)
+                continue
+
+            with self._cond:
+                self._written = last
+                self._error = None
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of records, handling compaction records in order.
+
+        Records are not modified, so a failed batch can be written again. A
+        partly appended batch is cut off the file before the error is raised.
+
+        Params:
+            batch: Records in queue order.
+
+        Return:
+            None.
+        """
+        lines: List[str] = []
+        for record in batch:
+            if record.get("_compact"):
+                # Everything before this record is superseded by the snapshot.
+                lines = []
+                snapshot = {k: v for k, v in record.items() if k != "_compact"}
+                self._rewrite([json.dumps(snapshot, separators=(",", ":"))])
+                continue
+            lines.append(json.dumps(record, separators=(",", ":")))
+
+        if lines:
+            start = self._file.tell()
+            try:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError:
+                try:
+                    self._file.truncate(start)
+                except OSError:
+                    pass
+                raise
+
+    def _rewrite(self, lines: List[str]) -> None:
+        """
+        Atomically replace the journal file with the given lines.
+
+        Params:
+            lines: Serialized records for the new journal.
+
+        Return:
+            None.
+        """
+        tmp = self._path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        try:
+            os.replace(tmp, self._path)
+        finally:
+            # Reopen even on failure so a retry can write to the journal
+            self._file = open(self._path, "a", encoding="utf-8")
+
+    def _count_lines(self) -> int:
+        if not self._path.exists():
+            return 0
+        with open(self._path, "rb") as f:
+            return sum(1 for _ in f)
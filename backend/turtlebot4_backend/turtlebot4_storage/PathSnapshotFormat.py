@@ -0,0 +1,161 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from turtlebot4_backend.turtlebot4_model.PathLogEntry import PathLogEntry
+
+# Compressed snapshots start with the gzip magic bytes; plain JSON snapshots start with "{".
+GZIP_MAGIC = b"\x1f\x8b"
+
+FORMAT_NAME = "path-columnar"
+FORMAT_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def is_compressed(head: bytes) -> bool:
+    """
+    Return whether a snapshot file starts with the gzip magic bytes.
+
+    Params:
+        head: First bytes of the file.
+
+    Return:
+        True for the compressed columnar format.
+    """
+    return head[:2] == GZIP_MAGIC
+
+
+def encode_snapshot(entries: List[PathLogEntry], saved_at: str) -> bytes:
+    """
+    Encode a path history as gzip-compressed columnar JSON.
+
+    Each field is stored as one column instead of repeating key names per
+    entry. Goal types, labels and feedback values are dictionary-encoded
+    (the column holds indexes into a value table) and timestamps are epoch
+    microseconds plus a UTC offset column, so aware and naive datetimes
+    round-trip unchanged.
+
+    Params:
+        entries: Path history entries in order.
+        saved_at: ISO timestamp of the save.
+
+    Return:
+        Compressed snapshot bytes.
+    """
+    dicts: Dict[str, Dict[str, int]] = {"label": {}, "goalType": {}, "userFeedback": {}}
+
+    def code(table: str, value: Any) -> int:
+        values = dicts[table]
+        if value not in values:
+            values[value] = len(values)
+        return values[value]
+
+    timestamps: List[Optional[int]] = []
+    offsets: List[Optional[int]] = []
+    for e in entries:
+        micros, offset = _encode_timestamp(e.get_timestamp())
+        timestamps.append(micros)
+        offsets.append(offset)
+
+    payload = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "savedAt": saved_at,
+        "count": len(entries),
+        "columns": {
+            "id": [e.get_id() for e in entries],
+            "label": [code("label", e.get_label()) for e in entries],
+            "goalType": [code("goalType", e.get_goal_type()) for e in entries],
+            "timestampUs": timestamps,
+            # Offsets are almost always identical; store them only when present
+            "utcOffsetS": offsets if any(o is not None for o in offsets) else None,
+            "fuzzyOutput": [e.get_fuzzy_output() for e in entries],
+            "userFeedback": [code("userFeedback", e.get_user_feedback()) for e in entries],
+        },
+        "dicts": {name: list(values) for name, values in dicts.items()},
+    }
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    # mtime=0 keeps the output deterministic for equal histories
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """
+    Decode a compressed columnar snapshot into the JSON snapshot shape.
+
+    Params:
+        data: Compressed snapshot bytes.
+
+    Return:
+        Dict with "savedAt" and "pathHistory" (entry dicts as produced by
+        PathLogEntry.toJSON).
+
+    Raises:
+        ValueError: If the payload is not a supported columnar snapshot.
+    """
+    payload = json.loads(gzip.decompress(data))
+    if payload.get("format") != FORMAT_NAME or payload.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {payload.get('format')} v{payload.get('version')}")
+
+    columns = payload["columns"]
+    dicts = payload["dicts"]
+    labels, goal_types, feedback = dicts["label"], dicts["goalType"], dicts["userFeedback"]
+    offsets = columns.get("utcOffsetS") or [None] * payload["count"]
+    epochs: Dict[Optional[int], datetime] = {}  # Epoch in each UTC offset, built once per offset
+
+    history = [
+        {
+            "label": labels[label],
+            "id": id,
+            "goalType": goal_types[goal_type],
+            "timestamp": _decode_timestamp(micros, offset, epochs),
+            "fuzzyOutput": fuzzy_output,
+            "userFeedback": feedback[user_feedback],
+        }
+        for id, label, goal_type, micros, offset, fuzzy_output, user_feedback in zip(
+            columns["id"], columns["label"], columns["goalType"], columns["timestampUs"],
+            offsets, columns["fuzzyOutput"], columns["userFeedback"])
+    ]
+    return {"savedAt": payload.get("savedAt"), "pathHistory": history}
+
+
+def _encode_timestamp(ts: Optional[datetime]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Split a datetime into epoch microseconds of its wall time and its UTC offset.
+
+    Params:
+        ts: Timestamp, naive or aware, or None.
+
+    Return:
+        (microseconds, offset seconds or None for naive datetimes).
+    """
+    if ts is None:
+        return None, None
+    offset = ts.utcoffset()
+    delta = ts.replace(tzinfo=None) - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return micros, int(offset.total_seconds()) if offset is not None else None
+
+
+def _decode_timestamp(micros: Optional[int], offset: Optional[int],
+                      epochs: Dict[Optional[int], datetime]) -> Optional[str]:
+    """
+    Rebuild the ISO string of a timestamp encoded by _encode_timestamp.
+
+    Params:
+        micros: Epoch microseconds of the wall time, or None.
+        offset: UTC offset in seconds, or None for naive datetimes.
+        epochs: Cache of the epoch datetime per offset.
+
+    Return:
+        ISO timestamp string or None.
+    """
+    if micros is None:
+        return None
+    epoch = epochs.get(offset)
+    if epoch is None:
+        epoch = _EPOCH if offset is None else _EPOCH.replace(tzinfo=timezone(timedelta(seconds=offset)))
+        epochs[offset] = epoch
+    return (epoch + timedelta(microseconds=micros)).isoformat()
@@ -0,0 +1,85 @@
+import itertools
+import re
+import threading
+from typing import Iterable, Optional
+
+# Goal ids have the form goal_<n>.
+_GOAL_ID = re.compile(r"^goal_(\d+)$")
+
+
+class GoalIdAllocator:
+    """
+    Thread-safe, monotonic allocator for goal ids (goal_1, goal_2, ...).
+
+    Ids come from a counter rather than the history length, so ids stay
+    unique when entries are created faster than they are stored.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Create an allocator whose first id is goal_<start>.
+
+        Params:
+            start: Number of the first id handed out.
+
+        Return:
+            None.
+        """
+        self._lock = threading.Lock()
+        self._counter = itertools.count(start)
+        self._next = start  # Mirror of the counter, for advance_past.
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[Optional[str]]) -> "GoalIdAllocator":
+        """
+        Create an allocator that continues after the highest existing id.
+
+        Params:
+            ids: Existing goal ids; ids not of the form goal_<n> are ignored.
+
+        Return:
+            GoalIdAllocator.
+        """
+        return cls(start=_max_number(ids) + 1)
+
+    def next_id(self) -> str:
+        """
+        Return the next unused goal id.
+
+        Params:
+            None.
+
+        Return:
+            Goal id string.
+        """
+        with self._lock:
+            n = next(self._counter)
+            self._next = n + 1
+        return f"goal_{n}"
+
+    def advance_past(self, ids: Iterable[Optional[str]]) -> None:
+        """
+        Make sure later ids are higher than every id in ids.
+
+        Used after a history is loaded that may contain higher ids.
+
+        Params:
+            ids: Goal ids that must not be handed out again.
+
+        Return:
+            None.
+        """
+        highest = _max_number(ids)
+        with self._lock:
+            if highest >= self._next:
+                self._counter = itertools.count(highest + 1)
+                self._next = highest + 1
+
+
+def _max_number(ids: Iterable[Optional[str]]) -> int:
+    highest = 0
+    for goal_id in ids:
+        match = _GOAL_ID.match(goal_id) if isinstance(goal_id, str) else None
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
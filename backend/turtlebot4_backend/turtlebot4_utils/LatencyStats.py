@@ -0,0 +1,142 @@
+import bisect
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+
+
+class LatencyStats:
+    """
+    Rolling latency recorder with percentile summaries.
+
+    Only the most recent samples are kept, so memory stays bounded and the
+    percentiles describe current behavior rather than the whole uptime.
+    """
+
+    # Number of recent samples used for percentiles.
+    DEFAULT_WINDOW = 1024
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """
+        Initialize an empty sample window and counters.
+
+        Params:
+            window: Maximum number of recent samples kept.
+
+        Return:
+            None.
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Add one latency sample.
+
+        Params:
+            value: Latency in seconds.
+
+        Return:
+            None.
+        """
+        self._samples.append(value)
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+
+    def get_count(self) -> int:
+        """
+        Return the total number of recorded samples.
+
+        Params:
+            None.
+
+        Return:
+            Number of samples recorded since creation.
+        """
+        return self._count
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Return a percentile of the recent samples (nearest-rank method).
+
+        Params:
+            q: Percentile in the range 0-100.
+
+        Return:
+            Latency in seconds, or None when no samples were recorded.
+        """
+        return _nearest_rank(sorted(self._samples), q)
+
+    def histogram(self, edges_ms: Sequence[float]) -> List[Dict[str, Optional[float]]]:
+        """
+        Count the recent samples per latency bucket.
+
+        Params:
+            edges_ms: Ascending upper bucket edges in milliseconds.
+
+        Return:
+            One {"leMs", "count"} dict per edge, plus a last bucket with
+            leMs None for samples above the highest edge.
+        """
+        ordered = sorted(self._samples)
+        buckets = []
+        below = 0
+        for edge in edges_ms:
+            upto = bisect.bisect_right(ordered, edge / 1000.0)
+            buckets.append({"leMs": edge, "count": upto - below})
+            below = upto
+        buckets.append({"leMs": None, "count": len(ordered) - below})
+        return buckets
+
+    def toJSON(self) -> Dict[str, Optional[float]]:
+        """
+        Summarize the recorded latencies in milliseconds.
+
+        Params:
+            None.
+
+        Return:
+            Dict with count, mean, max and p50/p95/p99 in milliseconds.
+        """
+        ordered = sorted(self._samples)  # Sorted once for all percentiles.
+        return {
+            "count": self._count,
+            "meanMs": _to_ms(self._total / self._count) if self._count else None,
+            "maxMs": _to_ms(self._max) if self._count else None,
+            "p50Ms": _to_ms(_nearest_rank(ordered, 50)),
+            "p95Ms": _to_ms(_nearest_rank(ordered, 95)),
+            "p99Ms": _to_ms(_nearest_rank(ordered, 99)),
+        }
+
+
+def _nearest_rank(ordered: List[float], q: float) -> Optional[float]:
+    """
+    Pick the nearest-rank percentile from an already sorted list.
+
+    Params:
+        ordered: Samples in ascending order.
+        q: Percentile in the range 0-100.
+
+    Return:
+        Selected sample, or None for an empty list.
+    """
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _to_ms(value: Optional[float]) -> Optional[float]:
+    """
+    Convert seconds to rounded milliseconds, keeping None.
+
+    Params:
+        value: Duration in seconds or None.
+
+    Return:
+        Duration in milliseconds or None.
+    """
+    return round(value * 1000.0, 3) if value is not None else None
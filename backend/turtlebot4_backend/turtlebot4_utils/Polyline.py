@@ -0,0 +1,151 @@
+import math
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def point_segment_distance(p: Point, a: Point, b: Point) -> float:
+    """
+    Return the distance from a point to a line segment.
+
+    Params:
+        p: Point (x, y).
+        a: First segment end (x, y).
+        b: Second segment end (x, y).
+
+    Return:
+        Euclidean distance from p to the closest point of segment ab.
+    """
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0.0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    # Project p onto the segment and clamp to its ends
+    t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length_sq
+    t = min(max(t, 0.0), 1.0)
+    return math.hypot(p[0] - (a[0] + t * dx), p[1] - (a[1] + t * dy))
+
+
+def douglas_peucker(points: Sequence[Point], tolerance: float) -> List[int]:
+    """
+    Simplify a polyline with the Douglas-Peucker algorithm.
+
+    Keeps the first and last points and recursively the point farthest from
+    the segment between the kept neighbours, until every dropped point lies
+    within tolerance of the simplified line. Uses an explicit stack, so long
+    trajectories cannot hit the recursion limit.
+
+    Params:
+        points: Polyline vertices (x, y) in order.
+        tolerance: Maximum distance of a dropped point from the result.
+
+    Return:
+        Indices of the kept points in increasing order.
+    """
+    n = len(points)
+    if n <= 2:
+        return list(range(n))
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        farthest, max_distance = -1, tolerance
+        for i in range(first + 1, last):
+            distance = point_segment_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                farthest, max_distance = i, distance
+        if farthest != -1:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [i for i in range(n) if keep[i]]
+
+
+def sleeve_simplify(points: Sequence[Point], tolerance: float) -> List[int]:
+    """
+    Simplify a polyline in one pass from its first point.
+
+    Every point seen since the last vertex narrows the range of directions
+    a segment from that vertex may take and still pass within tolerance of
+    the point. A new vertex starts when a point falls outside that range
+    or behind the farthest point so far. This is linear in the number of
+    points, and the vertices only depend on the points before them, so two
+    polylines with the same beginning simplify to the same beginning.
+
+    Params:
+        points: Polyline vertices (x, y) in order.
+        tolerance: Maximum distance of a dropped point from the result.
+
+    Return:
+        Indices of the kept points in increasing order.
+    """
+    n = len(points)
+    if n <= 2:
+        return list(range(n))
+
+    keep = [0]
+    anchor = 0
+    # Allowed directions from the anchor, relative to ref, and the farthest distance seen
+    ref = lo = hi = None
+    farthest = 0.0
+    i = 1
+    while i < n:
+        ax, ay = points[anchor]
+        dx, dy = points[i][0] - ax, points[i][1] - ay
+        distance = math.hypot(dx, dy)
+        if distance <= tolerance:
+            i += 1
+            continue
+
+        angle = math.atan2(dy, dx)
+        if ref is None:
+            ref = angle
+        # Direction relative to ref, wrapped to (-pi, pi]
+        rel = math.remainder(angle - ref, 2 * math.pi)
+        if (lo is not None and not lo <= rel <= hi) or distance < farthest - tolerance:
+            # The previous point is the last one the segment can reach
+            anchor = i - 1
+            keep.append(anchor)
+            ref = lo = hi = None
+            farthest = 0.0
+            continue
+
+        spread = math.asin(tolerance / distance)
+        lo = rel - spread if lo is None else max(lo, rel - spread)
+        hi = rel + spread if hi is None else min(hi, rel + spread)
+        farthest = max(farthest, distance)
+        i += 1
+
+    if keep[-1] != n - 1:
+        keep.append(n - 1)
+    return keep
+
+
+def splice_diff(old: Sequence[Point], new: Sequence[Point]) -> Tuple[int, int, List[Point]]:
+    """
+    Describe new as one splice of old.
+
+    The common prefix and suffix are kept and only the middle part is
+    replaced. This matches how a replanned path usually changes: the start
+    moves with the robot while the rest stays the same.
+
+    Params:
+        old: Previous polyline.
+        new: Current polyline.
+
+    Return:
+        (start, delete_count, inserted): replacing delete_count points of
+        old at start with inserted gives new.
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return start, len(old) - start - end, list(new[start:len(new) - end])
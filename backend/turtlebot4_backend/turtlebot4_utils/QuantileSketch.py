@@ -0,0 +1,161 @@
+import math
+from typing import List, Optional
+
+
+class QuantileSketch:
+    """
+    Streaming quantile estimator (merging t-digest).
+
+    Values are buffered and periodically merged into a small sorted set of
+    centroids (mean, weight). Centroids near the tails are kept small, so
+    high percentiles such as p99 stay accurate while memory is bounded by
+    the compression, not by the number of values.
+    """
+
+    # Higher compression keeps more centroids and gives more accurate quantiles.
+    DEFAULT_COMPRESSION = 100
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION) -> None:
+        """
+        Initialize an empty sketch.
+
+        Params:
+            compression: Size/accuracy trade-off; about compression centroids are kept.
+
+        Return:
+            None.
+        """
+        self._compression = compression
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[float] = []  # Values not merged into centroids yet.
+        self._buffer_size = 5 * compression
+        self._count = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, value: float) -> None:
+        """
+        Add one value.
+
+        Params:
+            value: Observed value.
+
+        Return:
+            None.
+        """
+        self._buffer.append(value)
+        self._count += 1
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        if len(self._buffer) >= self._buffer_size:
+            self._merge()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the value at quantile q.
+
+        Params:
+            q: Quantile in [0, 1], e.g. 0.95.
+
+        Return:
+            Estimated value, or None if the sketch is empty.
+        """
+        if self._count == 0:
+            return None
+        self._merge()
+
+        q = min(max(q, 0.0), 1.0)
+        means, weights = self._means, self._weights
+        if len(means) == 1:
+            return means[0]
+
+        target = q * self._count
+        # Each centroid's weight is centered on its mean; between centers, interpolate.
+        first_center = weights[0] / 2
+        if target <= first_center:
+            return self._min + (means[0] - self._min) * (target / first_center if first_center else 0)
+
+        cumulative = 0.0
+        for i in range(len(means) - 1):
+            center = cumulative + weights[i] / 2
+            next_center = cumulative + weights[i] + weights[i + 1] / 2
+            if target <= next_center:
+                fraction = (target - center) / (next_center - center)
+                return means[i] + (means[i + 1] - means[i]) * fraction
+            cumulative += weights[i]
+
+        last_center = self._count - weights[-1] / 2
+        span = self._count - last_center
+        fraction = (target - last_center) / span if span else 0
+        return means[-1] + (self._max - means[-1]) * fraction
+
+    def get_min(self) -> Optional[float]:
+        """
+        Return the smallest value added.
+
+        Params:
+            None.
+
+        Return:
+            Minimum, or None if the sketch is empty.
+        """
+        return self._min if self._count else None
+
+    def get_max(self) -> Optional[float]:
+        """
+        Return the largest value added.
+
+        Params:
+            None.
+
+        Return:
+            Maximum, or None if the sketch is empty.
+        """
+        return self._max if self._count else None
+
+    def _merge(self) -> None:
+        """
+        Merge buffered values into the centroids.
+
+        Params:
+            None.
+
+        Return:
+            None.
+        """
+        if not self._buffer:
+            return
+
+        points = sorted(list(zip(self._means, self._weights)) + [(v, 1.0) for v in self._buffer])
+        self._buffer = []
+
+        total = self._count
+        means: List[float] = []
+        weights: List[float] = []
+        mean, weight = points[0]
+        before = 0.0  # Weight of the centroids already emitted.
+        for point_mean, point_weight in points[1:]:
+            # Merge while the centroid spans at most one unit of the scale function
+            if self._scale((before + weight + point_weight) / total) - self._scale(before / total) <= 1:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+
+        self._means = means
+        self._weights = weights
+
+    def _scale(self, q: float) -> float:
+        # k1 scale function: small centroids at both tails, large ones around the median.
+        return self._compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
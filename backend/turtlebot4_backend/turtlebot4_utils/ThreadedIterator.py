@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Marks the end of the producer's iterable in the queue.
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised by the producer so it can be re-raised on the loop."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+async def iterate_in_thread(iterable: Iterable[T], maxsize: int = 2) -> AsyncIterator[T]:
+    """
+    Iterate a blocking iterable in a worker thread and yield its items on the loop.
+
+    Parsing and file IO run in the worker, so the event loop stays free
+    between items. The bounded queue keeps the worker at most maxsize items
+    ahead of the consumer.
+
+    Params:
+        iterable: Blocking iterable (e.g. a generator reading a file).
+        maxsize: Number of items the worker may produce ahead.
+
+    Return:
+        Async iterator over the items.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+    stop = threading.Event()  # Set when the consumer stops early.
+
+    def put(item) -> None:
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                put(item)
+            put(_DONE)
+        except BaseException as e:
+            if not stop.is_set():
+                put(_Failure(e))
+
+    worker = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Unblock a worker waiting for queue space so it can see the stop flag.
+        while not queue.empty():
+            queue.get_nowait()
+        await worker
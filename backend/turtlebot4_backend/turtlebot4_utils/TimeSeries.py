@@ -0,0 +1,259 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity (timestamp, value) buffer backed by numpy arrays.
+
+    Appends overwrite the oldest sample once the buffer is full, so memory
+    is allocated once. Timestamps must be appended in increasing order,
+    which lets range queries use a binary search.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Allocate the buffer.
+
+        Params:
+            capacity: Maximum number of samples kept.
+
+        Return:
+            None.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._v = np.zeros(capacity, dtype=np.float64)
+        self._capacity = capacity
+        self._next = 0  # Slot the next sample is written to.
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, t: float, value: float) -> None:
+        """
+        Add a sample, overwriting the oldest one when full.
+
+        Params:
+            t: Timestamp (epoch seconds).
+            value: Sample value.
+
+        Return:
+            None.
+        """
+        self._t[self._next] = t
+        self._v[self._next] = value
+        self._next = (self._next + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def is_full(self) -> bool:
+        """
+        Return whether appends now overwrite old samples.
+
+        Params:
+            None.
+
+        Return:
+            True if the buffer holds capacity samples.
+        """
+        return self._size == self._capacity
+
+    def oldest(self) -> Optional[float]:
+        """
+        Return the timestamp of the oldest sample.
+
+        Params:
+            None.
+
+        Return:
+            Timestamp, or None if the buffer is empty.
+        """
+        if self._size == 0:
+            return None
+        return float(self._t[(self._next - self._size) % self._capacity])
+
+    def range(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the samples with start <= t <= end in time order.
+
+        Params:
+            start: First timestamp included.
+            end: Last timestamp included.
+
+        Return:
+            (timestamps, values) arrays.
+        """
+        t, v = self._ordered()
+        lo = np.searchsorted(t, start, side="left")
+        hi = np.searchsorted(t, end, side="right")
+        return t[lo:hi], v[lo:hi]
+
+    def _ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._size < self._capacity:
+            return self._t[:self._size], self._v[:self._size]
+        # Full: the oldest sample sits at the write position.
+        return (np.concatenate((self._t[self._next:], self._t[:self._next])),
+                np.concatenate((self._v[self._next:], self._v[:self._next])))
+
+
+class _Rollup:
+    """Averages samples into fixed-width time buckets stored in a RingBuffer."""
+
+    def __init__(self, width: float, capacity: int) -> None:
+        self.width = width
+        self.buffer = RingBuffer(capacity)
+        self._bucket: Optional[float] = None  # Start of the bucket being filled.
+        self._sum = 0.0
+        self._count = 0
+
+    def add(self, t: float, value: float) -> None:
+        bucket = math.floor(t / self.width) * self.width
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        self._sum += value
+        self._count += 1
+
+    def flush(self) -> None:
+        # Store the finished bucket at its midpoint.
+        if self._count:
+            self.buffer.append(self._bucket + self.width / 2, self._sum / self._count)
+        self._sum = 0.0
+        self._count = 0
+
+    def current(self) -> Optional[Tuple[float, float]]:
+        # The bucket still being filled, so queries include the latest samples.
+        if not self._count:
+            return None
+        return self._bucket + self.width / 2, self._sum / self._count
+
+
+class TimeSeries:
+    """
+    Multi-resolution, fixed-memory time series of one metric.
+
+    Samples are averaged into 1 s, 1 min and 1 h buckets, each kept in its
+    own ring buffer. A query reads the finest level that still covers the
+    requested start and downsamples the result with LTTB, so long ranges
+    stay cheap and the memory use never grows.
+    """
+
+    # (bucket width in seconds, number of buckets kept) per level, finest first.
+    LEVELS: Sequence[Tuple[float, int]] = (
+        (1.0, 3600),       # 1 s for the last hour
+        (60.0, 1440),      # 1 min for the last day
+        (3600.0, 24 * 90), # 1 h for the last 90 days
+    )
+
+    def __init__(self, levels: Sequence[Tuple[float, int]] = LEVELS) -> None:
+        """
+        Create empty rollup levels.
+
+        Params:
+            levels: (bucket width, capacity) pairs, finest first.
+
+        Return:
+            None.
+        """
+        self._levels: List[_Rollup] = [_Rollup(width, capacity) for width, capacity in levels]
+        self._last_t: Optional[float] = None
+
+    def record(self, t: float, value: float) -> None:
+        """
+        Add one sample.
+
+        Samples older than the previous one are ignored so every level
+        stays in time order.
+
+        Params:
+            t: Timestamp (epoch seconds).
+            value: Sample value.
+
+        Return:
+            None.
+        """
+        if self._last_t is not None and t < self._last_t:
+            return
+        self._last_t = t
+        for level in self._levels:
+            level.add(t, value)
+
+    def query(self, start: float, end: float, points: int) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Return at most points samples between start and end.
+
+        Params:
+            start: First timestamp (epoch seconds).
+            end: Last timestamp (epoch seconds).
+            points: Maximum number of points returned.
+
+        Return:
+            (bucket width used, timestamps, values).
+        """
+        level = self._level_for(start)
+        t, v = level.buffer.range(start, end)
+        current = level.current()
+        if current is not None and start <= current[0] <= end:
+            t = np.append(t, current[0])
+            v = np.append(v, current[1])
+        t, v = lttb(t, v, points)
+        return level.width, t, v
+
+    def _level_for(self, start: float) -> _Rollup:
+        for level in self._levels:
+            oldest = level.buffer.oldest()
+            # A level that has not wrapped yet still holds everything recorded
+            if not level.buffer.is_full() or (oldest is not None and oldest <= start):
+                return level
+        return self._levels[-1]
+
+
+def lttb(t: np.ndarray, v: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. This preserves the visual shape
+    (peaks and dips) far better than plain averaging.
+
+    Params:
+        t: Timestamps in increasing order.
+        v: Values.
+        threshold: Number of points to keep.
+
+    Return:
+        (timestamps, values) with at most threshold points.
+    """
+    n = len(t)
+    if threshold >= n:
+        return t, v
+    if threshold < 3:
+        ends = np.array([0, n - 1][:max(threshold, 0)], dtype=np.int64)
+        return t[ends], v[ends]
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    # Bucket edges over the points between the first and the last one.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = edges[i + 1], (edges[i + 2] if i + 2 < len(edges) else n)
+        next_hi = max(next_hi, next_lo + 1)
+        avg_t = t[next_lo:next_hi].mean()
+        avg_v = v[next_lo:next_hi].mean()
+
+        # Twice the triangle area for every candidate in the bucket
+        area = np.abs((t[a] - avg_t) * (v[lo:hi] - v[a]) - (t[a] - t[lo:hi]) * (avg_v - v[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return t[keep], v[keep]
@@ -32,6 +32,38 @@ export default function MapView({ onMapResize }) {
     ctx.clearRect(0, 0, canvas.width, canvas.height);
     ctx.drawImage(img, 0, 0);
 
+    // Driven trail drawing, one path for all vertices
+    if (map.trail && map.trail.length > 1) {
+      ctx.strokeStyle = "rgba(255, 0, 0, 0.5)";
+      ctx.lineWidth = 2;
+      ctx.beginPath();
+      map.trail.forEach((v, i) => {
+        const tx = v.x / map.resolution;
+        const ty = v.y / map.resolution;
+        if (i === 0) ctx.moveTo(tx, ty);
+        else ctx.lineTo(tx, ty);
+      });
+      // Close the gap to the robot, since the open segment has no vertex yet
+      if (map.robotPose) {
+        ctx.lineTo(map.robotPose.position.x / map.resolution, map.robotPose.position.y / map.resolution);
+      }
+      ctx.stroke();
+    }
+
+    // Planned path drawing, dashed so it stands apart from the driven trail
+    if (map.plannedPath && map.plannedPath.length > 1) {
+      ctx.strokeStyle = "rgba(0, 120, 255, 0.8)";
+      ctx.lineWidth = 2;
+      ctx.setLineDash([6, 4]);
+      ctx.beginPath();
+      map.plannedPath.forEach(([x, y], i) => {
+        if (i === 0) ctx.moveTo(x / map.resolution, y / map.resolution);
+        else ctx.lineTo(x / map.resolution, y / map.resolution);
+      });
+      ctx.stroke();
+      ctx.setLineDash([]);
+    }
+
     // Human drawing with proxemic zones
     if (map.humans) {
       map.humans.forEach(h => {
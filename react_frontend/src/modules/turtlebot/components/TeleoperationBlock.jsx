@@ -1,5 +1,5 @@
 import { motion } from "framer-motion";
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useModeContext } from "../modeUtil/ModeContext.js";
 import { useWebSocketContext } from "../websocketUtil/WebsocketContext.js";
 import TeleoperationButton from "./TeleoperationButton.jsx";
@@ -12,6 +12,9 @@ import rotateLeftIcon from '../assets/rotateLeftButton.svg';
 import rotateRightIcon from '../assets/rotateRightButton.svg';
 import stopIcon from '../assets/stopButton.svg';
 
+// The backend stops the robot when a drive command is not refreshed within its deadman timeout
+const COMMAND_REFRESH_MS = 200;
+
 // Component to control the Teleoperation Module of the Turtlebot, with backend integration
 export default function TeleoperationBlock() {
     const { mode } = useModeContext(); 
@@ -20,6 +23,26 @@ export default function TeleoperationBlock() {
     const { send } = useWebSocketContext();
     const [activeCommand, setActiveCommand] = useState(null);
     const [messages, setMessages] = useState([]);
+    const [heldCommand, setHeldCommand] = useState(null);
+
+    // Resend the command only while its button is held; letting go stops the robot
+    useEffect(() => {
+        if (!isTeleoperating || !heldCommand || heldCommand === 'STOP') return;
+        const id = setInterval(() => send({ command: heldCommand }), COMMAND_REFRESH_MS);
+        return () => clearInterval(id);
+    }, [isTeleoperating, heldCommand, send]);
+
+    // Background tabs throttle timers below the refresh rate, so stop instead of letting the deadman trip
+    useEffect(() => {
+        if (!heldCommand || heldCommand === 'STOP') return;
+        const handleVisibility = () => {
+            if (!document.hidden) return;
+            setHeldCommand(null);
+            send({ command: 'STOP' });
+        };
+        document.addEventListener('visibilitychange', handleVisibility);
+        return () => document.removeEventListener('visibilitychange', handleVisibility);
+    }, [heldCommand, send]);
     
     const handleInput = (direction) => { 
     const dir = direction.toUpperCase(); 
@@ -53,10 +76,17 @@ export default function TeleoperationBlock() {
     }
 
     setActiveCommand(dir);
+    setHeldCommand(command);
     setMessages(prev => [...prev, `Sent: ${command}`]);
     send({ command });
 };
 
+    // Releasing the held drive button stops the robot right away
+    const handleRelease = () => {
+        if (heldCommand && heldCommand !== 'STOP') send({ command: 'STOP' });
+        setHeldCommand(null);
+    };
+
 
     return (
         <motion.div 
@@ -74,41 +104,48 @@ export default function TeleoperationBlock() {
                 <div className="direction-pad">
                     <TeleoperationButton 
                         direction="UP" 
-                        onClick={handleInput} 
+                        onPress={handleInput}
+                        onRelease={handleRelease}
                         icon={<img src={upIcon} alt="up" className="teleop-icon" />}
                     />
                     <div className="horizontal-row">
                         <TeleoperationButton 
                             direction="LEFT" 
-                            onClick={handleInput} 
+                            onPress={handleInput}
+                            onRelease={handleRelease}
                             icon={<img src={leftIcon} alt="left" className="teleop-icon" />}
                         />
                         <TeleoperationButton 
                             direction="RIGHT" 
-                            onClick={handleInput} 
+                            onPress={handleInput}
+                            onRelease={handleRelease}
                             icon={<img src={rightIcon} alt="right" className="teleop-icon" />}
                         />
                     </div>
                     <TeleoperationButton 
                         direction="DOWN" 
-                        onClick={handleInput} 
+                        onPress={handleInput}
+                        onRelease={handleRelease}
                         icon={<img src={downIcon} alt="down" className="teleop-icon down" />}
                     />
                 </div>
                 <div className="action-buttons">
                     <TeleoperationButton 
                         direction="ROTATE_CCW" 
-                        onClick={handleInput} 
+                        onPress={handleInput}
+                        onRelease={handleRelease}
                         icon={<img src={rotateLeftIcon} alt="rotate left" className="teleop-icon" />} 
                     />
                     <TeleoperationButton 
                         direction="ROTATE_CW" 
-                        onClick={handleInput} 
+                        onPress={handleInput}
+                        onRelease={handleRelease}
                         icon={<img src={rotateRightIcon} alt="rotate right" className="teleop-icon" />} 
                     />
                     <TeleoperationButton 
                         direction="STOP" 
-                        onClick={handleInput} 
+                        onPress={handleInput}
+                        onRelease={handleRelease}
                         icon={<img src={stopIcon} alt="stop" className="teleop-icon" />} 
                     />
                 </div>
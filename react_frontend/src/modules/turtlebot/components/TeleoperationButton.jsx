@@ -1,24 +1,46 @@
 import { useState } from 'react';
 import { motion } from 'framer-motion';
 
-// Reusable button component for each teleoperation controls
-export default function TeleoperationButton({ direction, icon, onClick }) { 
+// Reusable button component for each teleoperation controls.
+// onPress fires when the button is pressed (pointer or Enter/Space key) and
+// onRelease when it is let go, so the caller can drive only while it is held
+export default function TeleoperationButton({ direction, icon, onPress, onRelease }) { 
     const [clicked, setClicked] = useState(false); 
+    const [held, setHeld] = useState(false);
 
-    const handleClick = () => { 
+    const press = () => { 
         setClicked(true); 
         setTimeout(() => setClicked(false), 150); 
-        onClick(direction); 
+        setHeld(true);
+        onPress(direction); 
     }; 
+
+    const release = () => {
+        if (!held) return;
+        setHeld(false);
+        onRelease?.(direction);
+    };
+
+    const handleKeyDown = (e) => {
+        if (e.repeat || (e.key !== 'Enter' && e.key !== ' ')) return;
+        e.preventDefault();
+        press();
+    };
     
     return ( 
         <motion.button 
             className={`teleop-button ${direction} ${clicked ? 'clicked' : ''}`} 
-            onClick={handleClick} 
+            onPointerDown={press} 
+            onPointerUp={release}
+            onPointerLeave={release}
+            onPointerCancel={release}
+            onKeyDown={handleKeyDown}
+            onKeyUp={release}
+            onBlur={release}
             whileTap={{ scale: 0.90 }} 
             transition={{ type: "spring", stiffness: 300, damping: 10 }} 
         >
             {icon}
         </motion.button>
     ); 
-}
\ No newline at end of file
+}
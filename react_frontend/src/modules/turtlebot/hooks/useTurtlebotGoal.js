@@ -6,7 +6,8 @@
 let globalGoalState = {
   pathHistory: [],
   isPathModuleActive: false,
-  isDocked: false
+  isDocked: false,
+  historyLoad: null // { loaded, total } while a saved history is streamed in
 };
 
 const goalListeners = new Set();
@@ -19,8 +20,29 @@ export function updateGlobalGoalState(patch) {
 import { useState, useEffect } from "react";
 import { useWebSocketContext } from "../websocketUtil/WebsocketContext";
 
+// Version of the last applied path stream message, null until a snapshot arrives
+let pathVersion = null;
+// True between PATH_LOAD_BEGIN and PATH_LOAD_END
+let pathLoading = false;
+// True from a PATH_RESYNC request until the snapshot arrives
+let pathResyncPending = false;
+
+// Convert a backend path entry into the frontend shape
+function parsePathEntry(entry) {
+  return {
+    id: entry.id,
+    label: entry.label,
+    timestamp: entry.timestamp,
+    goalType: entry.goalType,
+    fuzzy_output_goal: entry.fuzzyOutput,
+    feedback: entry.userFeedback || ""
+  };
+}
+
+const PATH_OPS = new Set(["PATH_APPEND", "PATH_PATCH", "PATH_FLAGS"]);
+
 export function useTurtlebotGoal() {
-  const { subscribe } = useWebSocketContext();
+  const { subscribe, send } = useWebSocketContext();
 
   const [goalDTO, setGoalDTO] = useState(globalGoalState);
 
@@ -35,28 +57,93 @@ export function useTurtlebotGoal() {
     if (!subscribe) return;
 
     return subscribe((data) => {
-      if (data.type !== "PATH_UPDATE") return;
-      // Debug log for incoming path-related messages from the backend
-      console.log("[GOAL HOOK] incoming PATH_DATA:", data);
-
-      // Parse backend pathHistory for frontend use
-      const parsedHistory = (data.pathHistory || []).map(entry => ({
-        id: entry.id,
-        label: entry.label,
-        timestamp: entry.timestamp,
-        goalType: entry.goalType,
-        fuzzy_output_goal: entry.fuzzyOutput,
-        feedback: entry.userFeedback || ""
-      }));
-
-      updateGlobalGoalState({
-        pathHistory: parsedHistory,
-        isPathModuleActive:
-          data.isPathModuleActive ?? globalGoalState.isPathModuleActive,
-        isDocked: data.isDocked ?? globalGoalState.isDocked
-      });
+      // Full snapshot: replaces the history and sets the stream version
+      if (data.type === "PATH_UPDATE") {
+        pathVersion = data.version ?? null;
+        pathLoading = false;
+        pathResyncPending = false;
+        updateGlobalGoalState({
+          pathHistory: (data.pathHistory || []).map(parsePathEntry),
+          isPathModuleActive:
+            data.isPathModuleActive ?? globalGoalState.isPathModuleActive,
+          isDocked: data.isDocked ?? globalGoalState.isDocked,
+          historyLoad: null
+        });
+        return;
+      }
+
+      // Saved history streamed in chunks; the version resumes at PATH_LOAD_END
+      if (data.type === "PATH_LOAD_BEGIN") {
+        pathLoading = true;
+        updateGlobalGoalState({
+          pathHistory: [],
+          historyLoad: { loaded: 0, total: data.total ?? 0 }
+        });
+        return;
+      }
+
+      if (data.type === "PATH_LOAD_CHUNK") {
+        const entries = data.entries || [];
+        // Every mounted hook receives the chunk; only the first one appends it
+        if (!pathLoading || globalGoalState.pathHistory.length !== data.loaded - entries.length) return;
+        updateGlobalGoalState({
+          pathHistory: [...globalGoalState.pathHistory, ...entries.map(parsePathEntry)],
+          historyLoad: { loaded: data.loaded, total: data.total }
+        });
+        return;
+      }
+
+      if (data.type === "PATH_LOAD_END") {
+        if (!pathLoading) return;
+        pathLoading = false;
+        pathVersion = data.version ?? null;
+        updateGlobalGoalState({
+          historyLoad: null,
+          isPathModuleActive:
+            data.isPathModuleActive ?? globalGoalState.isPathModuleActive,
+          isDocked: data.isDocked ?? globalGoalState.isDocked
+        });
+        return;
+      }
+
+      if (!PATH_OPS.has(data.type)) return;
+
+      // Operations on the history being replaced are superseded by PATH_LOAD_END
+      if (pathLoading) return;
+
+      // Every mounted hook receives the message; only the first one applies it
+      if (pathVersion !== null && data.version <= pathVersion) return;
+
+      // A missed operation would leave the history out of sync, so ask for a new snapshot
+      if (pathVersion === null || data.version !== pathVersion + 1) {
+        pathVersion = null;
+        // Later operations wait for the requested snapshot instead of asking again
+        if (!pathResyncPending) {
+          pathResyncPending = true;
+          send?.({ type: "PATH_RESYNC" });
+        }
+        return;
+      }
+      pathVersion = data.version;
+
+      if (data.type === "PATH_APPEND") {
+        // Batches of rule outputs arrive as one message with "entries"
+        const added = data.entries ?? [data.entry];
+        updateGlobalGoalState({
+          pathHistory: [...globalGoalState.pathHistory, ...added.map(parsePathEntry)]
+        });
+      } else if (data.type === "PATH_PATCH") {
+        const pathHistory = [...globalGoalState.pathHistory];
+        pathHistory[data.index] = parsePathEntry(data.entry);
+        updateGlobalGoalState({ pathHistory });
+      } else {
+        updateGlobalGoalState({
+          isPathModuleActive: data.isPathModuleActive,
+          isDocked: data.isDocked
+        });
+      }
     });
-  }, [subscribe]);
+  }, [subscribe, send]);
 
   return goalDTO;
 }
@@ -11,7 +11,10 @@ let globalMapState = {
   robotPose: null,
   humans: [],
   globalGoal: null,
-  intermediateWaypoints: []
+  intermediateWaypoints: [],
+  trail: [],
+  plannedPath: [],
+  planVersion: 0
 };
 
 const listeners = new Set();
@@ -26,7 +29,7 @@ import { useWebSocketContext } from "../websocketUtil/WebsocketContext";
 
 // Custom hook to provide Turtlebot map data to components
 export function useTurtlebotMap() {
-  const { subscribe } = useWebSocketContext();
+  const { subscribe, send } = useWebSocketContext();
   const [mapDTO, setMapDTO] = useState(globalMapState);
 
   useEffect(() => {
@@ -69,8 +72,64 @@ export function useTurtlebotMap() {
 
         return;
       }
+
+      if (data.type === "WAYPOINT_UPDATE") {
+        // Waypoints arrive as small deltas keyed by id instead of the full list
+        const evicted = new Set(data.evicted || []);
+        let waypoints = globalMapState.intermediateWaypoints;
+
+        if (data.op === "reset" || data.op === "clear") {
+          waypoints = [];
+        }
+        if (evicted.size > 0) {
+          waypoints = waypoints.filter(wp => !evicted.has(wp.id));
+        }
+        if (data.waypoints) {
+          // Every mounted hook receives the delta; only add waypoints not stored yet
+          const stored = new Set(waypoints.map(wp => wp.id));
+          waypoints = [...waypoints, ...data.waypoints.filter(wp => !stored.has(wp.id))];
+        }
+
+        updateGlobalMapState({ intermediateWaypoints: waypoints });
+        return;
+      }
+
+      if (data.type === "PLAN_UPDATE") {
+        if (data.op === "reset") {
+          updateGlobalMapState({ plannedPath: data.points || [], planVersion: data.version });
+          return;
+        }
+        // Every mounted hook receives the splice; only the first one applies it
+        if (data.version <= globalMapState.planVersion) return;
+        // A splice only applies to the plan version it was computed from
+        if (data.baseVersion !== globalMapState.planVersion) {
+          send?.({ type: "PLAN_RESYNC" });
+          return;
+        }
+        const plannedPath = [...globalMapState.plannedPath];
+        plannedPath.splice(data.start, data.deleteCount, ...(data.points || []));
+        updateGlobalMapState({ plannedPath, planVersion: data.version });
+        return;
+      }
+
+      if (data.type === "TRAIL_RESET") {
+        updateGlobalMapState({ trail: data.vertices || [] });
+        return;
+      }
+
+      if (data.type === "TRAIL_APPEND") {
+        // Only newly simplified vertices arrive; ids below firstId were evicted on the server
+        const firstId = data.firstId ?? 0;
+        const trail = globalMapState.trail;
+        // Every mounted hook receives the append; skip vertices already stored
+        const lastId = trail.length > 0 ? trail[trail.length - 1].id : -Infinity;
+        const added = (data.vertices || []).filter(v => v.id > lastId);
+        if (added.length === 0) return;
+        const kept = trail.filter(v => v.id >= firstId);
+        updateGlobalMapState({ trail: [...kept, ...added] });
+      }
     });
-  }, [subscribe]);
+  }, [subscribe, send]);
 
   return mapDTO;
 }
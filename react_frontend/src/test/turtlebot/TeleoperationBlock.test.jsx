@@ -26,12 +26,14 @@ vi.mock('../../modules/turtlebot/websocketUtil/WebsocketContext.js', () => ({
 }))
 
 vi.mock('../../modules/turtlebot/components/TeleoperationButton.jsx', () => ({
-  default: ({ direction, onClick }) => (
-    <button onClick={() => onClick(direction)}>{direction}</button>
+  default: ({ direction, onPress, onRelease }) => (
+    <button onPointerDown={() => onPress(direction)} onPointerUp={() => onRelease(direction)}>
+      {direction}
+    </button>
   ),
 }))
 
-// Tests for TeleoperationBlock to ensure it sends correct commands on button clicks and renders disabled state when not in teleoperating mode
+// Tests for TeleoperationBlock to ensure it sends correct commands on button presses and renders disabled state when not in teleoperating mode
 describe('TeleoperationBlock', () => {
   beforeEach(() => {
     vi.clearAllMocks()
@@ -39,69 +41,106 @@ describe('TeleoperationBlock', () => {
     useWebSocketContext.mockReturnValue({ send: sendMock })
   })
 
-  it('sends FORWARD when UP is clicked', () => {
+  it('sends FORWARD when UP is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('UP'))
+    fireEvent.pointerDown(screen.getByText('UP'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'FORWARD' })
     expect(screen.getByText('Sent: FORWARD')).toBeInTheDocument()
   })
 
-  it('sends BACKWARD when DOWN is clicked', () => {
+  it('sends BACKWARD when DOWN is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('DOWN'))
+    fireEvent.pointerDown(screen.getByText('DOWN'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'BACKWARD' })
     expect(screen.getByText('Sent: BACKWARD')).toBeInTheDocument()
   })
 
-  it('sends LEFT when LEFT is clicked', () => {
+  it('sends LEFT when LEFT is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('LEFT'))
+    fireEvent.pointerDown(screen.getByText('LEFT'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'LEFT' })
     expect(screen.getByText('Sent: LEFT')).toBeInTheDocument()
   })
 
-  it('sends RIGHT when RIGHT is clicked', () => {
+  it('sends RIGHT when RIGHT is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('RIGHT'))
+    fireEvent.pointerDown(screen.getByText('RIGHT'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'RIGHT' })
     expect(screen.getByText('Sent: RIGHT')).toBeInTheDocument()
   })
 
-  it('sends ROTATE_LEFT when ROTATE_CCW is clicked', () => {
+  it('sends ROTATE_LEFT when ROTATE_CCW is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('ROTATE_CCW'))
+    fireEvent.pointerDown(screen.getByText('ROTATE_CCW'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'ROTATE_LEFT' })
     expect(screen.getByText('Sent: ROTATE_LEFT')).toBeInTheDocument()
   })
 
-  it('sends ROTATE_RIGHT when ROTATE_CW is clicked', () => {
+  it('sends ROTATE_RIGHT when ROTATE_CW is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('ROTATE_CW'))
+    fireEvent.pointerDown(screen.getByText('ROTATE_CW'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'ROTATE_RIGHT' })
     expect(screen.getByText('Sent: ROTATE_RIGHT')).toBeInTheDocument()
   })
 
-  it('sends STOP when STOP is clicked', () => {
+  it('sends STOP when STOP is pressed', () => {
     render(<TeleoperationBlock />)
 
-    fireEvent.click(screen.getByText('STOP'))
+    fireEvent.pointerDown(screen.getByText('STOP'))
 
     expect(sendMock).toHaveBeenCalledWith({ command: 'STOP' })
     expect(screen.getByText('Sent: STOP')).toBeInTheDocument()
   })
 
+  it('refreshes a drive command only while its button is held', () => {
+    vi.useFakeTimers()
+    render(<TeleoperationBlock />)
+
+    fireEvent.pointerDown(screen.getByText('UP'))
+    vi.advanceTimersByTime(450)
+    expect(sendMock).toHaveBeenCalledTimes(3)
+    expect(screen.getAllByText('Sent: FORWARD')).toHaveLength(1)
+
+    sendMock.mockClear()
+    fireEvent.pointerUp(screen.getByText('UP'))
+    expect(sendMock).toHaveBeenCalledWith({ command: 'STOP' })
+
+    sendMock.mockClear()
+    vi.advanceTimersByTime(1000)
+    expect(sendMock).not.toHaveBeenCalled()
+    vi.useRealTimers()
+  })
+
+  it('stops when the tab is hidden while a button is held', () => {
+    vi.useFakeTimers()
+    render(<TeleoperationBlock />)
+
+    fireEvent.pointerDown(screen.getByText('LEFT'))
+    sendMock.mockClear()
+
+    Object.defineProperty(document, 'hidden', { configurable: true, value: true })
+    fireEvent(document, new Event('visibilitychange'))
+    expect(sendMock).toHaveBeenCalledWith({ command: 'STOP' })
+
+    sendMock.mockClear()
+    vi.advanceTimersByTime(1000)
+    expect(sendMock).not.toHaveBeenCalled()
+    delete document.hidden
+    vi.useRealTimers()
+  })
+
   it('renders disabled class when not teleoperating', () => {
     useModeContext.mockReturnValue({ mode: 'Idle' })
 
@@ -131,8 +170,8 @@ describe('TeleoperationBlock', () => {
     }))
 
     vi.doMock('../../modules/turtlebot/components/TeleoperationButton.jsx', () => ({
-      default: ({ onClick }) => (
-        <button onClick={() => onClick('UNKNOWN')}>UNKNOWN</button>
+      default: ({ onPress }) => (
+        <button onPointerDown={() => onPress('UNKNOWN')}>UNKNOWN</button>
       ),
     }))
 
@@ -140,7 +179,7 @@ describe('TeleoperationBlock', () => {
 
     render(<FreshTeleoperationBlock />)
 
-    fireEvent.click(screen.getAllByText('UNKNOWN')[0])
+    fireEvent.pointerDown(screen.getAllByText('UNKNOWN')[0])
 
     expect(sendMock).not.toHaveBeenCalled()
     expect(screen.queryByText(/Sent:/)).not.toBeInTheDocument()
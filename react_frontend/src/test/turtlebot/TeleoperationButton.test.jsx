@@ -11,7 +11,7 @@ vi.mock('framer-motion', () => ({
   },
 }))
 
-// Tests for TeleoperationButton to ensure it calls onClick with correct direction 
+// Tests for TeleoperationButton to ensure it calls onPress and onRelease with correct direction 
 // and adds clicked class briefly for checking
 describe('TeleoperationButton', () => {
   beforeEach(() => {
@@ -22,35 +22,79 @@ describe('TeleoperationButton', () => {
     vi.useRealTimers()
   })
 
-  it('calls onClick with direction', () => {
-    const onClick = vi.fn()
+  it('calls onPress with direction', () => {
+    const onPress = vi.fn()
 
     render(
       <TeleoperationButton
         direction="UP"
         icon={<span>icon</span>}
-        onClick={onClick}
+        onPress={onPress}
       />
     )
 
-    fireEvent.click(screen.getByRole('button'))
-    expect(onClick).toHaveBeenCalledWith('UP')
+    fireEvent.pointerDown(screen.getByRole('button'))
+    expect(onPress).toHaveBeenCalledWith('UP')
   })
 
-    it('adds clicked class briefly after click', () => {
-    const onClick = vi.fn()
+  it('calls onRelease once when the held button is let go', () => {
+    const onRelease = vi.fn()
+
+    render(
+      <TeleoperationButton
+        direction="UP"
+        icon={<span>icon</span>}
+        onPress={vi.fn()}
+        onRelease={onRelease}
+      />
+    )
+
+    const button = screen.getByRole('button')
+    fireEvent.pointerLeave(button)
+    expect(onRelease).not.toHaveBeenCalled()
+
+    fireEvent.pointerDown(button)
+    fireEvent.pointerUp(button)
+    fireEvent.pointerLeave(button)
+    expect(onRelease).toHaveBeenCalledTimes(1)
+    expect(onRelease).toHaveBeenCalledWith('UP')
+  })
+
+  it('presses and releases with the keyboard', () => {
+    const onPress = vi.fn()
+    const onRelease = vi.fn()
+
+    render(
+      <TeleoperationButton
+        direction="UP"
+        icon={<span>icon</span>}
+        onPress={onPress}
+        onRelease={onRelease}
+      />
+    )
+
+    const button = screen.getByRole('button')
+    fireEvent.keyDown(button, { key: 'Enter' })
+    fireEvent.keyDown(button, { key: 'Enter', repeat: true })
+    fireEvent.keyUp(button, { key: 'Enter' })
+    expect(onPress).toHaveBeenCalledTimes(1)
+    expect(onRelease).toHaveBeenCalledTimes(1)
+  })
+
+    it('adds clicked class briefly after a press', () => {
+    const onPress = vi.fn()
 
     render(
         <TeleoperationButton
         direction="UP"
         icon={<span>icon</span>}
-        onClick={onClick}
+        onPress={onPress}
         />
     )
 
     const button = screen.getByRole('button')
 
-    fireEvent.click(button)
+    fireEvent.pointerDown(button)
 
     expect(button.className).toContain('clicked')
 
@@ -144,6 +144,96 @@ describe('useTurtlebotGoal', () => {
     })
   })
 
+  it('applies PATH_APPEND, PATH_PATCH and PATH_FLAGS after a snapshot', async () => {
+    const { result } = renderHook(() => useTurtlebotGoal())
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 4, isPathModuleActive: true, isDocked: false, pathHistory: [] })
+      subscriber({ type: 'PATH_APPEND', version: 5, entry: { id: 'goal_1', label: 'Goal Entry' } })
+      subscriber({ type: 'PATH_PATCH', version: 6, index: 0, entry: { id: 'goal_1', label: 'Goal Entry', userFeedback: 'bad' } })
+      subscriber({ type: 'PATH_FLAGS', version: 7, isPathModuleActive: false, isDocked: true })
+    })
+
+    await waitFor(() => {
+      expect(result.current.pathHistory).toHaveLength(1)
+      expect(result.current.pathHistory[0].feedback).toBe('bad')
+      expect(result.current.isPathModuleActive).toBe(false)
+      expect(result.current.isDocked).toBe(true)
+    })
+    expect(sendMock).not.toHaveBeenCalled()
+  })
+
+  it('appends every entry of a batched PATH_APPEND', async () => {
+    const { result } = renderHook(() => useTurtlebotGoal())
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 1, pathHistory: [] })
+      subscriber({ type: 'PATH_APPEND', version: 2, entries: [{ id: 'goal_1' }, { id: 'goal_2' }] })
+    })
+
+    await waitFor(() => {
+      expect(result.current.pathHistory.map(e => e.id)).toEqual(['goal_1', 'goal_2'])
+    })
+  })
+
+  it('requests a resync when a path operation version is skipped', () => {
+    renderHook(() => useTurtlebotGoal())
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 1, pathHistory: [] })
+      subscriber({ type: 'PATH_APPEND', version: 3, entry: { id: 'goal_2' } })
+    })
+
+    expect(sendMock).toHaveBeenCalledWith({ type: 'PATH_RESYNC' })
+  })
+
+  it('sends one resync request until the snapshot arrives', async () => {
+    const { result } = renderHook(() => useTurtlebotGoal())
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 1, pathHistory: [] })
+      subscriber({ type: 'PATH_APPEND', version: 3, entry: { id: 'goal_2' } })
+      subscriber({ type: 'PATH_APPEND', version: 4, entry: { id: 'goal_3' } })
+      subscriber({ type: 'PATH_PATCH', version: 5, index: 0, entry: { id: 'goal_1' } })
+    })
+    expect(sendMock).toHaveBeenCalledTimes(1)
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 5, pathHistory: [{ id: 'goal_1' }, { id: 'goal_2' }, { id: 'goal_3' }] })
+      subscriber({ type: 'PATH_APPEND', version: 6, entry: { id: 'goal_4' } })
+    })
+
+    await waitFor(() => {
+      expect(result.current.pathHistory.map(e => e.id)).toEqual(['goal_1', 'goal_2', 'goal_3', 'goal_4'])
+    })
+    expect(sendMock).toHaveBeenCalledTimes(1)
+  })
+
+  it('builds the history from PATH_LOAD chunks and resumes at the end version', async () => {
+    const { result } = renderHook(() => useTurtlebotGoal())
+
+    act(() => {
+      subscriber({ type: 'PATH_UPDATE', version: 2, pathHistory: [{ id: 'old' }] })
+      subscriber({ type: 'PATH_LOAD_BEGIN', total: 3 })
+      subscriber({ type: 'PATH_LOAD_CHUNK', entries: [{ id: 'goal_1' }, { id: 'goal_2' }], loaded: 2, total: 3 })
+    })
+    expect(result.current.historyLoad).toEqual({ loaded: 2, total: 3 })
+
+    act(() => {
+      subscriber({ type: 'PATH_APPEND', version: 3, entry: { id: 'live' } })
+      subscriber({ type: 'PATH_LOAD_CHUNK', entries: [{ id: 'goal_3' }], loaded: 3, total: 3 })
+      subscriber({ type: 'PATH_LOAD_END', version: 4, loaded: 3, isDocked: true })
+      subscriber({ type: 'PATH_APPEND', version: 5, entry: { id: 'goal_4' } })
+    })
+
+    await waitFor(() => {
+      expect(result.current.pathHistory.map(e => e.id)).toEqual(['goal_1', 'goal_2', 'goal_3', 'goal_4'])
+      expect(result.current.historyLoad).toBeNull()
+      expect(result.current.isDocked).toBe(true)
+    })
+    expect(sendMock).not.toHaveBeenCalled()
+  })
+
   it('returns current state when websocket subscribe is unavailable', () => {
     subscribeImpl = undefined
     updateGlobalGoalState({
@@ -2,22 +2,31 @@ import { describe, it, expect, vi, beforeEach } from 'vitest'
 import { renderHook, act } from '@testing-library/react'
 
 let subscriber
+let subscribers
 let subscribeImpl
+let sendMock
 
 vi.mock('../../modules/turtlebot/websocketUtil/WebsocketContext', () => ({
   useWebSocketContext: () => ({
     subscribe: subscribeImpl,
+    send: sendMock,
   }),
 }))
 
+// The hook is mounted more than once in the app; every mount receives each message
+const broadcast = (data) => subscribers.forEach(cb => cb(data))
+
 // Tests for useTurtlebotMap to ensure it initializes with default state and 
 // updates correctly on MAP_UPDATE and POSE_UPDATE messages respectively
 describe('useTurtlebotMap', () => {
   beforeEach(() => {
     vi.resetModules()
     subscriber = undefined
+    subscribers = []
+    sendMock = vi.fn()
     subscribeImpl = vi.fn((cb) => {
       subscriber = cb
+      subscribers.push(cb)
       return () => {}
     })
     vi.spyOn(console, 'log').mockImplementation(() => {})
@@ -39,6 +48,9 @@ describe('useTurtlebotMap', () => {
       humans: [],
       globalGoal: null,
       intermediateWaypoints: [],
+      trail: [],
+      plannedPath: [],
+      planVersion: 0,
     })
   })
 
@@ -170,6 +182,118 @@ describe('useTurtlebotMap', () => {
     expect(result.current.intermediateWaypoints).toEqual(intermediateWaypoints)
   })
 
+  it('applies WAYPOINT_UPDATE append, evict and clear deltas', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+
+    const wp = (id, x) => ({ id, position: { x, y: 0, z: 0 }, orientation: { x: 0, y: 0, z: 0, w: 1 } })
+
+    act(() => {
+      subscriber({ type: 'WAYPOINT_UPDATE', op: 'append', waypoints: [wp(1, 1)], evicted: [] })
+      subscriber({ type: 'WAYPOINT_UPDATE', op: 'append', waypoints: [wp(2, 2)], evicted: [1] })
+    })
+
+    expect(result.current.intermediateWaypoints).toEqual([wp(2, 2)])
+
+    act(() => {
+      subscriber({ type: 'WAYPOINT_UPDATE', op: 'clear' })
+    })
+
+    expect(result.current.intermediateWaypoints).toEqual([])
+  })
+
+  it('adds each appended waypoint once with two mounted hooks', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+    renderHook(() => useTurtlebotMap())
+
+    const wp = (id, x) => ({ id, position: { x, y: 0, z: 0 }, orientation: { x: 0, y: 0, z: 0, w: 1 } })
+
+    act(() => {
+      broadcast({ type: 'WAYPOINT_UPDATE', op: 'append', waypoints: [wp(1, 1)], evicted: [] })
+      broadcast({ type: 'WAYPOINT_UPDATE', op: 'append', waypoints: [wp(2, 2)], evicted: [1] })
+    })
+
+    expect(result.current.intermediateWaypoints).toEqual([wp(2, 2)])
+  })
+
+  it('applies TRAIL_RESET and TRAIL_APPEND deltas', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+
+    const v = (id, x) => ({ id, x, y: 0, t: 0 })
+
+    act(() => {
+      subscriber({ type: 'TRAIL_RESET', tolerance: 0.1, vertices: [v(1, 0), v(2, 1)] })
+      subscriber({ type: 'TRAIL_APPEND', vertices: [v(3, 2)], firstId: 2 })
+    })
+
+    expect(result.current.trail).toEqual([v(2, 1), v(3, 2)])
+  })
+
+  it('appends each trail vertex once with two mounted hooks', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+    renderHook(() => useTurtlebotMap())
+
+    const v = (id, x) => ({ id, x, y: 0, t: 0 })
+
+    act(() => {
+      broadcast({ type: 'TRAIL_RESET', tolerance: 0.1, vertices: [v(1, 0)] })
+      broadcast({ type: 'TRAIL_APPEND', vertices: [v(2, 1), v(3, 2)], firstId: 1 })
+    })
+
+    expect(result.current.trail).toEqual([v(1, 0), v(2, 1), v(3, 2)])
+  })
+
+  it('applies PLAN_UPDATE splices in version order', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+
+    act(() => {
+      subscriber({ type: 'PLAN_UPDATE', op: 'reset', version: 1, points: [[0, 0], [1, 0], [2, 2]] })
+      subscriber({ type: 'PLAN_UPDATE', op: 'splice', baseVersion: 1, version: 2, start: 0, deleteCount: 1, points: [[0.5, 0]] })
+      // Out of order: ignored until a resync resets the plan
+      subscriber({ type: 'PLAN_UPDATE', op: 'splice', baseVersion: 5, version: 6, start: 0, deleteCount: 3, points: [] })
+    })
+
+    expect(result.current.plannedPath).toEqual([[0.5, 0], [1, 0], [2, 2]])
+    expect(result.current.planVersion).toBe(2)
+  })
+
+  it('applies each PLAN_UPDATE splice once with two mounted hooks', async () => {
+    const { useTurtlebotMap } = await import(
+      '../../modules/turtlebot/hooks/useTurtlebotMap.js'
+    )
+
+    const { result } = renderHook(() => useTurtlebotMap())
+    renderHook(() => useTurtlebotMap())
+
+    act(() => {
+      broadcast({ type: 'PLAN_UPDATE', op: 'reset', version: 1, points: [[0, 0], [1, 0]] })
+      broadcast({ type: 'PLAN_UPDATE', op: 'splice', baseVersion: 1, version: 2, start: 0, deleteCount: 1, points: [[0.5, 0]] })
+    })
+
+    expect(result.current.plannedPath).toEqual([[0.5, 0], [1, 0]])
+    expect(result.current.planVersion).toBe(2)
+    expect(sendMock).not.toHaveBeenCalled()
+  })
+
   it('does nothing when subscribe is missing', async () => {
     subscribeImpl = undefined
 
@@ -188,6 +312,9 @@ describe('useTurtlebotMap', () => {
       humans: [],
       globalGoal: null,
       intermediateWaypoints: [],
+      trail: [],
+      plannedPath: [],
+      planVersion: 0,
     })
   })
 
@@ -214,6 +341,9 @@ describe('useTurtlebotMap', () => {
       humans: [],
       globalGoal: null,
       intermediateWaypoints: [],
+      trail: [],
+      plannedPath: [],
+      planVersion: 0,
     })
   })
 })
\ No newline at end of file